@@ -12,6 +12,9 @@ TARGETS=(
   "172.24.4.102:9100"
 )
 
+# 참가자 서버(Flask) 자체 지표 (/metrics)
+PARTICIPANT_SERVER="localhost:5000"
+
 echo "[1/6] Prometheus 다운로드 및 설치"
 wget -q https://github.com/prometheus/prometheus/releases/download/v${PROM_VERSION}/prometheus-${PROM_VERSION}.linux-amd64.tar.gz
 tar -xzf prometheus-${PROM_VERSION}.linux-amd64.tar.gz
@@ -29,6 +32,11 @@ scrape_configs:
       - files:
           - '${TARGETS_JSON}'
         refresh_interval: 30s
+
+  - job_name: 'participant-server'
+    metrics_path: /metrics
+    static_configs:
+      - targets: ['${PARTICIPANT_SERVER}']
 EOF
 
 echo "[3/6] targets.json 생성"
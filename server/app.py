@@ -6,6 +6,7 @@ from config.settings import Config
 from routes.main_routes import main_bp
 from routes.vm_routes import vm_bp
 from routes.fl_routes import fl_bp
+from utils import metrics
 
 def create_app():
     """Flask 애플리케이션 팩토리"""
@@ -26,6 +27,9 @@ def create_app():
     app.register_blueprint(main_bp)
     app.register_blueprint(vm_bp)
     app.register_blueprint(fl_bp)
+
+    # Prometheus 지표 (/metrics)
+    metrics.init_app(app)
     
     return app
 
@@ -0,0 +1,25 @@
+import logging
+
+import uvicorn
+from a2wsgi import WSGIMiddleware
+
+from app import create_app
+from config.settings import Config
+
+
+def create_asgi_app() -> WSGIMiddleware:
+    """ASGI 애플리케이션 팩토리 (uvicorn으로 Flask 앱을 서비스)
+
+    Flask 라우트는 ASYNC_WSGI_WORKERS개의 스레드에서 실행되고, 스트리밍 응답(배치 배포 NDJSON,
+    로그 follow SSE)은 uvicorn이 클라이언트로 바로 흘려보낸다.
+    """
+    return WSGIMiddleware(create_app(), workers=Config.ASYNC_WSGI_WORKERS)
+
+
+app = create_asgi_app()
+
+if __name__ == '__main__':
+    logger = logging.getLogger(__name__)
+
+    logger.info(f"Starting Fleecy Cloud Participant Server (ASGI) on {Config.HOST}:{Config.PORT}")
+    uvicorn.run(app, host=Config.HOST, port=Config.PORT, log_level='debug' if Config.DEBUG else 'info')
@@ -0,0 +1 @@
+"""제어 경로 성능 벤치마크 (python -m benchmarks.run)"""
@@ -0,0 +1,155 @@
+"""OpenStack 대역: Keystone/Nova REST API 서버와 openstack CLI
+
+둘 다 같은 규칙으로 VM n개를 만들어 낸다 (floating IP는 127.1.x.y 루프백 주소라
+0.0.0.0에 바인딩한 StubSSHServer로 그대로 접속된다).
+"""
+import json
+import os
+import stat
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+# Nova의 기본 osapi_max_limit
+PAGE_LIMIT = 1000
+
+
+def fake_vm(index: int) -> Dict:
+    return {
+        'id': f'00000000-0000-4000-8000-{index:012d}',
+        'fixed_ip': f'10.0.{index // 250}.{index % 250 + 2}',
+        'floating_ip': f'127.1.{index // 250}.{index % 250 + 1}',
+    }
+
+
+class FakeOpenStackAPI:
+    """Keystone v3 토큰 발급 + Nova servers/detail (marker/limit 페이지네이션) 만 구현
+
+    latency_ms만큼 모든 응답을 늦춰 원격 API 왕복을 흉내 낼 수 있다.
+    """
+
+    def __init__(self, vm_count: int = 10, latency_ms: float = 0.0, host: str = '127.0.0.1'):
+        self.vm_count = vm_count
+        self.latency = latency_ms / 1000.0
+        self.requests = 0
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # 헤더와 본문을 따로 쓰므로 Nagle + 지연 ACK로 응답마다 40ms가 붙지 않게 함
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                api._count()
+                if self.path.rstrip('/') != '/identity/v3/auth/tokens':
+                    return self._json(404, {'error': 'not found'})
+                expires = (datetime.now(timezone.utc) + timedelta(hours=1)).strftime('%Y-%m-%dT%H:%M:%S.000000Z')
+                self._json(201, {'token': {'expires_at': expires, 'catalog': api.catalog()}},
+                           {'X-Subject-Token': 'fake-token'})
+
+            def do_GET(self):
+                api._count()
+                url = urlparse(self.path)
+                if url.path != '/compute/v2.1/servers/detail':
+                    return self._json(404, {'error': 'not found'})
+                if self.headers.get('X-Auth-Token') != 'fake-token':
+                    return self._json(401, {'error': 'unauthorized'})
+                query = parse_qs(url.query)
+                self._json(200, api.servers_page(query.get('marker', [None])[0], int(query.get('limit', [PAGE_LIMIT])[0])))
+
+            def _json(self, status, body, headers=None):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+        self._server = ThreadingHTTPServer((host, 0), Handler)
+        self._server.daemon_threads = True
+        self.base_url = f'http://{host}:{self._server.server_address[1]}'
+
+    @property
+    def auth_url(self) -> str:
+        return f'{self.base_url}/identity/v3'
+
+    def start(self) -> 'FakeOpenStackAPI':
+        threading.Thread(target=self._server.serve_forever, name='fake-openstack', daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def catalog(self) -> List[Dict]:
+        return [{
+            'type': 'compute',
+            'name': 'nova',
+            'endpoints': [{'interface': 'public', 'region': 'RegionOne', 'url': f'{self.base_url}/compute/v2.1'}],
+        }]
+
+    def servers_page(self, marker, limit: int) -> Dict:
+        # fake_vm의 ID 끝자리가 곧 순번
+        start = int(marker.rsplit('-', 1)[1]) + 1 if marker else 0
+        end = min(start + min(limit, PAGE_LIMIT), self.vm_count)
+        servers = [self._server_detail(fake_vm(i)) for i in range(start, end)]
+        body = {'servers': servers}
+        if end < self.vm_count:
+            body['servers_links'] = [{
+                'rel': 'next',
+                'href': f'{self.base_url}/compute/v2.1/servers/detail?limit={limit}&marker={servers[-1]["id"]}',
+            }]
+        return body
+
+    def _count(self) -> None:
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    @staticmethod
+    def _server_detail(vm: Dict) -> Dict:
+        return {
+            'id': vm['id'],
+            'name': f'vm-{vm["id"][-6:]}',
+            'status': 'ACTIVE',
+            'addresses': {'private': [
+                {'version': 4, 'addr': vm['fixed_ip'], 'OS-EXT-IPS:type': 'fixed'},
+                {'version': 4, 'addr': vm['floating_ip'], 'OS-EXT-IPS:type': 'floating'},
+            ]},
+        }
+
+
+_CLI_SCRIPT = '''#!/usr/bin/env python3
+# openstack server list --format value --column ID --column Networks 대역
+import os, sys, time
+time.sleep(float(os.environ.get('FAKE_OPENSTACK_CLI_DELAY', '0')))
+for i in range(int(os.environ.get('FAKE_OPENSTACK_VMS', '10'))):
+    vm_id = '00000000-0000-4000-8000-%012d' % i
+    print("%s {'private': ['10.0.%d.%d', '127.1.%d.%d']}" % (vm_id, i // 250, i % 250 + 2, i // 250, i % 250 + 1))
+'''
+
+
+def install_fake_cli(devstack_dir: str) -> str:
+    """devstack_dir에 openrc와 가짜 openstack 명령을 만들고 디렉토리 경로를 반환
+
+    Config.DEVSTACK_PATH를 이 경로로 바꾸면 CLI 백엔드가 가짜 명령을 실행한다.
+    VM 수는 FAKE_OPENSTACK_VMS, 기동 지연(초)은 FAKE_OPENSTACK_CLI_DELAY 환경변수로 정한다.
+    """
+    bin_dir = os.path.join(devstack_dir, 'bin')
+    os.makedirs(bin_dir, exist_ok=True)
+    cli = os.path.join(bin_dir, 'openstack')
+    with open(cli, 'w') as f:
+        f.write(_CLI_SCRIPT)
+    os.chmod(cli, os.stat(cli).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    with open(os.path.join(devstack_dir, 'openrc'), 'w') as f:
+        f.write(f'export PATH="{bin_dir}:$PATH"\n')
+    return devstack_dir
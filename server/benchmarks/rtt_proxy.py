@@ -0,0 +1,95 @@
+"""지연을 주입하는 TCP 프록시 (WAN 너머 참가자 VM의 RTT 재현)
+
+양방향으로 받은 데이터를 각각 rtt/2 뒤에 전달한다. 전송 중인 데이터가 지연 시간 동안
+쌓일 수 있으므로 대역폭은 제한하지 않고 지연만 더한다.
+"""
+import heapq
+import socket
+import threading
+import time
+from typing import Tuple
+
+_CHUNK = 64 * 1024
+
+
+class LatencyProxy:
+    def __init__(self, target: Tuple[str, int], rtt_ms: float, host: str = '127.0.0.1'):
+        self.target = target
+        self.delay = max(0.0, rtt_ms) / 2000.0
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((host, 0))
+        self._sock.listen(256)
+        self.address = self._sock.getsockname()
+        self._stopped = False
+
+    @property
+    def port(self) -> int:
+        return self.address[1]
+
+    def start(self) -> 'LatencyProxy':
+        threading.Thread(target=self._accept_loop, name='rtt-proxy', daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._stopped = True
+        self._sock.close()
+
+    def _accept_loop(self) -> None:
+        while not self._stopped:
+            try:
+                client, _ = self._sock.accept()
+            except OSError:
+                return
+            try:
+                upstream = socket.create_connection(self.target)
+            except OSError:
+                client.close()
+                continue
+            for sock in (client, upstream):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._pipe(client, upstream)
+            self._pipe(upstream, client)
+
+    def _pipe(self, source: socket.socket, dest: socket.socket) -> None:
+        """source에서 읽은 조각을 도착 시각 + delay에 dest로 보냄 (읽기와 쓰기는 별도 스레드)"""
+        pending = []
+        ready = threading.Condition()
+        seq = 0
+
+        def reader():
+            nonlocal seq
+            while True:
+                try:
+                    data = source.recv(_CHUNK)
+                except OSError:
+                    data = b''
+                with ready:
+                    heapq.heappush(pending, (time.monotonic() + self.delay, seq, data))
+                    seq += 1
+                    ready.notify()
+                if not data:
+                    return
+
+        def writer():
+            while True:
+                with ready:
+                    while not pending:
+                        ready.wait()
+                    due, _, data = pending[0]
+                    wait = due - time.monotonic()
+                    if wait > 0:
+                        ready.wait(wait)
+                        continue
+                    heapq.heappop(pending)
+                try:
+                    if not data:
+                        dest.shutdown(socket.SHUT_WR)
+                        return
+                    dest.sendall(data)
+                except OSError:
+                    source.close()
+                    return
+
+        threading.Thread(target=reader, daemon=True).start()
+        threading.Thread(target=writer, daemon=True).start()
@@ -0,0 +1,435 @@
+"""참가자 서버 제어 경로 벤치마크
+
+로컬 SSH/SFTP 서버(StubSSHServer), 지연 주입 프록시(LatencyProxy), OpenStack 대역을 띄우고
+실제 서비스 코드를 그대로 호출해 측정한다. 결과는 JSON으로 남겨 이전 결과와 비교할 수 있다.
+
+    cd server
+    python -m benchmarks.run                    # 전체 (수 분)
+    python -m benchmarks.run --quick            # 매개변수를 줄여 빠르게
+    python -m benchmarks.run --only ssh.deploy,http --baseline benchmarks/results/<이전>.json
+
+측정 항목
+  ssh.deploy      SSHService.deploy_and_execute_fl_code 지연 (파일 크기 x RTT x 배포 방식 x 캐시 상태)
+  ssh.logs        SSHService.get_logs로 큰 로그를 끝까지 읽는 처리량 (로그 크기 x 조각 크기)
+  openstack.list  get_openstack_vmList 지연 (VM 10/100/1000개 x CLI/REST 백엔드)
+  http            /api/vms, /api/fl/execute 동시 부하에서의 p50/p99 (asgi.py 앱을 uvicorn으로 실행)
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import paramiko
+import requests
+
+from benchmarks.fake_openstack import FakeOpenStackAPI, install_fake_cli
+from benchmarks.rtt_proxy import LatencyProxy
+from benchmarks.ssh_server import StubSSHServer
+from config.settings import Config
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+SCHEMA_VERSION = 1
+
+PYPROJECT = '[project]\nname = "bench"\nversion = "1.0.0"\ndependencies = ["flwr>=1.20.0"]\n'
+SERVER_APP = 'import flwr as fl\napp = fl.server.ServerApp()\n'
+
+KB = 1024
+MB = 1024 * KB
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """선형 보간 백분위수 (sorted_values는 오름차순)"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(name: str, params: Dict, latencies_s: List[float], errors: int = 0, **extra) -> Dict:
+    values = sorted(v * 1000.0 for v in latencies_s)
+    result = {
+        'benchmark': name,
+        'params': params,
+        'unit': 'ms',
+        'samples': len(values),
+        'errors': errors,
+        'mean': round(sum(values) / len(values), 3) if values else 0.0,
+        'min': round(values[0], 3) if values else 0.0,
+        'p50': round(percentile(values, 50), 3),
+        'p90': round(percentile(values, 90), 3),
+        'p99': round(percentile(values, 99), 3),
+        'max': round(values[-1], 3) if values else 0.0,
+    }
+    result.update(extra)
+    return result
+
+
+class BenchEnvironment:
+    """벤치마크 동안 쓰는 대역 서버와 Config 설정
+
+    Config를 먼저 바꾼 뒤에 서비스 모듈을 import 해야 (기본 인자로 읽는 값까지) 대역을 가리킨다.
+    """
+
+    def __init__(self):
+        self.root = tempfile.mkdtemp(prefix='fl-bench-')
+        self.home = os.path.join(self.root, 'home')
+        self.key_path = os.path.join(self.root, 'id_rsa')
+        paramiko.RSAKey.generate(2048).write_private_key_file(self.key_path)
+
+        # 0.0.0.0에 바인딩해 127.x.x.x의 모든 floating IP가 같은 서버로 접속되게 함
+        self.ssh = StubSSHServer(self.home, host='0.0.0.0').start()
+        self.openstack = FakeOpenStackAPI().start()
+        self.devstack = install_fake_cli(os.path.join(self.root, 'devstack'))
+        self._proxies: List[LatencyProxy] = []
+
+        Config.SSH_USER = 'bench'
+        Config.SSH_KEY_PATH = self.key_path
+        Config.SSH_PORT = self.ssh.port
+        Config.OPENSTACK_BACKEND = 'api'
+        Config.OS_AUTH_URL = self.openstack.auth_url
+        Config.OS_PASSWORD = 'bench'
+        Config.DEVSTACK_PATH = self.devstack
+        # 같은 VM에 반복 배포해도 배치 스케줄러가 409로 막지 않도록 작업당 요구 자원을 0으로 (제어 경로만 측정)
+        Config.FL_PLACEMENT_TASK_VCPUS = 0
+        Config.FL_PLACEMENT_TASK_MEMORY_MB = 0
+        self._seed_client_env()
+
+    def _seed_client_env(self) -> None:
+        """run_fl.sh가 의존성 설치 없이 바로 끝나도록 캐시된 가상환경 자리에 가짜 python을 둠"""
+        from services.fl_service import env_key, parse_dependencies
+
+        py_tag = subprocess.run(
+            ['python3', '-c', 'import sys; print("py%d%d" % sys.version_info[:2])'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        env_dir = os.path.join(self.home, Config.FL_ENV_DIR, f'{env_key(parse_dependencies(PYPROJECT))}-{py_tag}')
+        os.makedirs(os.path.join(env_dir, 'bin'), exist_ok=True)
+        python = os.path.join(env_dir, 'bin', 'python')
+        with open(python, 'w') as f:
+            # pip list는 바로 끝내고, 클라이언트 실행은 잠깐 살아 있다가 종료
+            f.write('#!/bin/sh\n[ "$1" = "-m" ] && exit 0\nexec sleep 2\n')
+        os.chmod(python, 0o755)
+        open(os.path.join(env_dir, '.ready'), 'w').close()
+
+    def ssh_port(self, rtt_ms: float) -> int:
+        """rtt_ms > 0이면 지연 프록시를 거치는 포트"""
+        if not rtt_ms:
+            return self.ssh.port
+        proxy = LatencyProxy(('127.0.0.1', self.ssh.port), rtt_ms).start()
+        self._proxies.append(proxy)
+        return proxy.port
+
+    def close(self) -> None:
+        for proxy in self._proxies:
+            proxy.stop()
+        self.ssh.stop()
+        self.openstack.stop()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def _received_files(size: int, nonce: str) -> Dict[str, str]:
+    """client_app.py 크기가 size 바이트인 요청 파일 (nonce가 다르면 내용도 달라 원격 캐시에 없음)"""
+    header = f'# {nonce}\n'
+    filler = os.urandom(max(0, size - len(header)) // 2 + 1).hex()
+    return {
+        'pyproject.toml': PYPROJECT,
+        'client_app.py': header + filler[:max(0, size - len(header))],
+        'server_app.py': SERVER_APP,
+    }
+
+
+def bench_ssh_deploy(env: BenchEnvironment, quick: bool) -> List[Dict]:
+    from services.fl_service import DEFAULT_AGGREGATOR_ADDRESS, RUN_COMMAND, build_workspace_files
+    from services.ssh_pool import SSHConnectionPool
+    from services.ssh_service import SSHService
+
+    sizes = [1 * KB, 1 * MB] if quick else [1 * KB, 1 * MB, 8 * MB]
+    rtts = [0, 50] if quick else [0, 20, 100]
+    iterations = 3 if quick else 10
+    results = []
+    for rtt in rtts:
+        port = env.ssh_port(rtt)
+        for mode in ('archive', 'sftp'):
+            for size in sizes:
+                for cache in ('warm', 'cold'):
+                    service = SSHService(pool=SSHConnectionPool())
+                    service.ssh_port = port
+
+                    def deploy(nonce: str) -> bool:
+                        files = build_workspace_files(_received_files(size, nonce), 0, 1, DEFAULT_AGGREGATOR_ADDRESS)
+                        result = service.deploy_and_execute_fl_code(
+                            '127.0.0.1', f'bench-{uuid.uuid4().hex[:8]}', {},
+                            additional_files=files, custom_command=RUN_COMMAND, deploy_mode=mode,
+                        )
+                        return bool(result.get('success'))
+
+                    # 첫 호출(연결 수립, 첫 업로드)은 제외하고 풀에 연결이 있는 상태를 측정
+                    deploy('warmup')
+                    latencies, errors = [], 0
+                    for i in range(iterations):
+                        started = time.perf_counter()
+                        ok = deploy('warmup' if cache == 'warm' else f'cold-{i}-{uuid.uuid4().hex}')
+                        latencies.append(time.perf_counter() - started)
+                        errors += 0 if ok else 1
+                    service.pool.close_all()
+                    params = {'mode': mode, 'file_bytes': size, 'rtt_ms': rtt, 'cache': cache}
+                    results.append(summarize('ssh.deploy', params, latencies, errors))
+                    _progress(results[-1])
+    return results
+
+
+def bench_ssh_logs(env: BenchEnvironment, quick: bool) -> List[Dict]:
+    from services.ssh_pool import SSHConnectionPool
+    from services.ssh_service import SSHService
+
+    sizes = [1 * MB, 16 * MB] if quick else [1 * MB, 16 * MB, 64 * MB]
+    chunks = [Config.FL_LOG_MAX_CHUNK_BYTES, 4 * MB]
+    iterations = 2 if quick else 5
+    results = []
+    service = SSHService(pool=SSHConnectionPool())
+    for size in sizes:
+        task_id = f'bench-logs-{size}'
+        log_dir = os.path.join(env.home, 'fl-workspace', task_id)
+        os.makedirs(log_dir, exist_ok=True)
+        line = b'round 1 client 0: train_loss=0.1234 accuracy=0.9876 ' + b'x' * 40 + b'\n'
+        with open(os.path.join(log_dir, f'{task_id}.log'), 'wb') as f:
+            f.write(line * (size // len(line)))
+        total = (size // len(line)) * len(line)
+
+        for chunk in chunks:
+            latencies, errors, calls = [], 0, 0
+            for _ in range(iterations):
+                offset = 0
+                started = time.perf_counter()
+                while offset < total:
+                    result = service.get_logs('127.0.0.1', task_id, offset, chunk)
+                    calls += 1
+                    if not result.get('success') or result['next_offset'] <= offset:
+                        errors += 1
+                        break
+                    offset = result['next_offset']
+                latencies.append(time.perf_counter() - started)
+            mean = sum(latencies) / len(latencies)
+            results.append(summarize(
+                'ssh.logs', {'log_bytes': total, 'chunk_bytes': chunk}, latencies, errors,
+                throughput_mb_s=round(total / MB / mean, 2), calls_per_read=calls // iterations,
+            ))
+            _progress(results[-1])
+    service.pool.close_all()
+    return results
+
+
+def bench_openstack_list(env: BenchEnvironment, quick: bool) -> List[Dict]:
+    from utils import openstack
+
+    iterations = 5 if quick else 20
+    results = []
+    for backend in ('cli', 'api'):
+        Config.OPENSTACK_BACKEND = backend
+        for count in (10, 100, 1000):
+            env.openstack.vm_count = count
+            os.environ['FAKE_OPENSTACK_VMS'] = str(count)
+            openstack.get_openstack_vmList()
+            latencies, errors = [], 0
+            for _ in range(iterations):
+                started = time.perf_counter()
+                vms = openstack.get_openstack_vmList()
+                latencies.append(time.perf_counter() - started)
+                errors += 0 if len(vms) == count else 1
+            results.append(summarize('openstack.list', {'backend': backend, 'vms': count}, latencies, errors))
+            _progress(results[-1])
+    Config.OPENSTACK_BACKEND = 'api'
+    return results
+
+
+def _load(request: Callable[[requests.Session], requests.Response], total: int, concurrency: int) -> Dict:
+    """total개의 요청을 concurrency개 스레드로 보내고 지연/오류/처리량 집계"""
+    local = threading.local()
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(_):
+        nonlocal errors
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        started = time.perf_counter()
+        try:
+            ok = request(session).status_code < 400
+        except requests.RequestException:
+            ok = False
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            errors += 0 if ok else 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    return {'latencies': latencies, 'errors': errors, 'elapsed': time.perf_counter() - started}
+
+
+def bench_http(env: BenchEnvironment, quick: bool) -> List[Dict]:
+    import uvicorn
+
+    import asgi
+
+    env.openstack.vm_count = 100
+    logging.disable(logging.WARNING)
+    server = uvicorn.Server(uvicorn.Config(asgi.app, host='127.0.0.1', port=0, log_level='error'))
+    threading.Thread(target=server.run, name='bench-uvicorn', daemon=True).start()
+    deadline = time.time() + 10
+    while not server.started and time.time() < deadline:
+        time.sleep(0.05)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    base = f'http://127.0.0.1:{port}'
+
+    vm_ids = [vm['id'] for vm in requests.get(f'{base}/api/vms').json()['vms']]
+    files = _received_files(4 * KB, 'http')
+    counter = iter(range(10 ** 9))
+
+    def list_vms(session: requests.Session) -> requests.Response:
+        return session.get(f'{base}/api/vms')
+
+    def execute(session: requests.Session) -> requests.Response:
+        # 같은 VM에 요청이 몰리지 않게 VM을 돌아가며 배포
+        vm_id = vm_ids[next(counter) % len(vm_ids)]
+        return session.post(f'{base}/api/fl/execute', json={'vm_id': vm_id, 'env_config': {}, 'files': files})
+
+    scenarios = [
+        ('GET /api/vms', list_vms, 300 if quick else 2000),
+        ('POST /api/fl/execute', execute, 40 if quick else 200),
+    ]
+    results = []
+    try:
+        for name, request, total in scenarios:
+            for concurrency in ([8] if quick else [1, 16, 64]):
+                load = _load(request, total, concurrency)
+                results.append(summarize(
+                    'http', {'endpoint': name, 'concurrency': concurrency}, load['latencies'], load['errors'],
+                    requests_per_second=round(len(load['latencies']) / load['elapsed'], 1),
+                ))
+                _progress(results[-1])
+    finally:
+        server.should_exit = True
+        logging.disable(logging.NOTSET)
+    return results
+
+
+BENCHMARKS: Dict[str, Callable[[BenchEnvironment, bool], List[Dict]]] = {
+    'ssh.deploy': bench_ssh_deploy,
+    'ssh.logs': bench_ssh_logs,
+    'openstack.list': bench_openstack_list,
+    'http': bench_http,
+}
+
+
+def _progress(result: Dict) -> None:
+    params = ' '.join(f'{k}={v}' for k, v in result['params'].items())
+    extra = ''.join(
+        f' {k}={result[k]}' for k in ('throughput_mb_s', 'requests_per_second') if k in result
+    )
+    print(f"  {result['benchmark']:<15} {params:<60} p50={result['p50']:>9.2f}ms p99={result['p99']:>9.2f}ms"
+          f" errors={result['errors']}{extra}", flush=True)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict], baseline_path: str, threshold: float) -> List[str]:
+    """같은 (benchmark, params)의 p50이 baseline보다 threshold 비율 이상 느려진 항목"""
+    with open(baseline_path) as f:
+        baseline = {
+            (r['benchmark'], json.dumps(r['params'], sort_keys=True)): r for r in json.load(f)['results']
+        }
+    regressions = []
+    for result in results:
+        previous = baseline.get((result['benchmark'], json.dumps(result['params'], sort_keys=True)))
+        if not previous or not previous['p50']:
+            continue
+        change = result['p50'] / previous['p50'] - 1.0
+        result['baseline_p50'] = previous['p50']
+        result['p50_change'] = round(change, 4)
+        if change > threshold:
+            regressions.append(
+                f"{result['benchmark']} {result['params']}: p50 {previous['p50']}ms -> {result['p50']}ms ({change:+.0%})"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Participant server control-plane benchmarks')
+    parser.add_argument('--quick', action='store_true', help='smaller parameter grid and fewer iterations')
+    parser.add_argument('--only', default='', help=f"comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument('--output', help='result JSON path (default: benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--baseline', help='previous result JSON to compare p50 against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='p50 slowdown ratio counted as regression')
+    args = parser.parse_args(argv)
+
+    selected = [name.strip() for name in args.only.split(',') if name.strip()] or list(BENCHMARKS)
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    # 연결을 수백 번 열고 닫으므로 SSH 라이브러리의 연결 단위 INFO 로그는 끔
+    logging.getLogger('paramiko').setLevel(logging.WARNING)
+
+    started_at = datetime.now()
+    env = BenchEnvironment()
+    results: List[Dict] = []
+    try:
+        for name in selected:
+            print(f'[{name}]', flush=True)
+            results.extend(BENCHMARKS[name](env, args.quick))
+    finally:
+        env.close()
+
+    regressions = compare(results, args.baseline, args.threshold) if args.baseline else []
+    report = {
+        'schema': SCHEMA_VERSION,
+        'started_at': started_at.isoformat(),
+        'elapsed_s': round((datetime.now() - started_at).total_seconds(), 1),
+        'git_commit': _git_commit(),
+        'quick': args.quick,
+        'host': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'results': results,
+        'regressions': regressions,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{started_at.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'results written to {output}')
+
+    for line in regressions:
+        print(f'REGRESSION {line}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""paramiko 기반 로컬 SSH/SFTP 서버 (벤치마크용 참가자 VM 대역)
+
+- 어떤 사용자/키로 접속해도 인증 성공
+- exec 채널의 명령은 HOME과 작업 디렉토리를 home으로 바꾼 bash -c 로 실행하고 stdin/stdout/stderr를 그대로 연결
+- SFTP의 상대 경로는 home 기준
+- 한 연결에서 여러 채널을 동시에 열 수 있음
+"""
+import logging
+import os
+import socket
+import subprocess
+import threading
+from typing import List, Tuple
+
+import paramiko
+from paramiko import SFTP_OK, SFTPAttributes, SFTPHandle, SFTPServer, SFTPServerInterface
+
+logger = logging.getLogger(__name__)
+
+_CHUNK = 64 * 1024
+
+
+class _ServerInterface(paramiko.ServerInterface):
+    def __init__(self, stub: 'StubSSHServer'):
+        self.stub = stub
+
+    def check_auth_publickey(self, username, key):
+        return paramiko.AUTH_SUCCESSFUL
+
+    def check_auth_password(self, username, password):
+        return paramiko.AUTH_SUCCESSFUL
+
+    def get_allowed_auths(self, username):
+        return 'publickey,password'
+
+    def check_channel_request(self, kind, chanid):
+        if kind == 'session':
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_exec_request(self, channel, command):
+        self.stub.exec_count += 1
+        threading.Thread(target=self.stub._run_exec, args=(channel, command.decode()), daemon=True).start()
+        return True
+
+
+class _SFTPHandle(SFTPHandle):
+    def stat(self):
+        try:
+            return SFTPAttributes.from_stat(os.fstat(self.readfile.fileno()))
+        except OSError as e:
+            return SFTPServer.convert_errno(e.errno)
+
+    def chattr(self, attr):
+        return SFTP_OK
+
+
+class _SFTPInterface(SFTPServerInterface):
+    def __init__(self, server, *args, **kwargs):
+        super().__init__(server, *args, **kwargs)
+        self.home = server.stub.home
+
+    def _path(self, path: str) -> str:
+        if not path.startswith('/'):
+            path = os.path.join(self.home, path)
+        return os.path.normpath(path)
+
+    def canonicalize(self, path):
+        return self._path(path)
+
+    def list_folder(self, path):
+        path = self._path(path)
+        try:
+            entries = []
+            for name in os.listdir(path):
+                attr = SFTPAttributes.from_stat(os.stat(os.path.join(path, name)))
+                attr.filename = name
+                entries.append(attr)
+            return entries
+        except OSError as e:
+            return SFTPServer.convert_errno(e.errno)
+
+    def stat(self, path):
+        try:
+            return SFTPAttributes.from_stat(os.stat(self._path(path)))
+        except OSError as e:
+            return SFTPServer.convert_errno(e.errno)
+
+    lstat = stat
+
+    def open(self, path, flags, attr):
+        path = self._path(path)
+        try:
+            fd = os.open(path, flags, 0o644)
+        except OSError as e:
+            return SFTPServer.convert_errno(e.errno)
+        if flags & os.O_WRONLY:
+            mode = 'ab' if flags & os.O_APPEND else 'wb'
+        elif flags & os.O_RDWR:
+            mode = 'a+b' if flags & os.O_APPEND else 'r+b'
+        else:
+            mode = 'rb'
+        handle = _SFTPHandle(flags)
+        handle.filename = path
+        handle.readfile = handle.writefile = os.fdopen(fd, mode)
+        return handle
+
+    def _call(self, func, *paths):
+        try:
+            func(*[self._path(p) for p in paths])
+        except OSError as e:
+            return SFTPServer.convert_errno(e.errno)
+        return SFTP_OK
+
+    def remove(self, path):
+        return self._call(os.remove, path)
+
+    def rename(self, oldpath, newpath):
+        return self._call(os.rename, oldpath, newpath)
+
+    posix_rename = rename
+
+    def mkdir(self, path, attr):
+        return self._call(os.mkdir, path)
+
+    def rmdir(self, path):
+        return self._call(os.rmdir, path)
+
+    def chattr(self, path, attr):
+        return SFTP_OK
+
+
+class StubSSHServer:
+    """로컬 SSH/SFTP 서버 (host='0.0.0.0'이면 127.x.x.x 어느 주소로 접속해도 같은 서버)"""
+
+    def __init__(self, home: str, host: str = '127.0.0.1', port: int = 0):
+        self.home = home
+        os.makedirs(home, exist_ok=True)
+        self.host_key = paramiko.RSAKey.generate(2048)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((host, port))
+        self._sock.listen(256)
+        self.address: Tuple[str, int] = self._sock.getsockname()
+        self.connections = 0
+        self.exec_count = 0
+        self._stopped = False
+
+    @property
+    def port(self) -> int:
+        return self.address[1]
+
+    def start(self) -> 'StubSSHServer':
+        threading.Thread(target=self._accept_loop, name='stub-ssh-accept', daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._stopped = True
+        self._sock.close()
+
+    def _accept_loop(self) -> None:
+        while not self._stopped:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn: socket.socket) -> None:
+        transport = paramiko.Transport(conn)
+        transport.add_server_key(self.host_key)
+        transport.set_subsystem_handler('sftp', SFTPServer, _SFTPInterface)
+        server = _ServerInterface(self)
+        transport.stub = self
+        try:
+            transport.start_server(server=server)
+        except Exception as e:
+            logger.debug(f"SSH handshake failed: {str(e)}")
+            return
+        # 수락한 채널을 참조해 두지 않으면 exec 요청이 오기 전에 GC되면서 닫혀 버림
+        channels: List[paramiko.Channel] = []
+        while transport.is_active():
+            channel = transport.accept(1)
+            channels = [c for c in channels if not c.closed]
+            if channel is not None:
+                channels.append(channel)
+
+    def _run_exec(self, channel: paramiko.Channel, command: str) -> None:
+        proc = subprocess.Popen(
+            ['bash', '-c', command],
+            cwd=self.home,
+            env=dict(os.environ, HOME=self.home),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+
+        def pump_stdin():
+            try:
+                for data in iter(lambda: channel.recv(_CHUNK), b''):
+                    proc.stdin.write(data)
+                proc.stdin.close()
+            except (OSError, EOFError):
+                pass
+
+        def pump(source, send):
+            for data in iter(lambda: source.read1(_CHUNK), b''):
+                send(data)
+
+        threading.Thread(target=pump_stdin, daemon=True).start()
+        stderr = threading.Thread(target=pump, args=(proc.stderr, channel.sendall_stderr), daemon=True)
+        stderr.start()
+        try:
+            pump(proc.stdout, channel.sendall)
+        except (OSError, EOFError):
+            proc.kill()
+        stderr.join()
+        status = proc.wait()
+        try:
+            channel.send_exit_status(status)
+            channel.shutdown_write()
+            channel.close()
+        except (OSError, EOFError):
+            pass
@@ -12,12 +12,144 @@ class Config:
     HOST = os.environ.get('HOST', '0.0.0.0')
     PORT = int(os.environ.get('PORT', 5000))
     DEBUG = os.environ.get('DEBUG', 'False').lower() == 'true'
+
+    # ASGI 서버 설정 (python3 asgi.py / uvicorn asgi:app): Flask 라우트를 실행하는 스레드 수
+    ASYNC_WSGI_WORKERS = int(os.environ.get('ASYNC_WSGI_WORKERS', '32'))
     
     # SSH 설정
     SSH_USER = os.environ.get('SSH_USER', 'ubuntu')
     SSH_KEY_PATH = os.environ.get('SSH_KEY_PATH', '~/key.pem')
     SSH_PORT = int(os.environ.get('SSH_PORT', '22'))
+
+    # SSH 연결 풀 설정
+    SSH_POOL_MAX_PER_HOST = int(os.environ.get('SSH_POOL_MAX_PER_HOST', '4'))
+    SSH_POOL_IDLE_TIMEOUT = float(os.environ.get('SSH_POOL_IDLE_TIMEOUT', '300'))
+    SSH_POOL_ACQUIRE_TIMEOUT = float(os.environ.get('SSH_POOL_ACQUIRE_TIMEOUT', '30'))
+    SSH_KEEPALIVE_INTERVAL = int(os.environ.get('SSH_KEEPALIVE_INTERVAL', '30'))
     
+    # SSH 상태 점검 설정 (/api/vms/ssh-check-all)
+    SSH_HEALTH_TTL = float(os.environ.get('SSH_HEALTH_TTL', '15'))
+    SSH_HEALTH_HISTORY = int(os.environ.get('SSH_HEALTH_HISTORY', '20'))
+    SSH_HEALTH_TCP_TIMEOUT = float(os.environ.get('SSH_HEALTH_TCP_TIMEOUT', '2'))
+    SSH_HEALTH_MAX_WORKERS = int(os.environ.get('SSH_HEALTH_MAX_WORKERS', '32'))
+    SSH_HEALTH_SWEEP_DEADLINE = float(os.environ.get('SSH_HEALTH_SWEEP_DEADLINE', '10'))
+    
+    # 연합학습 배포 설정
+    # 'archive': tar.gz 한 번 전송 + 원격 명령 1회 / 'sftp': 파일별 SFTP 업로드
+    FL_DEPLOY_MODE = os.environ.get('FL_DEPLOY_MODE', 'archive').lower()
+    FL_LAUNCH_GRACE_SECONDS = float(os.environ.get('FL_LAUNCH_GRACE_SECONDS', '0.2'))
+    # 참가자 VM의 콘텐츠 주소 기반 파일 저장소 (홈 디렉토리 기준 경로)
+    FL_BLOB_CACHE_DIR = os.environ.get('FL_BLOB_CACHE_DIR', '.fl-cache')
+    FL_BLOB_CACHE_MAX_AGE_DAYS = int(os.environ.get('FL_BLOB_CACHE_MAX_AGE_DAYS', '7'))
+    # 참가자 VM의 의존성 가상환경 캐시 / wheelhouse (홈 디렉토리 기준 경로)
+    FL_ENV_DIR = os.environ.get('FL_ENV_DIR', '.fl-envs')
+    FL_REMOTE_WHEELHOUSE_DIR = os.environ.get('FL_REMOTE_WHEELHOUSE_DIR', '.fl-wheelhouse')
+    # 서버 측 wheelhouse 디렉토리 (pip download -d 로 준비) 와 기본 사용 여부
+    FL_WHEELHOUSE_DIR = os.environ.get('FL_WHEELHOUSE_DIR', '')
+    FL_USE_WHEELHOUSE = os.environ.get('FL_USE_WHEELHOUSE', 'False').lower() == 'true'
+    FL_BATCH_MAX_WORKERS = int(os.environ.get('FL_BATCH_MAX_WORKERS', '16'))
+    FL_BATCH_HOST_TIMEOUT = float(os.environ.get('FL_BATCH_HOST_TIMEOUT', '120'))
+    # VM 지문(vCPU/메모리/디스크/Python/패키지/가상환경 캐시) 캐시 시간(0이면 배포에 사용 안 함), 수집 명령 제한 시간, 동시 수집 수
+    FL_FINGERPRINT_TTL = float(os.environ.get('FL_FINGERPRINT_TTL', '600'))
+    FL_FINGERPRINT_TIMEOUT = float(os.environ.get('FL_FINGERPRINT_TIMEOUT', '15'))
+    FL_FINGERPRINT_MAX_WORKERS = int(os.environ.get('FL_FINGERPRINT_MAX_WORKERS', '32'))
+    # 작업 배치 스케줄러: 정책('spread' | 'binpack'), 작업당 기본 요구 자원, 지문이 없을 때의 VM 용량, vCPU 초과 할당 비율
+    FL_PLACEMENT_POLICY = os.environ.get('FL_PLACEMENT_POLICY', 'spread').lower()
+    FL_PLACEMENT_TASK_VCPUS = float(os.environ.get('FL_PLACEMENT_TASK_VCPUS', '1'))
+    FL_PLACEMENT_TASK_MEMORY_MB = int(os.environ.get('FL_PLACEMENT_TASK_MEMORY_MB', '1024'))
+    FL_PLACEMENT_DEFAULT_VCPUS = int(os.environ.get('FL_PLACEMENT_DEFAULT_VCPUS', '2'))
+    FL_PLACEMENT_DEFAULT_MEMORY_MB = int(os.environ.get('FL_PLACEMENT_DEFAULT_MEMORY_MB', '4096'))
+    FL_PLACEMENT_CPU_OVERCOMMIT = float(os.environ.get('FL_PLACEMENT_CPU_OVERCOMMIT', '1.0'))
+    # 배치 대기열 크기/대기 시간, 원격 프로세스 종료 확인 주기, 배포 중 상태로 둘 최대 시간 (초)
+    FL_PLACEMENT_QUEUE_SIZE = int(os.environ.get('FL_PLACEMENT_QUEUE_SIZE', '100'))
+    FL_PLACEMENT_QUEUE_TIMEOUT = float(os.environ.get('FL_PLACEMENT_QUEUE_TIMEOUT', '3600'))
+    FL_PLACEMENT_REAP_INTERVAL = float(os.environ.get('FL_PLACEMENT_REAP_INTERVAL', '30'))
+    FL_PLACEMENT_DEPLOY_TIMEOUT = float(os.environ.get('FL_PLACEMENT_DEPLOY_TIMEOUT', '600'))
+
+    # multipart/tar(.gz) 작업 공간 업로드 설정
+    # 스풀 디렉토리 (비우면 시스템 임시 디렉토리), 압축 해제 후 전체 크기와 파일 수 상한
+    FL_UPLOAD_SPOOL_DIR = os.environ.get('FL_UPLOAD_SPOOL_DIR', '')
+    FL_UPLOAD_MAX_BYTES = int(os.environ.get('FL_UPLOAD_MAX_BYTES', str(2 * 1024 * 1024 * 1024)))
+    FL_UPLOAD_MAX_FILES = int(os.environ.get('FL_UPLOAD_MAX_FILES', '10000'))
+    # JSON 본문(압축을 푼 뒤) 최대 크기: 메모리에 모두 올리므로 작업 공간 업로드보다 작게
+    FL_UPLOAD_MAX_JSON_BYTES = int(os.environ.get('FL_UPLOAD_MAX_JSON_BYTES', str(256 * 1024 * 1024)))
+
+    # 배포 작업 대기열 설정
+    FL_JOB_WORKERS = int(os.environ.get('FL_JOB_WORKERS', '8'))
+    FL_JOB_QUEUE_SIZE = int(os.environ.get('FL_JOB_QUEUE_SIZE', '100'))
+    FL_JOB_HISTORY = int(os.environ.get('FL_JOB_HISTORY', '500'))
+
+    # 로컬 연합학습 클라이언트 실행 설정 (/api/fl/execute-local)
+    FL_LOCAL_MAX_CONCURRENT = int(os.environ.get('FL_LOCAL_MAX_CONCURRENT', '2'))
+    FL_LOCAL_QUEUE_SIZE = int(os.environ.get('FL_LOCAL_QUEUE_SIZE', '20'))
+    FL_LOCAL_HISTORY = int(os.environ.get('FL_LOCAL_HISTORY', '100'))
+    FL_LOCAL_INSTALL_TIMEOUT = float(os.environ.get('FL_LOCAL_INSTALL_TIMEOUT', '600'))
+    FL_LOCAL_RUN_TIMEOUT = float(os.environ.get('FL_LOCAL_RUN_TIMEOUT', '3600'))
+    # 로그 디렉토리 (비어 있으면 시스템 임시 디렉토리의 fl-local-logs) 와 파일당 최대 크기/보관 개수
+    FL_LOCAL_LOG_DIR = os.environ.get('FL_LOCAL_LOG_DIR', '')
+    FL_LOCAL_LOG_MAX_BYTES = int(os.environ.get('FL_LOCAL_LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+    FL_LOCAL_LOG_BACKUPS = int(os.environ.get('FL_LOCAL_LOG_BACKUPS', '2'))
+    FL_LOCAL_KEEP_WORKSPACE = os.environ.get('FL_LOCAL_KEEP_WORKSPACE', 'False').lower() == 'true'
+
+    # 원격 로그 조회 설정
+    FL_LOG_MAX_CHUNK_BYTES = int(os.environ.get('FL_LOG_MAX_CHUNK_BYTES', str(256 * 1024)))
+    FL_LOG_FOLLOW_TIMEOUT = float(os.environ.get('FL_LOG_FOLLOW_TIMEOUT', '3600'))
+    FL_LOG_HEARTBEAT_SECONDS = float(os.environ.get('FL_LOG_HEARTBEAT_SECONDS', '15'))
+
+    # 작업 산출물 수집 설정 (/api/fl/artifacts)
+    # 저장 디렉토리 (비어 있으면 시스템 임시 디렉토리의 fl-artifacts), 동시 수집 VM 수, 원격 gzip 압축 수준
+    FL_ARTIFACT_DIR = os.environ.get('FL_ARTIFACT_DIR', '')
+    FL_ARTIFACT_MAX_WORKERS = int(os.environ.get('FL_ARTIFACT_MAX_WORKERS', '16'))
+    FL_ARTIFACT_GZIP_LEVEL = int(os.environ.get('FL_ARTIFACT_GZIP_LEVEL', '1'))
+    FL_ARTIFACT_PACK_TIMEOUT = float(os.environ.get('FL_ARTIFACT_PACK_TIMEOUT', '300'))
+    # 한 번에 보내 두는 SFTP 읽기 요청의 총 크기와 전송이 끊겼을 때 이어 받기 시도 횟수
+    FL_ARTIFACT_WINDOW_BYTES = int(os.environ.get('FL_ARTIFACT_WINDOW_BYTES', str(8 * 1024 * 1024)))
+    FL_ARTIFACT_RETRIES = int(os.environ.get('FL_ARTIFACT_RETRIES', '3'))
+
+    # 학습 텔레메트리 설정 (/api/fl/telemetry)
+    # 참가자별 보관 기록 수 (넘으면 오래된 절반을 두 개씩 평균 내어 줄임), 보관 작업 수, SSH 조회 한 번의 최대 크기
+    FL_TELEMETRY_MAX_POINTS = int(os.environ.get('FL_TELEMETRY_MAX_POINTS', '2000'))
+    FL_TELEMETRY_MAX_TASKS = int(os.environ.get('FL_TELEMETRY_MAX_TASKS', '50'))
+    FL_TELEMETRY_MAX_PULL_BYTES = int(os.environ.get('FL_TELEMETRY_MAX_PULL_BYTES', str(1024 * 1024)))
+    # 조회 응답의 기본 최대 구간 수, 느린 참가자 기준 (최근 samples_per_sec가 중앙값의 이 비율 미만)
+    FL_TELEMETRY_QUERY_POINTS = int(os.environ.get('FL_TELEMETRY_QUERY_POINTS', '200'))
+    FL_TELEMETRY_SLOW_RATIO = float(os.environ.get('FL_TELEMETRY_SLOW_RATIO', '0.5'))
+
+    # 배포 추적 설정: 최근 추적 보관 개수, OpenTelemetry 내보내기 (opentelemetry-sdk, otlp exporter 필요)
+    TRACING_BUFFER_SIZE = int(os.environ.get('TRACING_BUFFER_SIZE', '200'))
+    TRACING_OTEL_ENABLED = os.environ.get('TRACING_OTEL_ENABLED', 'False').lower() == 'true'
+    TRACING_SERVICE_NAME = os.environ.get('TRACING_SERVICE_NAME', 'participant-server')
+
     # OpenStack 설정
     OPENSTACK_TIMEOUT = 15
     DEVSTACK_PATH = "~/devstack"
+    # 'auto': OS_AUTH_URL이 있으면 REST API, 없으면 openstack CLI / 'api' / 'cli'
+    OPENSTACK_BACKEND = os.environ.get('OPENSTACK_BACKEND', 'auto').lower()
+    OPENSTACK_HTTP_POOL_SIZE = int(os.environ.get('OPENSTACK_HTTP_POOL_SIZE', '10'))
+    OS_AUTH_URL = os.environ.get('OS_AUTH_URL', '')
+    OS_USERNAME = os.environ.get('OS_USERNAME', 'admin')
+    OS_PASSWORD = os.environ.get('OS_PASSWORD', '')
+    OS_PROJECT_NAME = os.environ.get('OS_PROJECT_NAME', 'demo')
+    OS_USER_DOMAIN_NAME = os.environ.get('OS_USER_DOMAIN_NAME', 'Default')
+    OS_PROJECT_DOMAIN_NAME = os.environ.get('OS_PROJECT_DOMAIN_NAME', 'Default')
+    OS_REGION_NAME = os.environ.get('OS_REGION_NAME') or None
+    OS_INTERFACE = os.environ.get('OS_INTERFACE', 'public')
+
+    # VM 인벤토리 캐시 설정 (초 단위)
+    VM_INVENTORY_TTL = float(os.environ.get('VM_INVENTORY_TTL', '30'))
+    VM_INVENTORY_MAX_STALE = float(os.environ.get('VM_INVENTORY_MAX_STALE', '600'))
+    VM_INVENTORY_MISS_REFRESH_INTERVAL = float(os.environ.get('VM_INVENTORY_MISS_REFRESH_INTERVAL', '5'))
+    VM_INVENTORY_MISS_WAIT = float(os.environ.get('VM_INVENTORY_MISS_WAIT', '2'))
+
+    # 참가자 선택 설정 (/api/fl/select, install_monitoring.sh로 설치한 Prometheus의 node_exporter 지표 사용)
+    PROMETHEUS_URL = os.environ.get('PROMETHEUS_URL', 'http://localhost:9090')
+    PROMETHEUS_TIMEOUT = float(os.environ.get('PROMETHEUS_TIMEOUT', '5'))
+    PROMETHEUS_NODE_JOB = os.environ.get('PROMETHEUS_NODE_JOB', 'openstack-vm')
+    PROMETHEUS_RATE_WINDOW = os.environ.get('PROMETHEUS_RATE_WINDOW', '1m')
+    SELECTION_CACHE_TTL = float(os.environ.get('SELECTION_CACHE_TTL', '10'))
+    SELECTION_DEFAULT_K = int(os.environ.get('SELECTION_DEFAULT_K', '10'))
+    # 점수 가중치 (cpu_idle / load / memory / network) 와 과부하 VM 제외 기준 (코어당 load1, 유휴 CPU 비율, 가용 메모리 비율)
+    SELECTION_WEIGHTS = os.environ.get('SELECTION_WEIGHTS', 'cpu_idle=0.4,memory=0.3,load=0.2,network=0.1')
+    SELECTION_MAX_LOAD = float(os.environ.get('SELECTION_MAX_LOAD', '1.5'))
+    SELECTION_MIN_CPU_IDLE = float(os.environ.get('SELECTION_MIN_CPU_IDLE', '0.1'))
+    SELECTION_MIN_MEMORY = float(os.environ.get('SELECTION_MIN_MEMORY', '0.1'))
@@ -1,45 +1,497 @@
 """Flower ClientApp template (PyTorch)."""
 
+import json
+import math
+import os
+import queue
+import shutil
+import socket
+import threading
+import time
+import urllib.request
+import warnings
+
+import numpy as np
 import torch
 from flwr.client import ClientApp, NumPyClient
 from flwr.common import Context
+from torch.utils.data import BatchSampler, DataLoader, Dataset, RandomSampler, SequentialSampler
 
+# Fraction of each partition held out for evaluate()
+VAL_FRACTION = 0.1
 
-class SimpleClient(NumPyClient):
-    def __init__(self, device: torch.device, input_size: int, hidden: int, output_size: int, local_epochs: int):
-        self.device = device
+# Partitions / loaders stay alive for the lifetime of the client process, so rounds after
+# the first one neither re-read nor re-decode data and keep their DataLoader workers.
+_PARTITIONS = {}
+_LOADERS = {}
+
+# Models (and their torch.compile wrappers) are reused across rounds; weights come from the server
+_MODELS = {}
+# torch thread pools can only be sized once per process
+_CPU_CONFIGURED = False
+
+# Batch sizes tried by the autotuner, and how long each one is measured
+AUTOTUNE_BATCH_SIZES = (16, 32, 64, 128, 256, 512)
+AUTOTUNE_SECONDS = 0.3
+
+# Update compression for fit() results (decoded by CompressedFedAvg in server_app.py)
+#   none: float32 weights / fp16: float16 weights
+#   int8: per-tensor int8 quantized delta + float32 scale
+#   topk: largest |delta| entries as (uint32 index, float16 value), with error feedback
+COMPRESSION_SCHEMES = ("none", "fp16", "int8", "topk")
+# Error-feedback residuals for topk, per partition (what was not sent is added to the next delta)
+_RESIDUALS = {}
+
+# Progress records, one JSON object per line, in the workspace (read incrementally by the participant server)
+TELEMETRY_FILE = "telemetry.jsonl"
+_TELEMETRY = {}
+
+
+class PartitionStore:
+    """Preprocessed partitions cached on disk as .npy files and memory-mapped on load.
+
+    Layout: <data-dir>/<dataset>/p<partition-id>-of-<num-partitions>/{x,y}.npy
+    (synthetic data is stored per input/output size as synthetic-<input>x<output>)
+    The first load of a partition preprocesses it once (float32 features, int64 labels);
+    later loads - including other client processes on the same VM - only mmap the files.
+    """
+
+    def __init__(self, root: str, dataset: str, input_size: int, output_size: int):
+        self.root = os.path.expanduser(root)
+        self.dataset = dataset
         self.input_size = input_size
-        self.hidden = hidden
         self.output_size = output_size
+
+    def load(self, partition_id: int, num_partitions: int, in_memory_mb: float):
+        key = (self.root, self.dataset, self.input_size, partition_id, num_partitions)
+        if key not in _PARTITIONS:
+            path = os.path.join(self.root, self._dir_name(), f"p{partition_id}-of-{num_partitions}")
+            if not os.path.exists(os.path.join(path, "y.npy")):
+                self._write(path, *self._prepare(partition_id, num_partitions))
+            x = np.load(os.path.join(path, "x.npy"), mmap_mode="r")
+            y = np.load(os.path.join(path, "y.npy"), mmap_mode="r")
+            if x.shape[1] != self.input_size:
+                raise ValueError(f"Partition {path} has {x.shape[1]} features, expected input-size={self.input_size}")
+            # Small partitions are copied to RAM once; large ones are paged in by the OS on demand
+            if (x.nbytes + y.nbytes) / 2**20 <= in_memory_mb:
+                x, y = np.ascontiguousarray(x), np.ascontiguousarray(y)
+            _PARTITIONS[key] = (x, y)
+        return _PARTITIONS[key]
+
+    def _dir_name(self) -> str:
+        if self.dataset == "synthetic":
+            return f"synthetic-{self.input_size}x{self.output_size}"
+        return self.dataset.replace("/", "__")
+
+    def _prepare(self, partition_id: int, num_partitions: int):
+        if self.dataset == "synthetic":
+            # Deterministic per-partition data: a fixed linear teacher labels Gaussian features
+            teacher = np.random.default_rng(0).standard_normal((self.input_size, self.output_size), dtype=np.float32)
+            rng = np.random.default_rng(1 + partition_id)
+            x = rng.standard_normal((2048, self.input_size), dtype=np.float32)
+            return x, (x @ teacher).argmax(axis=1).astype(np.int64)
+
+        from flwr_datasets import FederatedDataset
+
+        fds = FederatedDataset(dataset=self.dataset, partitioners={"train": num_partitions})
+        partition = fds.load_partition(partition_id).with_format("numpy")
+        feature = next(name for name in ("img", "image", "x", "features") if name in partition.column_names)
+        label = next(name for name in ("label", "labels", "y") if name in partition.column_names)
+        x = np.asarray(partition[feature], dtype=np.float32).reshape(len(partition), -1)
+        if x.max(initial=0.0) > 1.0:
+            x /= 255.0
+        return x, np.asarray(partition[label], dtype=np.int64)
+
+    @staticmethod
+    def _write(path: str, x: np.ndarray, y: np.ndarray) -> None:
+        # Write into a temp dir and rename so concurrent clients never see half-written files
+        tmp = f"{path}.tmp-{os.getpid()}"
+        os.makedirs(tmp, exist_ok=True)
+        np.save(os.path.join(tmp, "x.npy"), np.ascontiguousarray(x, dtype=np.float32))
+        np.save(os.path.join(tmp, "y.npy"), np.ascontiguousarray(y, dtype=np.int64))
+        try:
+            os.rename(tmp, path)
+        except OSError:
+            # Another process finished first
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+class BatchArrayDataset(Dataset):
+    """Rows [start, stop) of the partition arrays, indexed by a whole batch of indices at once
+    so that one worker call gathers one batch.
+
+    Memory-mapped arrays are pickled as their file path, so spawned DataLoader workers
+    re-open the mapping instead of receiving a copy of the data.
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, start: int, stop: int):
+        self.x = x
+        self.y = y
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, indices):
+        # Sorted indices turn random access into forward reads on memory-mapped files
+        indices = np.sort(np.asarray(indices)) + self.start
+        return torch.from_numpy(self.x[indices]), torch.from_numpy(self.y[indices])
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in ("x", "y"):
+            if isinstance(state[name], np.memmap):
+                state[name] = state[name].filename
+        return state
+
+    def __setstate__(self, state):
+        for name in ("x", "y"):
+            if isinstance(state[name], str):
+                state[name] = np.load(state[name], mmap_mode="r")
+        self.__dict__.update(state)
+
+
+def make_loader(key, x: np.ndarray, y: np.ndarray, start: int, stop: int, batch_size: int, shuffle: bool,
+                num_workers: int, prefetch_factor: int, pin_memory: bool) -> DataLoader:
+    """DataLoader reused across rounds (persistent workers keep their state between epochs)."""
+    key = (key, start, stop, batch_size, shuffle, num_workers, prefetch_factor, pin_memory)
+    if key not in _LOADERS:
+        dataset = BatchArrayDataset(x, y, start, stop)
+        sampler = RandomSampler(dataset) if shuffle else SequentialSampler(dataset)
+        options = {}
+        if num_workers > 0:
+            options = {"persistent_workers": True, "prefetch_factor": prefetch_factor}
+        _LOADERS[key] = DataLoader(
+            dataset,
+            sampler=BatchSampler(sampler, batch_size=batch_size, drop_last=False),
+            batch_size=None,
+            num_workers=num_workers,
+            pin_memory=pin_memory,
+            **options,
+        )
+    return _LOADERS[key]
+
+
+def encode_update(weights, reference, scheme: str, topk_ratio: float = 0.01, residual=None):
+    """Encode trained weights for upload.
+
+    Delta schemes (int8 / topk) send weights - reference, where reference is the global
+    model the server sent this round; non-float tensors are always sent as-is.
+    For topk, residual (list of float32 arrays, updated in place) carries the dropped part over.
+    """
+    if scheme == "none":
+        return list(weights)
+    if scheme == "fp16":
+        return [w.astype(np.float16) if w.dtype.kind == "f" else w for w in weights]
+
+    encoded = []
+    for i, (w, ref) in enumerate(zip(weights, reference)):
+        if w.dtype.kind != "f":
+            encoded.append(w)
+            continue
+        delta = w.astype(np.float32) - ref
+        if scheme == "int8":
+            scale = float(np.abs(delta).max()) / 127.0 or 1.0
+            encoded += [np.round(delta / scale).astype(np.int8), np.array([scale], dtype=np.float32)]
+            continue
+        flat = delta.ravel()
+        if residual is not None:
+            flat += residual[i].ravel()
+        k = min(flat.size, max(1, math.ceil(flat.size * topk_ratio)))
+        index = np.argpartition(np.abs(flat), flat.size - k)[flat.size - k:].astype(np.uint32)
+        values = flat[index].astype(np.float16)
+        if residual is not None:
+            flat[index] -= values.astype(np.float32)
+            residual[i] = flat.reshape(w.shape)
+        encoded += [index, values]
+    return encoded
+
+
+class Telemetry:
+    """Structured training progress: one JSONL record per fit / evaluate, plus a "progress" record
+    every `interval` seconds inside a long fit.
+
+    Records go to `path` (pulled over SSH by the participant server) and, when `url` is set, are also
+    POSTed there in batches by a background thread; a slow or unreachable server never blocks training.
+    One instance per process and participant, so the local round counter survives across rounds.
+    """
+
+    def __init__(self, path: str, url: str, participant: str, partition_id: int, interval: float):
+        self.path = path
+        self.url = url
+        self.participant = participant
+        self.partition_id = partition_id
+        self.interval = interval
+        self.node = socket.gethostname()
+        self.rounds = 0
+        self._queue = queue.Queue(maxsize=1000) if url else None
+        if self._queue is not None:
+            threading.Thread(target=self._push_loop, name="telemetry-push", daemon=True).start()
+
+    def next_round(self, config) -> int:
+        # Server rounds come from CompressedFedAvg; other strategies fall back to counting fits
+        self.rounds = int(config.get("server-round", 0)) or self.rounds + 1
+        return self.rounds
+
+    def emit(self, event: str, round_: int, **metrics) -> None:
+        record = {"ts": round(time.time(), 3), "event": event, "round": round_,
+                  "partition_id": self.partition_id, "node": self.node}
+        record.update({k: round(v, 6) if isinstance(v, float) else v for k, v in metrics.items()})
+        if self.path:
+            try:
+                with open(self.path, "a") as f:
+                    f.write(json.dumps(record) + "\n")
+            except OSError:
+                pass
+        if self._queue is not None:
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                pass
+
+    def _push_loop(self) -> None:
+        while True:
+            records = [self._queue.get()]
+            while len(records) < 100:
+                try:
+                    records.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            body = json.dumps({"participant": self.participant, "records": records}).encode("utf-8")
+            request = urllib.request.Request(self.url, body, {"Content-Type": "application/json"})
+            try:
+                urllib.request.urlopen(request, timeout=5).close()
+            except OSError:
+                pass
+
+
+def get_telemetry(cfg, partition_id: int):
+    """Telemetry for this participant (telemetry-file = "" disables the file, telemetry-url enables pushes)."""
+    path = str(cfg.get("telemetry-file", TELEMETRY_FILE))
+    url = str(cfg.get("telemetry-url", ""))
+    participant = str(cfg.get("participant-id", "")) or f"partition-{partition_id}"
+    key = (path, url, participant)
+    if key not in _TELEMETRY:
+        _TELEMETRY[key] = Telemetry(path, url, participant, partition_id, float(cfg.get("telemetry-interval", 10)))
+    return _TELEMETRY[key]
+
+
+def vcpu_count() -> int:
+    """vCPUs this process may actually use (CPU affinity and cgroup v2 quota, not just the host count)."""
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        count = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            count = min(count, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return max(1, count)
+
+
+def default_num_workers() -> int:
+    # Leave at least one vCPU for the training loop itself
+    return max(0, min(4, vcpu_count() - 1))
+
+
+def configure_cpu(intra_op_threads: int, inter_op_threads: int) -> None:
+    """Size torch's thread pools once per process (0 = derive from vCPUs)."""
+    global _CPU_CONFIGURED
+    if _CPU_CONFIGURED:
+        return
+    torch.set_num_threads(intra_op_threads or vcpu_count())
+    try:
+        # Small models gain nothing from running independent ops in parallel
+        torch.set_num_interop_threads(inter_op_threads or 1)
+    except RuntimeError:
+        # Already fixed by earlier parallel work in this process
+        pass
+    _CPU_CONFIGURED = True
+
+
+def build_model(input_size: int, hidden: int, output_size: int) -> torch.nn.Module:
+    return torch.nn.Sequential(
+        torch.nn.Linear(input_size, hidden),
+        torch.nn.ReLU(),
+        torch.nn.Linear(hidden, output_size),
+    )
+
+
+def get_model(device: torch.device, input_size: int, hidden: int, output_size: int, compile_model: bool,
+              channels_last: bool):
+    """(model, forward) reused across rounds: forward is the torch.compile wrapper when enabled.
+
+    Parameters are read and written through model, so state_dict keys stay unprefixed.
+    """
+    key = (device.type, input_size, hidden, output_size, compile_model, channels_last)
+    if key not in _MODELS:
+        model = build_model(input_size, hidden, output_size).to(device)
+        if channels_last:
+            # Only 4D (conv) parameters change layout; Linear layers are unaffected
+            model = model.to(memory_format=torch.channels_last)
+        forward = torch.compile(model) if compile_model else model
+        _MODELS[key] = (model, forward)
+    return _MODELS[key]
+
+
+def autotune_batch_size(cache_dir: str, device: torch.device, input_size: int, hidden: int, output_size: int,
+                        max_batch_size: int) -> int:
+    """Training throughput (samples/s) of a scratch model for each candidate batch size; fastest wins.
+
+    The result is cached in <cache_dir>/autotune.json per model shape, thread count, device and torch version,
+    so the measurement runs once per VM configuration.
+    """
+    path = os.path.join(os.path.expanduser(cache_dir), "autotune.json")
+    key = f"{input_size}x{hidden}x{output_size}-{device.type}-t{torch.get_num_threads()}-torch{torch.__version__}"
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    if key in cache:
+        return int(cache[key]["batch_size"])
+
+    model = build_model(input_size, hidden, output_size).to(device)
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.0)
+    criterion = torch.nn.CrossEntropyLoss()
+    results = {}
+    for batch_size in [b for b in AUTOTUNE_BATCH_SIZES if b <= max_batch_size] or [max_batch_size]:
+        x = torch.randn(batch_size, input_size, device=device)
+        y = torch.randint(0, output_size, (batch_size,), device=device)
+        steps, started = -3, 0.0
+        # The first 3 steps are warm-up and not timed
+        while steps < 0 or time.perf_counter() - started < AUTOTUNE_SECONDS:
+            if steps == 0:
+                if device.type == "cuda":
+                    torch.cuda.synchronize()
+                started = time.perf_counter()
+            optimizer.zero_grad(set_to_none=True)
+            criterion(model(x), y).backward()
+            optimizer.step()
+            steps += 1
+        if device.type == "cuda":
+            torch.cuda.synchronize()
+        results[batch_size] = steps * batch_size / (time.perf_counter() - started)
+
+    best = max(results, key=results.get)
+    cache[key] = {"batch_size": best, "samples_per_second": {str(b): round(r) for b, r in results.items()}}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, "w") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp, path)
+    return best
+
+
+class SimpleClient(NumPyClient):
+    def __init__(self, device: torch.device, model: torch.nn.Module, forward, local_epochs: int,
+                 trainloader: DataLoader, valloader: DataLoader, compression: str = "none",
+                 topk_ratio: float = 0.01, state_key=None, channels_last: bool = False, telemetry=None):
+        self.device = device
+        self.model = model
+        self.forward = forward
+        self.channels_last = channels_last
         self.local_epochs = local_epochs
-        self.model = torch.nn.Sequential(
-            torch.nn.Linear(input_size, hidden),
-            torch.nn.ReLU(),
-            torch.nn.Linear(hidden, output_size),
-        ).to(self.device)
+        self.trainloader = trainloader
+        self.valloader = valloader
+        self.compression = compression
+        self.topk_ratio = topk_ratio
+        self.state_key = state_key
+        self.telemetry = telemetry
         self.criterion = torch.nn.CrossEntropyLoss()
         self.optimizer = torch.optim.Adam(self.model.parameters(), lr=0.001)
 
+    def get_parameters(self, config):
+        # On CPU these are numpy views of the state_dict tensors: no copy until serialization
+        return [t.detach().cpu().numpy() for t in self.model.state_dict().values()]
+
+    def set_parameters(self, parameters):
+        # Copy straight into the existing tensors instead of building a new state_dict
+        with torch.no_grad(), warnings.catch_warnings():
+            # Deserialized arrays are read-only buffers; they are only read here
+            warnings.simplefilter("ignore", UserWarning)
+            for tensor, array in zip(self.model.state_dict().values(), parameters):
+                tensor.copy_(torch.from_numpy(array), non_blocking=True)
+
+    def _inputs(self, x: torch.Tensor) -> torch.Tensor:
+        x = x.to(self.device, non_blocking=self.device.type == "cuda")
+        if self.channels_last and x.dim() == 4:
+            x = x.contiguous(memory_format=torch.channels_last)
+        return x
+
     def fit(self, parameters, config):
-        # Ignore parameters for simplicity (startup from random)
-        steps = int(config.get("steps", 50))
+        if parameters:
+            self.set_parameters(parameters)
+        # Optional cap on batches per epoch (e.g. for quick smoke rounds)
+        max_steps = int(config.get("steps", 0)) or None
+        round_ = self.telemetry.next_round(config) if self.telemetry else 0
+        self.model.train()
+        total_loss, examples, steps = 0.0, 0, 0
+        started = last_report = time.perf_counter()
         for _ in range(self.local_epochs):
-            for _ in range(steps):
-                x = torch.randn(32, self.input_size, device=self.device)
-                y = torch.randint(0, self.output_size, (32,), device=self.device)
+            for step, (x, y) in enumerate(self.trainloader):
+                if max_steps is not None and step >= max_steps:
+                    break
+                x, y = self._inputs(x), y.to(self.device, non_blocking=self.device.type == "cuda")
                 self.optimizer.zero_grad(set_to_none=True)
-                loss = self.criterion(self.model(x), y)
+                loss = self.criterion(self.forward(x), y)
                 loss.backward()
                 self.optimizer.step()
-        return [], 32 * steps, {"train_loss": float(loss.item())}
+                total_loss += loss.item() * len(y)
+                examples += len(y)
+                steps += 1
+                now = time.perf_counter()
+                if self.telemetry and now - last_report >= self.telemetry.interval:
+                    self.telemetry.emit("progress", round_, step=steps, samples=examples,
+                                        samples_per_sec=examples / (now - started),
+                                        train_loss=total_loss / examples, step_time_ms=(now - started) * 1000 / steps)
+                    last_report = now
+        elapsed = time.perf_counter() - started
+        if self.telemetry:
+            self.telemetry.emit("fit", round_, step=steps, samples=examples,
+                                samples_per_sec=examples / elapsed if elapsed > 0 else 0.0,
+                                train_loss=total_loss / max(examples, 1),
+                                step_time_ms=elapsed * 1000 / max(steps, 1), duration_s=elapsed)
+
+        # The server can pick the scheme per round; delta schemes need the global model as reference
+        scheme = str(config.get("compression", self.compression))
+        if scheme not in COMPRESSION_SCHEMES or (scheme in ("int8", "topk") and not parameters):
+            scheme = "none"
+        weights = self.get_parameters({})
+        residual = None
+        if scheme == "topk":
+            residual = _RESIDUALS.setdefault(self.state_key, [np.zeros(w.shape, np.float32) for w in weights])
+        update = encode_update(weights, parameters, scheme, float(config.get("topk-ratio", self.topk_ratio)), residual)
+        return update, examples, {
+            "train_loss": total_loss / max(examples, 1),
+            "compression": scheme,
+            "raw_bytes": sum(w.nbytes for w in weights),
+            "upload_bytes": sum(a.nbytes for a in update),
+        }
 
     def evaluate(self, parameters, config):
-        with torch.no_grad():
-            x = torch.randn(128, self.input_size, device=self.device)
-            y = torch.randint(0, self.output_size, (128,), device=self.device)
-            loss = self.criterion(self.model(x), y).item()
-            acc = float((self.model(x).argmax(dim=1) == y).float().mean().item())
-        return float(loss), 128, {"accuracy": acc}
+        if parameters:
+            self.set_parameters(parameters)
+        self.model.eval()
+        total_loss, correct, examples = 0.0, 0, 0
+        # inference_mode also skips autograd's version counters, unlike no_grad
+        with torch.inference_mode():
+            for x, y in self.valloader:
+                x, y = self._inputs(x), y.to(self.device)
+                logits = self.forward(x)
+                total_loss += self.criterion(logits, y).item() * len(y)
+                correct += int((logits.argmax(dim=1) == y).sum().item())
+                examples += len(y)
+        examples = max(examples, 1)
+        if self.telemetry:
+            round_ = int(config.get("server-round", 0)) or self.telemetry.rounds
+            self.telemetry.emit("evaluate", round_, samples=examples, eval_loss=total_loss / examples,
+                                eval_accuracy=correct / examples)
+        return total_loss / examples, examples, {"accuracy": correct / examples}
 
 
 def client_fn(context: Context):
@@ -52,8 +504,46 @@ def client_fn(context: Context):
     hidden = int(cfg.get("hidden", 64))
     output_size = int(cfg.get("output-size", 10))
     local_epochs = int(cfg.get("local-epochs", 1))
+    num_workers = int(cfg.get("num-workers", -1))
+    num_workers = default_num_workers() if num_workers < 0 else num_workers
+    prefetch_factor = int(cfg.get("prefetch-factor", 4))
+    compile_model = bool(cfg.get("compile", False))
+    channels_last = bool(cfg.get("channels-last", False))
+
+    # CPU profile: compute threads get the vCPUs not used by DataLoader workers
+    if device.type == "cpu":
+        intra = int(cfg.get("intra-op-threads", 0)) or max(1, vcpu_count() - num_workers)
+        configure_cpu(intra, int(cfg.get("inter-op-threads", 0)))
+
+    # Partition assigned to this SuperNode (node_config), falling back to run_config
+    node_cfg = context.node_config
+    partition_id = int(node_cfg.get("partition-id", cfg.get("partition-id", 0)))
+    num_partitions = int(node_cfg.get("num-partitions", cfg.get("num-partitions", 1)))
+
+    store = PartitionStore(str(cfg.get("data-dir", "~/.fl-data")), str(cfg.get("dataset", "synthetic")),
+                           input_size, output_size)
+    x, y = store.load(partition_id, num_partitions, float(cfg.get("in-memory-mb", 512)))
+    split = len(y) - max(1, int(len(y) * VAL_FRACTION))
+    key = (store.root, store.dataset, input_size, partition_id, num_partitions)
+
+    # batch-size = 0: fastest batch size measured on this VM (cached on disk)
+    batch_size = int(cfg.get("batch-size", 0)) or autotune_batch_size(
+        store.root, device, input_size, hidden, output_size, max_batch_size=split
+    )
+    pin_memory = device.type == "cuda"
+    trainloader = make_loader(key, x, y, 0, split, batch_size, True, num_workers, prefetch_factor, pin_memory)
+    # Evaluation is cheap; run it in the main process with larger batches
+    valloader = make_loader(key, x, y, split, len(y), batch_size * 4, False, 0, 0, pin_memory)
 
-    return SimpleClient(device, input_size, hidden, output_size, local_epochs).to_client()
+    model, forward = get_model(device, input_size, hidden, output_size, compile_model, channels_last)
+    return SimpleClient(
+        device, model, forward, local_epochs, trainloader, valloader,
+        compression=str(cfg.get("compression", "none")),
+        topk_ratio=float(cfg.get("topk-ratio", 0.01)),
+        state_key=key,
+        channels_last=channels_last,
+        telemetry=get_telemetry(cfg, partition_id),
+    ).to_client()
 
 
 app = ClientApp(client_fn)
@@ -1,12 +1,89 @@
 # server_app.py
+import numpy as np
+
 import flwr as fl
+from flwr.common import ndarrays_to_parameters, parameters_to_ndarrays
+
 app = fl.server.ServerApp()
 
+
+def decode_update(arrays, reference, scheme):
+    """client_app.encode_update의 역변환: 압축된 업데이트를 reference와 같은 형식의 전체 가중치로 복원
+
+    int8 / topk는 reference(이번 라운드에 보낸 전역 모델) 대비 변화량이며, 실수형이 아닌 텐서는 그대로 온다.
+    """
+    if scheme in ("none", "fp16"):
+        return [a.astype(ref.dtype, copy=False) for a, ref in zip(arrays, reference)]
+
+    weights, pos = [], 0
+    for ref in reference:
+        if ref.dtype.kind != "f":
+            weights.append(arrays[pos])
+            pos += 1
+            continue
+        first, second = arrays[pos], arrays[pos + 1]
+        pos += 2
+        if scheme == "int8":
+            delta = first.astype(np.float32) * second[0]
+        elif scheme == "topk":
+            delta = np.zeros(ref.size, dtype=np.float32)
+            delta[first.astype(np.int64)] = second.astype(np.float32)
+        else:
+            raise ValueError(f"Unknown compression scheme: {scheme}")
+        weights.append((ref + delta.reshape(ref.shape)).astype(ref.dtype, copy=False))
+    return weights
+
+
+class CompressedFedAvg(fl.server.strategy.FedAvg):
+    """클라이언트가 압축해 올린 업데이트(fit 결과의 metrics['compression'])를 복원한 뒤 FedAvg로 집계"""
+
+    def __init__(self, compression="none", topk_ratio=0.01, **kwargs):
+        super().__init__(**kwargs)
+        self.compression = compression
+        self.topk_ratio = topk_ratio
+        self._reference = None
+
+    def configure_fit(self, server_round, parameters, client_manager):
+        # 변화량 복원 기준: 이번 라운드에 클라이언트로 보낸 전역 모델
+        self._reference = parameters_to_ndarrays(parameters)
+        instructions = super().configure_fit(server_round, parameters, client_manager)
+        for _, fit_ins in instructions:
+            fit_ins.config.update({
+                "compression": self.compression,
+                "topk-ratio": self.topk_ratio,
+                "server-round": server_round,
+            })
+        return instructions
+
+    def configure_evaluate(self, server_round, parameters, client_manager):
+        # 클라이언트 텔레메트리 기록의 라운드 번호
+        instructions = super().configure_evaluate(server_round, parameters, client_manager)
+        for _, evaluate_ins in instructions:
+            evaluate_ins.config["server-round"] = server_round
+        return instructions
+
+    def aggregate_fit(self, server_round, results, failures):
+        upload_bytes = 0
+        for _, fit_res in results:
+            scheme = str(fit_res.metrics.get("compression", "none"))
+            upload_bytes += sum(len(t) for t in fit_res.parameters.tensors)
+            if scheme != "none":
+                arrays = parameters_to_ndarrays(fit_res.parameters)
+                fit_res.parameters = ndarrays_to_parameters(decode_update(arrays, self._reference, scheme))
+        parameters, metrics = super().aggregate_fit(server_round, results, failures)
+        if results:
+            metrics = dict(metrics, upload_bytes=upload_bytes)
+        return parameters, metrics
+
+
 # remote-federation에선 이 함수가 호출되지 않습니다.
 @app.server_fn
 def server_fn(ctx: fl.common.Context):
-    # 호출되지 않지만, 형식만 맞춰 둡니다.
+    cfg = ctx.run_config
     return fl.server.ServerAppComponents(
-        strategy=fl.server.strategy.FedAvg(),
-        config=fl.server.ServerConfig(num_rounds=1),
-    )
\ No newline at end of file
+        strategy=CompressedFedAvg(
+            compression=str(cfg.get("compression", "none")),
+            topk_ratio=float(cfg.get("topk-ratio", 0.01)),
+        ),
+        config=fl.server.ServerConfig(num_rounds=int(cfg.get("num-server-rounds", 1))),
+    )
@@ -1,146 +1,890 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request, send_file
 from datetime import datetime
+import json
 import logging
 import os
+import re
 import tempfile
-import subprocess
-import threading
+import time
+
+from config.settings import Config
+from services.artifact_service import artifact_collector
+from services.fl_service import (
+    DEFAULT_AGGREGATOR_ADDRESS,
+    FederatedLearningService,
+    missing_fl_files,
+    new_task_id,
+)
+from services.job_queue import QueueFullError, deployment_queue
+from services.local_supervisor import WORKSPACE_PREFIX, local_supervisor
+from services.placement_service import PlacementConflict, placement_scheduler
+from services.selection_service import parse_weights, participant_selector
+from services.telemetry_service import telemetry_store
+from services.workspace_upload import UPLOAD_PREFIX, UploadTooLarge, needs_stream, normalize_path, read_request
+from utils import tracing
+from utils.prometheus import PrometheusError
+from utils.vm_inventory import vm_inventory
 
 logger = logging.getLogger(__name__)
 
 fl_bp = Blueprint('fl', __name__)
+fl_service = FederatedLearningService()
+
+# 원격 명령과 경로에 들어가는 task_id는 이 형식만 허용
+_TASK_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-][A-Za-z0-9._-]*$')
+
+# 한 번에 push할 수 있는 텔레메트리 기록 수
+_MAX_TELEMETRY_PUSH = 1000
+
+
+def _bool_value(value, name: str, default: bool) -> bool:
+    """JSON bool 또는 'true'/'false', '1'/'0', 'yes'/'no', 'on'/'off' 문자열을 bool로 변환
+
+    값이 없으면 default, 그 밖의 값은 ValueError (HTTP 400)
+    """
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ('1', 'true', 'yes', 'on'):
+        return True
+    if text in ('0', 'false', 'no', 'off'):
+        return False
+    raise ValueError(f'{name} must be a boolean, got {value!r}')
+
+
+def _use_wheelhouse(data: dict) -> bool:
+    """요청의 use_wheelhouse 값 (없으면 FL_USE_WHEELHOUSE 설정을 따름)"""
+    return _bool_value(data.get('use_wheelhouse'), 'use_wheelhouse', Config.FL_USE_WHEELHOUSE)
+
+
+def _number_field(data: dict, name: str, cast, minimum: float, maximum: float):
+    """요청의 숫자 필드를 cast로 변환하고 [minimum, maximum] 범위를 검사 (없으면 None, 잘못되면 ValueError)"""
+    value = data.get(name)
+    if value is None:
+        return None
+    try:
+        if isinstance(value, bool):
+            raise TypeError
+        number = cast(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} must be a number, got {value!r}')
+    if not minimum <= number <= maximum:
+        raise ValueError(f'{name} must be between {minimum} and {maximum}, got {value!r}')
+    return number
+
+
+def _aggregator_address(data: dict, run_config: dict) -> str:
+    """집계자(SuperLink) 주소: 요청 본문 > env_config의 remote-address > 기본값"""
+    return data.get('aggregator_address') or run_config.get('remote-address') or DEFAULT_AGGREGATOR_ADDRESS
+
+
+_UNSUPPORTED_BODY = 'Content-Type must be application/json, multipart/form-data or application/x-tar'
+
+
+def _read_request_body(spool_dir=None, prefix: str = UPLOAD_PREFIX):
+    """요청 본문을 (데이터, 업로드)로 읽음
+
+    JSON은 그대로, gzip으로 압축된 본문이나 multipart/tar(.gz) 작업 공간 업로드는 조각 단위로 읽어
+    파일을 스풀 디렉토리에 둔다 (데이터의 files 값이 SpooledFile). 지원하지 않는 형식이면 (None, None)
+    """
+    if needs_stream(request.headers):
+        return read_request(request.stream, request.headers, request.args, spool_dir, prefix)
+    return (request.get_json() if request.is_json else None), None
+
+
+def _parse_deploy_request(data: dict):
+    """/api/fl/execute와 /api/fl/jobs 공통 요청 검증
+
+    (배포 파라미터, None) 또는 (None, 오류 응답)을 반환. 값 형식이 잘못되면 ValueError
+    """
+    # vm_id를 생략하면 배치 스케줄러가 인벤토리에서 VM을 고름
+    required_fields = ['env_config']
+    missing = [f for f in required_fields if f not in data]
+    if missing:
+        return None, (jsonify({'error': f'Missing required fields: {missing}', 'required_fields': required_fields}), 400)
+
+    received_files = data.get('files', {})  # 요청으로 받은 파일들
+    if missing_fl_files(received_files):
+        return None, (jsonify({'success': False, 'error': 'Required files (pyproject.toml, client_app.py, server_app.py) missing in request'}), 400)
+
+    run_config = data.get('env_config', {}) or {}
+    num_partitions = _number_field(data, 'num_partitions', int, 1, 100000) or 1
+    partition_id = _number_field(data, 'partition_id', int, 0, num_partitions - 1) or 0
+    return dict({
+        'vm_id': data.get('vm_id'),
+        'received_files': received_files,
+        'partition_id': partition_id,
+        'num_partitions': num_partitions,
+        'aggregator_address': _aggregator_address(data, run_config),
+        'deploy_mode': data.get('deploy_mode'),
+        'use_wheelhouse': _use_wheelhouse(data),
+    }, **_placement_params(data)), None
+
+
+def _placement_params(data: dict) -> dict:
+    """작업이 VM마다 요구하는 자원(vcpus, memory_mb)과 배치 정책(placement_policy: spread | binpack)"""
+    return {
+        'demand': placement_scheduler.demand(
+            _number_field(data, 'vcpus', float, 0.1, 1024),
+            _number_field(data, 'memory_mb', int, 0, 16 * 1024 * 1024),
+        ),
+        'placement_policy': data.get('placement_policy'),
+    }
+
+
+def _placement_candidates(vm_id, target_vm, inventory):
+    """배치 후보 VM: vm_id가 있으면 그 VM(target_vm)만, 없으면 inventory에서 floating IP가 있는 모든 VM
+
+    (후보 목록, None) 또는 (None, (오류 본문, 상태 코드))
+    """
+    if vm_id:
+        if not target_vm:
+            return None, ({'success': False, 'error': f'VM with ID {vm_id} not found', 'vm_id': vm_id}, 404)
+        if not target_vm.get('floating_ip'):
+            return None, ({'success': False, 'error': f'VM {vm_id} has no floating IP assigned', 'vm_id': vm_id, 'vm_info': target_vm}, 400)
+        return [target_vm], None
+    vms = [vm for vm in inventory or () if vm.get('floating_ip')]
+    if not vms:
+        return None, ({'success': False, 'error': 'No VMs with a floating IP available for placement'}, 404)
+    return vms, None
+
+
+def _lookup_candidates(vm_id):
+    """_placement_candidates를 인벤토리에서 조회해 호출"""
+    if vm_id:
+        return _placement_candidates(vm_id, vm_inventory.get_by_id(vm_id), None)
+    return _placement_candidates(None, None, vm_inventory.list_vms())
+
+
+def _place_task(task_id: str, vms: list, count: int, params: dict):
+    """지금 배치: (Placement, None) 또는 (None, (409 본문, 409))"""
+    try:
+        return placement_scheduler.place(task_id, vms, count, params['demand'], params['placement_policy']), None
+    except PlacementConflict as e:
+        return None, (_conflict_body(e, vms), 409)
+
+
+def _conflict_body(error: Exception, vms: list) -> dict:
+    snapshot = placement_scheduler.snapshot(vms)
+    candidates = {vm['id'] for vm in vms}
+    return {
+        'success': False,
+        'error': str(error),
+        'placement': {
+            'policy': snapshot['policy'],
+            'queued': snapshot['queued'],
+            'vms': [vm for vm in snapshot['vms'] if vm['vm_id'] in candidates],
+        },
+        'hint': 'Retry later, or submit with ?async=1 (/api/fl/jobs) to wait in the placement queue',
+    }
+
+
+def _submit_deploy_job(params: dict):
+    """배포를 작업 대기열에 넣고 202 응답 (대기열이 가득 차면 429)
+
+    VM에 자원이 없으면 배치 대기열에서 기다렸다가, 배치되는 순간 작업 대기열에 들어간다.
+    """
+    task_id = new_task_id()
+    upload = params.get('upload')
+
+    def cleanup(placement=None):
+        if upload:
+            upload.cleanup()
+
+    def start(placement):
+        target_vm = placement.vms[0]
+
+        def run(job):
+            try:
+                with tracing.trace('fl.job', task_id=task_id, vm_id=target_vm['id'], job_id=job.id):
+                    return deploy(job, target_vm)
+            finally:
+                cleanup()
+
+        job = deployment_queue.submit('deploy', run, meta={'task_id': task_id, 'vm_id': target_vm['id']})
+        placement.job_id = job.id
+
+    def deploy(job, target_vm):
+        result = {'success': False}
+        try:
+            result = fl_service.deploy_to_vm(
+                target_vm, task_id, params['received_files'], params['partition_id'], params['num_partitions'],
+                params['aggregator_address'], deploy_mode=params['deploy_mode'], on_phase=job.phase,
+                use_wheelhouse=params['use_wheelhouse'],
+            )
+            result['task_id'] = task_id
+            return result
+        finally:
+            placement_scheduler.deployed(task_id, target_vm['id'], result.get('success', False))
+
+    try:
+        vms, error = _lookup_candidates(params['vm_id'])
+        if error:
+            cleanup()
+            body, status = error
+            return jsonify(body), status
+        placement = placement_scheduler.submit(
+            task_id, vms, 1, params['demand'], params['placement_policy'], on_placed=start, on_cancelled=cleanup,
+        )
+    except QueueFullError as e:
+        cleanup()
+        response = jsonify({'success': False, 'error': str(e), 'queue': deployment_queue.stats()})
+        return response, 429, {'Retry-After': '5'}
+    except PlacementConflict as e:
+        cleanup()
+        return jsonify(_conflict_body(e, vms)), 409
+    except Exception:
+        cleanup()
+        raise
+
+    body = {
+        'success': True,
+        'task_id': task_id,
+        'vm_id': placement.vms[0]['id'] if placement.allocations else params['vm_id'],
+        'status': 'queued',
+        'placement': placement.to_dict(),
+        'placement_url': f'/api/fl/placements/{task_id}',
+        'submitted_at': datetime.now().isoformat(),
+    }
+    if placement.job_id:
+        body.update({
+            'job_id': placement.job_id,
+            'status_url': f'/api/fl/jobs/{placement.job_id}',
+            'result_url': f'/api/fl/jobs/{placement.job_id}/result',
+        })
+    return jsonify(body), 202
+
 
 @fl_bp.route('/api/fl/execute', methods=['POST'])
 def execute_federated_learning():
-    """VM ID와 run_config, 그리고 파일들을 받아 client_app.py를 실행(flwr run .)"""
+    """VM ID와 run_config, 그리고 파일들을 받아 client_app.py를 실행(flwr run .)
+
+    ?async=1이면 /api/fl/jobs와 같이 작업 대기열에 넣고 202로 바로 응답
+    """
+    upload = None
+    try:
+        data, upload = _read_request_body()
+        if data is None:
+            return jsonify({'error': _UNSUPPORTED_BODY}), 400
+
+        params, error = _parse_deploy_request(data)
+        if error:
+            return error
+        if _bool_value(request.args.get('async'), 'async', False):
+            params['upload'], upload = upload, None  # 작업이 끝나면 대기열 쪽에서 정리
+            return _submit_deploy_job(params)
+
+        vm_id = params['vm_id']
+        with tracing.trace('fl.execute', vm_id=vm_id) as trace:
+            return _execute_sync(params, trace)
+
+    except UploadTooLarge as e:
+        return jsonify({'success': False, 'error': str(e)}), 413
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error executing federated learning: {str(e)}")
+        return jsonify({'success': False, 'error': 'Failed to execute federated learning'}), 500
+    finally:
+        if upload:
+            upload.cleanup()
+
+
+def _execute_sync(params: dict, trace: tracing.Trace):
+    """/api/fl/execute의 동기 배포 (응답의 timings에 단계별 소요 시간 포함)
+
+    VM에 자원이 남아 있지 않으면 배포하지 않고 409로 응답한다.
+    """
+    # VM 정보 조회, 자원 할당 후 SSH로 직접 배포
+    with tracing.span('inventory.lookup'):
+        vms, error = _lookup_candidates(params['vm_id'])
+    if error:
+        body, status = error
+        return jsonify(body), status
+
+    task_id = new_task_id()
+    trace.attrs['task_id'] = task_id
+    placement, error = _place_task(task_id, vms, 1, params)
+    if error:
+        body, status = error
+        return jsonify(body), status
+    target_vm = placement.vms[0]
+    trace.attrs['vm_id'] = target_vm['id']
+
+    logger.info("Using files from request payload")
+    result = {'success': False}
+    try:
+        result = fl_service.deploy_to_vm(
+            target_vm,
+            task_id,
+            params['received_files'],
+            partition_id=params['partition_id'],
+            num_partitions=params['num_partitions'],
+            aggregator_address=params['aggregator_address'],
+            deploy_mode=params['deploy_mode'],
+            use_wheelhouse=params['use_wheelhouse'],
+        )
+    finally:
+        placement_scheduler.deployed(task_id, target_vm['id'], result.get('success', False))
+
+    body, status = _execute_response(task_id, target_vm['id'], target_vm['floating_ip'], result, trace)
+    body['placement'] = placement.to_dict()
+    return jsonify(body), status
+
+
+def _execute_response(task_id: str, vm_id: str, floating_ip: str, result: dict, trace: tracing.Trace):
+    """배포 결과를 /api/fl/execute 응답 형식으로 변환: (본문, 상태 코드)"""
+    response = {
+        'task_id': task_id,
+        'vm_id': vm_id,
+        'target_ip': floating_ip,
+        'submitted_at': datetime.now().isoformat(),
+        'entry_point': 'flwr run .',
+        'success': result['success'],
+        'message': result.get('message', ''),
+    }
+    
+    if result['success']:
+        response['ssh_output'] = result.get('output', '')
+        response['remote_path'] = result.get('remote_path', '')
+        response['deploy_mode'] = result.get('deploy_mode')
+        if 'pid' in result:
+            response['pid'] = result['pid']
+            response['process_running'] = result.get('process_running')
+            response['files'] = result.get('files', [])
+    else:
+        response['error'] = result.get('error', '')
+    response['timings'] = trace.timings()
+
+    return response, (201 if response.get('success') else 500)
+
+
+@fl_bp.route('/api/fl/execute-batch', methods=['POST'])
+def execute_federated_learning_batch():
+    """여러 VM에 같은 파일로 동시에 배포하고, VM별 결과를 끝나는 순서대로 NDJSON으로 스트리밍
+
+    요청 본문: vm_ids(목록) 또는 selector('all' | {'ids', 'ip_prefix', 'limit'} | {'top_k'}), files, env_config,
+    aggregator_address, deploy_mode, max_workers, host_timeout, participants, vcpus, memory_mb, placement_policy
+
+    선택된 VM에 자원이 모자라면 배포하지 않고 409로 응답한다.
+    """
     try:
         if not request.is_json:
             return jsonify({'error': 'Content-Type must be application/json'}), 400
 
         data = request.get_json()
-        required_fields = ['vm_id', 'env_config']
-        missing = [f for f in required_fields if f not in data]
-        if missing:
-            return jsonify({'error': f'Missing required fields: {missing}', 'required_fields': required_fields}), 400
+        params, error = _batch_params(data)
+        if error:
+            body, status = error
+            return jsonify(body), status
 
-        vm_id = data['vm_id']
-        run_config = data.get('env_config', {}) or {}
-        received_files = data.get('files', {})  # 요청으로 받은 파일들
+        vms, not_found = fl_service.select_vms(data.get('vm_ids'), data.get('selector'))
+        if not vms:
+            return jsonify({'success': False, 'error': 'No target VMs matched', 'not_found': not_found}), 404
 
-        # 필수 파일 확인
-        if not received_files or not received_files.get('pyproject.toml') or not received_files.get('client_app.py') or not received_files.get('server_app.py'):
-            return jsonify({'success': False, 'error': 'Required files (pyproject.toml, client_app.py, server_app.py) missing in request'}), 400
-            
-        logger.info("Using files from request payload")
-        pyproj_content = received_files.get('pyproject.toml', '')
-        client_app_content = received_files.get('client_app.py', '')
-        server_app_content = received_files.get('server_app.py', '')
-        task_content = received_files.get('task.py', '')
-
-        # 파일들이 백엔드에서 이미 완전히 준비된 상태로 옴
-        # 추가 패치 불필요
-
-        # 파일들 준비
-        additional_files = {
-            'pyproject.toml': pyproj_content,
-            'client_app.py': client_app_content,
-            'server_app.py': server_app_content,
-        }
-        
-        # task.py가 있으면 추가
-        if task_content:
-            additional_files['task.py'] = task_content
-            
-        # 실행 스크립트 추가
-        additional_files['run_fl.sh'] = '''#!/bin/bash
-set -e
-export PATH=$HOME/.local/bin:$PATH
-
-echo "=== Flower 클라이언트 설정 시작 ==="
-
-echo "Python 및 pip 확인..."
-python3 --version
-
-# pip 설치 확인 및 설치
-if ! python3 -m pip --version 2>/dev/null; then
-    echo "pip를 설치합니다..."
-    sudo apt update && sudo apt install -y python3-pip
-fi
-
-echo "의존성 패키지를 설치합니다..."
-python3 -m pip install --user --upgrade pip
-python3 -m pip install --user flwr>=1.20.0 torch==2.7.1 torchvision==0.22.1
-
-echo "설치된 패키지 확인:"
-python3 -m pip list --user | grep -E "(flwr|torch)"
-
-echo "Flower 클라이언트를 시작합니다..."
-echo "python3로 클라이언트 실행"
-echo "파티션 ID: ` + str(partition_id) + `"
-echo "전체 파티션 수: ` + str(num_partitions) + `"
-echo "집계자 주소: ` + aggregator_address + `"
-python3 client_app.py --server-address ` + aggregator_address + ` --partition-id ` + str(partition_id) + ` --num-partitions ` + str(num_partitions) + ` --local-epochs 3
-'''
-
-        custom_cmd = 'chmod +x run_fl.sh && ./run_fl.sh'
-
-        # VM 정보 조회하고 SSH로 직접 배포
-        from utils.openstack import get_openstack_vmList
-        from services.ssh_service import SSHService
-        
-        vm_list = get_openstack_vmList()
-        target_vm = next((vm for vm in vm_list if vm.get('id') == vm_id), None)
+        task_id = new_task_id()
+        placement, error = _place_task(task_id, vms, params['participants'] or len(vms), params)
+        if error:
+            body, status = error
+            return jsonify(body), status
+        vms = placement.vms
+        aggregator_address = params['aggregator_address']
+        results = fl_service.deploy_batch(
+            vms,
+            task_id=task_id,
+            received_files=params['received_files'],
+            aggregator_address=aggregator_address,
+            deploy_mode=params['deploy_mode'],
+            max_workers=params['max_workers'],
+            host_timeout=params['host_timeout'],
+            use_wheelhouse=params['use_wheelhouse'],
+        )
+
+        def generate():
+            started = time.time()
+            succeeded = 0
+            try:
+                yield json.dumps(_batch_start_event(task_id, aggregator_address, vms, not_found)) + '\n'
+                for result in results:
+                    succeeded += 1 if result.get('success') else 0
+                    placement_scheduler.deployed(task_id, result.get('vm_id'), result.get('success', False))
+                    yield json.dumps(dict(result, event='result', task_id=task_id)) + '\n'
+            finally:
+                # 클라이언트가 끊기면 보고받지 못한 VM의 할당이 'deploying'으로 남지 않도록 반납
+                placement_scheduler.abandon(task_id)
+            yield json.dumps(_batch_done_event(task_id, len(vms), succeeded, started)) + '\n'
+
+        return Response(generate(), mimetype='application/x-ndjson')
+
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error executing batch federated learning: {str(e)}")
+        return jsonify({'success': False, 'error': 'Failed to execute batch federated learning'}), 500
+
+
+def _batch_params(data: dict):
+    """/api/fl/execute-batch 요청 검증: (파라미터, None) 또는 (None, (오류 본문, 상태 코드))
+
+    participants를 주면 선택된 VM 중 그 수만큼을 배치 정책으로 고르고, 없으면 선택된 VM 모두에 자원을 할당한다.
+
+    스트리밍이 시작된 뒤에는 400을 돌려줄 수 없으므로 파라미터는 여기서 모두 검증한다.
+    값 형식이 잘못되면 ValueError
+    """
+    if not data.get('vm_ids') and not data.get('selector'):
+        return None, ({'error': 'Either vm_ids or selector is required'}, 400)
+
+    received_files = data.get('files', {})
+    if missing_fl_files(received_files):
+        return None, ({'success': False, 'error': 'Required files (pyproject.toml, client_app.py, server_app.py) missing in request'}, 400)
+
+    run_config = data.get('env_config', {}) or {}
+    return {
+        'received_files': received_files,
+        'aggregator_address': _aggregator_address(data, run_config),
+        'deploy_mode': data.get('deploy_mode'),
+        'max_workers': _number_field(data, 'max_workers', int, 1, Config.FL_BATCH_MAX_WORKERS),
+        'host_timeout': _number_field(data, 'host_timeout', float, 1, 3600),
+        'use_wheelhouse': _use_wheelhouse(data),
+        'participants': _number_field(data, 'participants', int, 1, 10000),
+        **_placement_params(data),
+    }, None
+
+
+def _batch_start_event(task_id: str, aggregator_address: str, vms: list, not_found: list) -> dict:
+    return {
+        'event': 'start',
+        'task_id': task_id,
+        'aggregator_address': aggregator_address,
+        'total': len(vms),
+        'participants': [{'vm_id': vm['id'], 'partition_id': i} for i, vm in enumerate(vms)],
+        'not_found': not_found,
+        'submitted_at': datetime.now().isoformat(),
+    }
+
+
+def _batch_done_event(task_id: str, total: int, succeeded: int, started: float) -> dict:
+    return {
+        'event': 'done',
+        'task_id': task_id,
+        'succeeded': succeeded,
+        'failed': total - succeeded,
+        'elapsed_ms': int((time.time() - started) * 1000),
+    }
+
+
+@fl_bp.route('/api/fl/select', methods=['GET'])
+def select_participants():
+    """Prometheus(node_exporter) 지표 점수 상위 ?k개 VM 선택 (과부하 VM은 제외)
+
+    ?weights=cpu_idle=0.5,load=0.5 로 가중치를, ?max_load / ?min_cpu_idle / ?min_memory로 제외 기준을,
+    ?max_age=초로 지표 캐시 허용 나이를 바꿀 수 있다 (0이면 새로 조회).
+    """
+    try:
+        args = {'k': _number_field(request.args, 'k', int, 1, 10000)}
+        for name in ('max_load', 'min_cpu_idle', 'min_memory'):
+            args[name] = _number_field(request.args, name, float, 0, 1000)
+        args['max_age'] = _number_field(request.args, 'max_age', float, 0, 3600)
+        if request.args.get('weights'):
+            args['weights'] = parse_weights(request.args['weights'])
+
+        selection = participant_selector.select(**{k: v for k, v in args.items() if v is not None})
+        return jsonify(dict(selection, success=True, count=len(selection['selected']), timestamp=datetime.now().isoformat()))
+
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except PrometheusError as e:
+        logger.error(f"Error selecting participants: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 503
+    except Exception as e:
+        logger.error(f"Error selecting participants: {str(e)}")
+        return jsonify({'success': False, 'error': 'Failed to select participants'}), 500
+
+
+@fl_bp.route('/api/fl/jobs', methods=['POST'])
+def submit_deployment_job():
+    """/api/fl/execute와 같은 요청을 작업 대기열에 넣고 job_id를 즉시 반환 (대기열이 가득 차면 429)"""
+    upload = None
+    try:
+        data, upload = _read_request_body()
+        if data is None:
+            return jsonify({'error': _UNSUPPORTED_BODY}), 400
+
+        params, error = _parse_deploy_request(data)
+        if error:
+            return error
+        params['upload'], upload = upload, None
+        return _submit_deploy_job(params)
+
+    except UploadTooLarge as e:
+        return jsonify({'success': False, 'error': str(e)}), 413
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error submitting deployment job: {str(e)}")
+        return jsonify({'success': False, 'error': 'Failed to submit deployment job'}), 500
+    finally:
+        if upload:
+            upload.cleanup()
+
+
+@fl_bp.route('/api/fl/jobs', methods=['GET'])
+def list_deployment_jobs():
+    """최근 배포 작업 목록과 대기열 상태"""
+    limit = request.args.get('limit', 50, type=int)
+    return jsonify({
+        'queue': deployment_queue.stats(),
+        'jobs': [job.to_dict() for job in deployment_queue.list(limit)],
+        'timestamp': datetime.now().isoformat(),
+    })
+
+
+@fl_bp.route('/api/fl/jobs/<string:job_id>', methods=['GET'])
+def get_deployment_job(job_id: str):
+    """배포 작업의 상태와 단계별 진행 상황"""
+    job = deployment_queue.get(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': f'Job {job_id} not found'}), 404
+    return jsonify(job.to_dict())
+
+
+@fl_bp.route('/api/fl/jobs/<string:job_id>/result', methods=['GET'])
+def get_deployment_job_result(job_id: str):
+    """완료된 배포 작업의 결과 (아직 진행 중이면 202)"""
+    job = deployment_queue.get(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': f'Job {job_id} not found'}), 404
+    if not job.done:
+        return jsonify(job.to_dict()), 202
+    return jsonify(job.to_dict(include_result=True))
+
+
+@fl_bp.route('/api/fl/placements', methods=['GET'])
+def list_placements():
+    """VM별 용량/사용 중인 자원/실행 중인 작업과 배치 대기열"""
+    try:
+        snapshot = placement_scheduler.snapshot(vm_inventory.list_vms())
+        return jsonify(dict(snapshot, success=True, timestamp=datetime.now().isoformat()))
+    except Exception as e:
+        logger.error(f"Error listing placements: {str(e)}")
+        return jsonify({'success': False, 'error': 'Failed to list placements'}), 500
+
+
+@fl_bp.route('/api/fl/placements/<string:task_id>', methods=['GET'])
+def get_placement(task_id: str):
+    """작업의 배치 상태 (대기 중이면 status 'queued', 배치되면 할당된 VM과 배포 job_id)"""
+    placement = placement_scheduler.get(task_id)
+    if not placement:
+        return jsonify({'success': False, 'error': f'Placement for {task_id} not found'}), 404
+    return jsonify(dict(placement.to_dict(), success=True))
+
+
+@fl_bp.route('/api/fl/placements/<string:task_id>', methods=['DELETE'])
+def release_placement(task_id: str):
+    """작업의 자원 할당을 반납하거나(?vm_id=가 있으면 그 VM만) 대기 중인 요청을 취소
+
+    원격 프로세스는 종료하지 않는다. 끝난 작업은 스케줄러가 주기적으로 확인해 자동으로 반납한다.
+    """
+    placement = placement_scheduler.release(task_id, request.args.get('vm_id'))
+    if not placement:
+        return jsonify({'success': False, 'error': f'Placement for {task_id} not found'}), 404
+    return jsonify(dict(placement.to_dict(), success=True))
+
+
+@fl_bp.route('/api/debug/deployments/slowest', methods=['GET'])
+def get_slowest_deployments():
+    """최근 배포 추적 중 오래 걸린 순으로 ?limit개 (?name=fl.execute|fl.job|fl.deploy로 필터)"""
+    limit = min(max(1, request.args.get('limit', 10, type=int)), 100)
+    return jsonify({
+        'deployments': tracing.slowest(limit, request.args.get('name')),
+        'timestamp': datetime.now().isoformat(),
+    })
+
+
+@fl_bp.route('/api/fl/logs/<string:task_id>', methods=['GET'])
+def get_task_logs(task_id: str):
+    """작업 로그를 바이트 offset부터 증분 조회 (?follow=1이면 tail -F 기반 SSE 스트림)
+
+    쿼리: vm_id(필수), offset(이전 응답의 next_offset), max_bytes(청크 최대 크기), follow
+    follow 모드에서는 Last-Event-ID 헤더로 이어받기를 지원한다.
+    """
+    try:
+        params, error = _logs_params(task_id, request.args, request.headers)
+        if error:
+            body, status = error
+            return jsonify(body), status
+        vm_id, follow, offset, max_bytes = params['vm_id'], params['follow'], params['offset'], params['max_bytes']
+
+        target_vm = vm_inventory.get_by_id(vm_id)
         if not target_vm:
-            return jsonify({'success': False, 'error': f'VM with ID {vm_id} not found', 'vm_id': vm_id}), 404
-        
+            return jsonify({'success': False, 'error': f'VM {vm_id} not found', 'vm_id': vm_id}), 404
         floating_ip = target_vm.get('floating_ip')
         if not floating_ip:
-            return jsonify({'success': False, 'error': f'VM {vm_id} has no floating IP assigned', 'vm_id': vm_id, 'vm_info': target_vm}), 400
-        
-        task_id = f"fl-task-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
-        
-        ssh_service = SSHService()
-        result = ssh_service.deploy_and_execute_fl_code(
-            floating_ip=floating_ip,
-            task_id=task_id,
-            env_config={},
-            entry_point=None,
-            additional_files=additional_files,
-            custom_command=custom_cmd,
-        )
-        
-        # 응답 형식 맞추기
-        response = {
-            'task_id': task_id,
-            'vm_id': vm_id,
-            'target_ip': floating_ip,
-            'submitted_at': datetime.now().isoformat(),
-            'entry_point': 'flwr run .',
-            'success': result['success'],
-            'message': result.get('message', ''),
-        }
-        
-        if result['success']:
-            response['ssh_output'] = result.get('output', '')
-            response['remote_path'] = result.get('remote_path', '')
-        else:
-            response['error'] = result.get('error', '')
+            return jsonify({'success': False, 'error': f'VM {vm_id} has no floating IP', 'vm_id': vm_id}), 400
+
+        if not follow:
+            result = fl_service.get_task_logs(task_id, vm_id, offset, max_bytes)
+            return jsonify(result), (200 if result.get('success') else 502)
+
+        def generate():
+            try:
+                for chunk in fl_service.ssh_service.follow_logs(floating_ip, task_id, offset, max_bytes):
+                    if chunk is None:
+                        yield _SSE_KEEPALIVE
+                        continue
+                    yield _sse_log_event(chunk)
+                yield _SSE_END_EVENT
+            except Exception as e:
+                logger.error(f"Error following logs of {task_id} on {vm_id}: {str(e)}")
+                yield _sse_error_event(e)
 
-        return jsonify(response), (201 if response.get('success') else 500)
+        return Response(generate(), mimetype='text/event-stream', headers=_SSE_HEADERS)
 
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
-        logger.error(f"Error executing federated learning: {str(e)}")
-        return jsonify({'success': False, 'error': 'Failed to execute federated learning'}), 500
+        logger.error(f"Error getting task logs: {str(e)}")
+        return jsonify({'success': False, 'error': 'Failed to get task logs'}), 500
+
+
+def _logs_params(task_id: str, args, headers):
+    """/api/fl/logs 요청 검증: (파라미터, None) 또는 (None, (오류 본문, 상태 코드)), 값이 잘못되면 ValueError"""
+    vm_id = args.get('vm_id')
+    if not vm_id:
+        return None, ({'success': False, 'error': 'vm_id query parameter is required'}, 400)
+    if not _TASK_ID_PATTERN.match(task_id):
+        return None, ({'success': False, 'error': f'Invalid task_id: {task_id}'}, 400)
+
+    follow = _bool_value(args.get('follow'), 'follow', False)
+    offset = _number_field(args, 'offset', int, 0, 2 ** 62)
+    if offset is None and follow:
+        offset = _number_field(headers, 'Last-Event-ID', int, 0, 2 ** 62)
+    return {
+        'vm_id': vm_id,
+        'follow': follow,
+        'offset': offset or 0,
+        'max_bytes': _number_field(args, 'max_bytes', int, 1024, Config.FL_LOG_MAX_CHUNK_BYTES),
+    }, None
+
+
+@fl_bp.route('/api/fl/status/<string:task_id>', methods=['GET'])
+def get_task_status(task_id: str):
+    """작업 프로세스 상태 (?vm_id= 필수): state, exit_code, 시작/종료 시각, CPU, RSS"""
+    try:
+        vm_id, error = _status_params(task_id, request.args)
+        if error:
+            body, status = error
+            return jsonify(body), status
+        if not vm_inventory.get_by_id(vm_id):
+            return jsonify({'success': False, 'error': f'VM {vm_id} not found', 'vm_id': vm_id}), 404
+
+        result = fl_service.get_task_status(task_id, vm_id)
+        return jsonify(result), (200 if result.get('success') else 502)
+
+    except Exception as e:
+        logger.error(f"Error getting task status: {str(e)}")
+        return jsonify({'success': False, 'error': 'Failed to get task status'}), 500
+
+
+def _status_params(task_id: str, args):
+    """/api/fl/status 요청 검증: (vm_id, None) 또는 (None, (오류 본문, 상태 코드))"""
+    vm_id = args.get('vm_id')
+    if not vm_id:
+        return None, ({'success': False, 'error': 'vm_id query parameter is required'}, 400)
+    if not _TASK_ID_PATTERN.match(task_id):
+        return None, ({'success': False, 'error': f'Invalid task_id: {task_id}'}, 400)
+    return vm_id, None
+
+
+_SSE_HEADERS = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+_SSE_END_EVENT = 'event: end\ndata: {}\n\n'
+_SSE_KEEPALIVE = ': keepalive\n\n'
+
+
+def _sse_log_event(chunk: dict) -> str:
+    # id에 다음 offset을 넣어 재연결 시 Last-Event-ID로 이어받음
+    return f"id: {chunk['next_offset']}\nevent: log\ndata: {json.dumps(chunk)}\n\n"
+
+
+def _sse_error_event(error: Exception) -> str:
+    return f"event: error\ndata: {json.dumps({'error': str(error)})}\n\n"
+
+
+@fl_bp.route('/api/fl/artifacts/<string:task_id>', methods=['POST'])
+def collect_task_artifacts(task_id: str):
+    """작업에 참여한 VM들의 작업 공간(로그, 체크포인트, 지표)을 동시에 수집해 하나의 tar로 묶음
+
+    요청 본문(선택): vm_ids(목록) 또는 selector (execute-batch와 같음, 없으면 'all'), max_workers
+    작업 공간이 없는 VM은 missing으로 표시된다. 묶은 파일은 GET .../download로 받는다.
+    """
+    try:
+        if not _TASK_ID_PATTERN.match(task_id):
+            return jsonify({'success': False, 'error': f'Invalid task_id: {task_id}'}), 400
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return jsonify({'success': False, 'error': 'Request body must be a JSON object'}), 400
+        max_workers = _number_field(data, 'max_workers', int, 1, Config.FL_ARTIFACT_MAX_WORKERS)
+
+        vms, not_found = fl_service.select_vms(data.get('vm_ids'), data.get('selector') or 'all')
+        if not vms:
+            return jsonify({'success': False, 'error': 'No target VMs matched', 'not_found': not_found}), 404
+
+        manifest = artifact_collector.collect(task_id, vms, max_workers=max_workers)
+        return jsonify(dict(
+            manifest,
+            success=manifest['succeeded'] > 0,
+            not_found=not_found,
+            download_url=f'/api/fl/artifacts/{task_id}/download',
+        ))
+
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error collecting artifacts for {task_id}: {str(e)}")
+        return jsonify({'success': False, 'error': 'Failed to collect artifacts'}), 500
+
+
+@fl_bp.route('/api/fl/artifacts/<string:task_id>', methods=['GET'])
+def get_task_artifacts(task_id: str):
+    """마지막 산출물 수집 결과 (VM별 크기, 해시, 소요 시간)"""
+    if not _TASK_ID_PATTERN.match(task_id):
+        return jsonify({'success': False, 'error': f'Invalid task_id: {task_id}'}), 400
+    manifest = artifact_collector.get_manifest(task_id)
+    if manifest is None:
+        return jsonify({'success': False, 'error': f'No artifacts collected for task {task_id}'}), 404
+    return jsonify(dict(manifest, success=True, download_url=f'/api/fl/artifacts/{task_id}/download'))
+
+
+@fl_bp.route('/api/fl/artifacts/<string:task_id>/download', methods=['GET'])
+def download_task_artifacts(task_id: str):
+    """수집한 산출물 tar (<task_id>/<vm_id>.tar.gz와 manifest.json)"""
+    if not _TASK_ID_PATTERN.match(task_id):
+        return jsonify({'success': False, 'error': f'Invalid task_id: {task_id}'}), 400
+    path = artifact_collector.archive_path(task_id)
+    if not os.path.isfile(path):
+        return jsonify({'success': False, 'error': f'No artifacts collected for task {task_id}'}), 404
+    return send_file(path, mimetype='application/x-tar', as_attachment=True, download_name=os.path.basename(path))
+
+
+@fl_bp.route('/api/fl/telemetry/<string:task_id>', methods=['POST'])
+def push_task_telemetry(task_id: str):
+    """클라이언트가 보내는 학습 텔레메트리 (client_app.py의 telemetry-url)
+
+    본문: {'participant': 이름, 'records': [기록, ...]} 또는 기록 목록/기록 하나.
+    participant가 없으면 기록의 partition_id로 partition-<id>를 참가자 이름으로 쓴다.
+    """
+    if not _TASK_ID_PATTERN.match(task_id):
+        return jsonify({'success': False, 'error': f'Invalid task_id: {task_id}'}), 400
+    data = request.get_json(silent=True)
+    participant = data.get('participant') if isinstance(data, dict) else None
+    if isinstance(data, dict):
+        records = data['records'] if 'records' in data else [data]
+    else:
+        records = data
+    if not isinstance(records, list):
+        return jsonify({'success': False, 'error': 'Body must be a record, a list of records or {"records": [...]}'}), 400
+    if len(records) > _MAX_TELEMETRY_PUSH:
+        return jsonify({'success': False, 'error': f'At most {_MAX_TELEMETRY_PUSH} records per request'}), 413
+    if participant is not None and not (isinstance(participant, str) and 0 < len(participant) <= 128):
+        return jsonify({'success': False, 'error': 'participant must be a non-empty string (max 128 chars)'}), 400
+
+    groups = {}
+    for record in records:
+        name = participant
+        if name is None:
+            partition_id = record.get('partition_id') if isinstance(record, dict) else None
+            name = f'partition-{partition_id}' if isinstance(partition_id, int) else 'unknown'
+        groups.setdefault(name, []).append(record)
+    accepted = sum(telemetry_store.add(task_id, name, group) for name, group in groups.items())
+    return jsonify({'success': True, 'accepted': accepted, 'rejected': len(records) - accepted})
+
+
+@fl_bp.route('/api/fl/telemetry/<string:task_id>/pull', methods=['POST'])
+def pull_task_telemetry(task_id: str):
+    """참가자 VM들의 telemetry.jsonl에서 지난 pull 이후 추가된 기록을 SSH로 동시에 가져옴
+
+    요청 본문(선택): vm_ids(목록) 또는 selector (execute-batch와 같음, 없으면 'all'), max_workers
+    """
+    try:
+        if not _TASK_ID_PATTERN.match(task_id):
+            return jsonify({'success': False, 'error': f'Invalid task_id: {task_id}'}), 400
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return jsonify({'success': False, 'error': 'Request body must be a JSON object'}), 400
+        max_workers = _number_field(data, 'max_workers', int, 1, Config.FL_BATCH_MAX_WORKERS)
+
+        vms, not_found = fl_service.select_vms(data.get('vm_ids'), data.get('selector') or 'all')
+        if not vms:
+            return jsonify({'success': False, 'error': 'No target VMs matched', 'not_found': not_found}), 404
+
+        result = telemetry_store.pull(task_id, vms, max_workers=max_workers)
+        return jsonify(dict(result, success=True, not_found=not_found))
+
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error pulling telemetry for {task_id}: {str(e)}")
+        return jsonify({'success': False, 'error': 'Failed to pull telemetry'}), 500
+
+
+@fl_bp.route('/api/fl/telemetry/<string:task_id>', methods=['GET'])
+def get_task_telemetry(task_id: str):
+    """참가자별 학습 지표를 같은 x축(라운드 또는 시각)에 맞춘 시계열과 최근 값, 느린 참가자 목록
+
+    쿼리: metrics(쉼표 구분), align(round | time), step(구간 폭: 라운드 수 또는 초), since(epoch 초),
+    max_points(최대 구간 수), participants(쉼표 구분), pull(1이면 이전에 pull한 VM에서 먼저 이어 읽음)
+    """
+    try:
+        if not _TASK_ID_PATTERN.match(task_id):
+            return jsonify({'success': False, 'error': f'Invalid task_id: {task_id}'}), 400
+        args = request.args
+        if _bool_value(args.get('pull'), 'pull', False):
+            vms, _ = fl_service.select_vms(telemetry_store.pulled_vms(task_id))
+            if vms:
+                telemetry_store.pull(task_id, vms)
+
+        result = telemetry_store.query(
+            task_id,
+            metrics=_csv_arg(args.get('metrics')),
+            align=args.get('align', 'round'),
+            step=_number_field(args, 'step', float, 0.001, 10 ** 9),
+            since=_number_field(args, 'since', float, 0, 10 ** 11),
+            max_points=_number_field(args, 'max_points', int, 1, 10000),
+            participants=_csv_arg(args.get('participants')),
+        )
+        if result is None:
+            return jsonify({'success': False, 'error': f'No telemetry for task {task_id}'}), 404
+        return jsonify(dict(result, success=True, timestamp=datetime.now().isoformat()))
+
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error querying telemetry for {task_id}: {str(e)}")
+        return jsonify({'success': False, 'error': 'Failed to query telemetry'}), 500
+
+
+def _csv_arg(value):
+    """쉼표로 구분한 쿼리 값 목록 (비어 있으면 None)"""
+    items = [item.strip() for item in (value or '').split(',') if item.strip()]
+    return items or None
 
 
 @fl_bp.route('/api/fl/execute-local', methods=['POST'])
 def execute_federated_learning_local():
-    """파일들을 받아서 로컬에서 python3 client_app.py를 직접 실행"""
+    """파일들을 받아서 로컬에서 python3 client_app.py를 직접 실행
+
+    실행은 local_supervisor가 관리하며 (동시 실행 수 제한, 로그 파일 기록, 취소, 작업 공간 정리)
+    진행 상황은 /api/fl/local/<task_id>로 조회한다.
+    """
+    upload = None
     try:
-        if not request.is_json:
-            return jsonify({'error': 'Content-Type must be application/json'}), 400
+        # 업로드는 로컬 작업 공간 위치(시스템 임시 디렉토리, WORKSPACE_PREFIX)에 바로 스풀해 그대로 사용
+        data, upload = _read_request_body(tempfile.gettempdir(), WORKSPACE_PREFIX)
+        if data is None:
+            return jsonify({'error': _UNSUPPORTED_BODY}), 400
 
-        data = request.get_json()
         required_fields = ['server_address']
         missing = [f for f in required_fields if f not in data]
         if missing:
@@ -157,16 +901,23 @@ def execute_federated_learning_local():
         if missing_files:
             return jsonify({'success': False, 'error': f'Required files missing: {missing_files}'}), 400
 
-        # 임시 디렉토리 생성
-        temp_dir = tempfile.mkdtemp(prefix='fl_client_')
-        task_id = f"fl-local-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
-        
-        # 파일들을 임시 디렉토리에 저장
-        for filename, content in received_files.items():
-            file_path = os.path.join(temp_dir, filename)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-        
+        task_id = new_task_id('fl-local')
+        if upload:
+            temp_dir = upload.root
+        else:
+            # 작업 공간 밖을 가리키는 이름은 디렉토리를 만들기 전에 거부 (UploadError -> 400)
+            workspace_files = {normalize_path(name): content for name, content in received_files.items()}
+
+            # 임시 디렉토리 생성
+            temp_dir = tempfile.mkdtemp(prefix=WORKSPACE_PREFIX)
+
+            # 파일들을 임시 디렉토리에 저장 (하위 디렉토리 포함)
+            for filename, content in workspace_files.items():
+                file_path = os.path.join(temp_dir, filename)
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+
         logger.info(f"Files written to temporary directory: {temp_dir}")
         
         # client_app.py 실행 명령 구성
@@ -177,74 +928,29 @@ def execute_federated_learning_local():
             '--local-epochs', str(local_epochs)
         ]
         
-        # 백그라운드에서 실행할 함수
-        def run_client():
-            try:
-                # 환경 변수 설정 (필요한 경우)
-                env = os.environ.copy()
-                env['PYTHONPATH'] = temp_dir
-                
-                # 1. 먼저 필요한 패키지들 설치
-                logger.info(f"Installing required packages for {task_id}")
-                
-                # pip 업그레이드 먼저 실행
-                upgrade_cmd = ['python3', '-m', 'pip', 'install', '--upgrade', 'pip']
-                subprocess.run(upgrade_cmd, cwd=temp_dir, env=env, capture_output=True)
-                
-                # 패키지 설치
-                pip_cmd = [
-                    'python3', '-m', 'pip', 'install',
-                    'flwr>=1.20.0', 'torch==2.7.1', 'torchvision==0.22.1', 
-                    'mlflow', 'scikit-learn', 'Pillow'
-                ]
-                
-                pip_process = subprocess.run(
-                    pip_cmd,
-                    cwd=temp_dir,
-                    env=env,
-                    capture_output=True,
-                    text=True,
-                    timeout=600  # 10분 타임아웃 (패키지 설치)
-                )
-                
-                if pip_process.returncode != 0:
-                    logger.error(f"Package installation failed for {task_id}")
-                    logger.error(f"STDOUT: {pip_process.stdout}")
-                    logger.error(f"STDERR: {pip_process.stderr}")
-                    logger.error(f"Return code: {pip_process.returncode}")
-                    return
-                else:
-                    logger.info(f"Packages installed successfully for {task_id}")
-                    logger.info(f"Installation output: {pip_process.stdout}")
-                
-                # 2. client_app.py 실행
-                logger.info(f"Starting FL client {task_id}")
-                process = subprocess.run(
-                    python_cmd,
-                    cwd=temp_dir,
-                    env=env,
-                    capture_output=True,
-                    text=True,
-                    timeout=3600  # 1시간 타임아웃
-                )
-                
-                # 결과 로깅
-                if process.returncode == 0:
-                    logger.info(f"FL Client {task_id} completed successfully")
-                    logger.info(f"Output: {process.stdout}")
-                else:
-                    logger.error(f"FL Client {task_id} failed with return code {process.returncode}")
-                    logger.error(f"Stderr: {process.stderr}")
-                    
-            except subprocess.TimeoutExpired:
-                logger.error(f"FL Client {task_id} timed out")
-            except Exception as e:
-                logger.error(f"Error running FL Client {task_id}: {str(e)}")
+        # 환경 변수 설정
+        env = os.environ.copy()
+        env['PYTHONPATH'] = temp_dir
+
+        # pip 업그레이드 -> 패키지 설치 -> client_app.py 실행 순서로 진행
+        steps = [
+            ('upgrade_pip', ['python3', '-m', 'pip', 'install', '--upgrade', 'pip'], Config.FL_LOCAL_INSTALL_TIMEOUT),
+            ('install', [
+                'python3', '-m', 'pip', 'install',
+                'flwr>=1.20.0', 'torch==2.7.1', 'torchvision==0.22.1',
+                'mlflow', 'scikit-learn', 'Pillow'
+            ], Config.FL_LOCAL_INSTALL_TIMEOUT),
+            ('run', python_cmd, Config.FL_LOCAL_RUN_TIMEOUT),
+        ]
+        meta = {'server_address': server_address, 'local_epochs': local_epochs}
+
+        try:
+            task = local_supervisor.submit(task_id, temp_dir, steps, env, meta=meta)
+        except QueueFullError as e:
+            response = jsonify({'success': False, 'error': str(e), 'queue': local_supervisor.stats()})
+            return response, 429, {'Retry-After': '30'}
+        upload = None  # 작업 공간은 이제 local_supervisor가 정리
 
-        # 백그라운드 스레드에서 실행
-        thread = threading.Thread(target=run_client, daemon=True)
-        thread.start()
-        
         response = {
             'task_id': task_id,
             'server_address': server_address,
@@ -252,12 +958,53 @@ def execute_federated_learning_local():
             'submitted_at': datetime.now().isoformat(),
             'success': True,
             'message': 'Federated Learning client started successfully',
+            'status': task.status,
+            'status_url': f'/api/fl/local/{task_id}',
             'temp_dir': temp_dir,
+            'log_path': task.log_path,
             'command': ' '.join(python_cmd)
         }
         
         return jsonify(response), 201
         
+    except UploadTooLarge as e:
+        return jsonify({'success': False, 'error': str(e)}), 413
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Error executing local federated learning: {str(e)}")
         return jsonify({'success': False, 'error': f'Failed to execute local federated learning: {str(e)}'}), 500
+    finally:
+        if upload:
+            upload.cleanup()
+
+
+@fl_bp.route('/api/fl/local', methods=['GET'])
+def list_local_tasks():
+    """최근 로컬 클라이언트 작업 목록과 동시 실행 상태"""
+    limit = request.args.get('limit', 50, type=int)
+    return jsonify({
+        'queue': local_supervisor.stats(),
+        'tasks': [task.to_dict() for task in local_supervisor.list(limit)],
+        'timestamp': datetime.now().isoformat(),
+    })
+
+
+@fl_bp.route('/api/fl/local/<string:task_id>', methods=['GET'])
+def get_local_task(task_id: str):
+    """로컬 클라이언트 작업 상태와 로그 마지막 부분"""
+    task = local_supervisor.get(task_id)
+    if not task:
+        return jsonify({'success': False, 'error': f'Local task {task_id} not found'}), 404
+    return jsonify(task.to_dict(include_log=True))
+
+
+@fl_bp.route('/api/fl/local/<string:task_id>/cancel', methods=['POST'])
+def cancel_local_task(task_id: str):
+    """대기 중이거나 실행 중인 로컬 클라이언트 작업 취소"""
+    task = local_supervisor.cancel(task_id)
+    if not task:
+        return jsonify({'success': False, 'error': f'Local task {task_id} not found'}), 404
+    if task.job and task.job.done and not task.cancelled:
+        return jsonify({'success': False, 'error': f'Local task {task_id} already finished', 'status': task.status}), 409
+    return jsonify({'success': True, 'task_id': task_id, 'status': task.status, 'message': 'Cancellation requested'})
@@ -2,45 +2,100 @@ from flask import Blueprint, jsonify, request
 from datetime import datetime
 import logging
 
-from utils.openstack import get_openstack_vmList
-from services.ssh_service import SSHService
+import time
+
+from config.settings import Config
+from utils.vm_inventory import vm_inventory
+from services.fingerprint_service import fingerprint_cache, matches
+from services.health_service import ssh_health
 
 logger = logging.getLogger(__name__)
 
 vm_bp = Blueprint('vm', __name__)
-ssh_service = SSHService()
 
 @vm_bp.route('/api/vms', methods=['GET'])
 def get_vm_list():
-    """VM ID와 Floating IP 목록 조회 API"""
+    """VM ID와 Floating IP 목록 조회 API (?refresh=true 이면 캐시를 무시하고 재조회)"""
     try:
-        vm_list = get_openstack_vmList()
-        if vm_list is None:
-            vm_list = []
+        if request.args.get('refresh', '').lower() in ('1', 'true', 'yes'):
+            vm_inventory.refresh()
+        vm_list = vm_inventory.list_vms()
         
         return jsonify({
             'status': 'success',
             'count': len(vm_list),
             'vms': vm_list,
+            'cache': vm_inventory.info(),
             'timestamp': datetime.now().isoformat()
         })
     except Exception as e:
         logger.error(f"Error in get_vm_list endpoint: {str(e)}")
         return jsonify({'error': 'Failed to retrieve VM list'}), 500
 
+def _max_age(args) -> float:
+    """?max_age=초 (그 안에 끝난 점검 결과는 재사용, 기본 0 = 항상 새로 점검)"""
+    return max(0.0, args.get('max_age', 0, type=float))
+
+
+def _sweep_deadline(args) -> float:
+    deadline = args.get('deadline', Config.SSH_HEALTH_SWEEP_DEADLINE, type=float)
+    return min(max(0.0, deadline), 120.0)
+
+
+def _sweep_response(vms: list, results: dict, started: float) -> dict:
+    """VM 목록과 호스트별 점검 결과를 /api/vms/ssh-check-all 응답으로 변환"""
+    items = []
+    for vm in vms:
+        ip = vm.get('floating_ip')
+        result = dict(results[ip]) if ip else {'success': False, 'status': 'no_ip', 'error': f"VM {vm.get('id')} has no floating IP"}
+        result.pop('checked_at', None)
+        result.update({'vm_id': vm.get('id'), 'target_ip': ip, 'history': ssh_health.history(ip) if ip else []})
+        items.append(result)
+
+    summary = {'total': len(items)}
+    for item in items:
+        summary[item['status']] = summary.get(item['status'], 0) + 1
+    return {
+        'success': True,
+        'summary': summary,
+        'results': items,
+        'elapsed_ms': int((time.time() - started) * 1000),
+        'timestamp': datetime.now().isoformat(),
+    }
+
+
+@vm_bp.route('/api/vms/ssh-check-all', methods=['GET'])
+def ssh_check_all():
+    """인벤토리의 모든 VM을 동시에 SSH 점검 (?deadline=초 안에 끝난 결과만, 나머지는 pending)
+
+    ?max_age=초를 주지 않으면 SSH_HEALTH_TTL 이내의 캐시된 결과를 재사용한다.
+    """
+    try:
+        started = time.time()
+        deadline = _sweep_deadline(request.args)
+        max_age = request.args.get('max_age', None, type=float)
+
+        vms = vm_inventory.list_vms()
+        targets = [vm for vm in vms if vm.get('floating_ip')]
+        results = ssh_health.sweep([vm['floating_ip'] for vm in targets], deadline, max_age)
+        return jsonify(_sweep_response(vms, results, started))
+    except Exception as e:
+        logger.error(f"Error in ssh_check_all: {str(e)}")
+        return jsonify({'success': False, 'error': 'SSH sweep failed'}), 500
+
 @vm_bp.route('/api/vms/<string:vm_id>/ssh-check', methods=['GET'])
 def ssh_check(vm_id: str):
     """주어진 VM ID의 Floating IP로 SSH 접속 가능 여부 확인"""
     try:
-        vm_list = get_openstack_vmList() or []
-        target = next((vm for vm in vm_list if vm.get('id') == vm_id), None)
+        target = vm_inventory.get_by_id(vm_id)
         if not target:
             return jsonify({'success': False, 'error': f'VM {vm_id} not found'}), 404
         ip = target.get('floating_ip')
         if not ip:
             return jsonify({'success': False, 'error': f'VM {vm_id} has no floating IP'}), 400
 
-        result = ssh_service.check_connection(ip)
+        result = ssh_health.check(ip, max_age=_max_age(request.args))
+        result.pop('checked_at', None)
         status = 200 if result.get('success') else 502
         result.update({'vm_id': vm_id, 'target_ip': ip, 'timestamp': datetime.now().isoformat()})
         return jsonify(result), status
@@ -48,6 +103,76 @@ def ssh_check(vm_id: str):
         logger.error(f"Error in ssh_check for {vm_id}: {str(e)}")
         return jsonify({'success': False, 'error': 'SSH check failed'}), 500
 
+def _fingerprint_max_age(args):
+    """?refresh=true 이면 0 (항상 새로 수집), 아니면 ?max_age=초 또는 FL_FINGERPRINT_TTL"""
+    if args.get('refresh', '').lower() in ('1', 'true', 'yes'):
+        return 0.0
+    return args.get('max_age', None, type=float)
+
+
+def _fingerprint_filters(args) -> dict:
+    """/api/vms/fingerprints 필터 (min_vcpus, min_gpus, min_memory_mb, min_disk_free_mb, python, flwr, torch, env_cache)"""
+    filters = {key: args.get(key, None, type=int) for key in ('min_vcpus', 'min_gpus', 'min_memory_mb', 'min_disk_free_mb')}
+    filters.update({key: args.get(key) for key in ('python', 'flwr', 'torch')})
+    if args.get('env_cache'):
+        filters['env_cache'] = args.get('env_cache').lower() in ('1', 'true', 'yes')
+    return {key: value for key, value in filters.items() if value is not None and value != ''}
+
+
+@vm_bp.route('/api/vms/fingerprints', methods=['GET'])
+def list_fingerprints():
+    """모든 VM의 하드웨어/소프트웨어 지문 (캐시 우선, ?deadline=초 안에 수집되지 않은 VM은 pending)
+
+    필터를 주면 조건을 만족하는 VM만 돌려준다. 예: ?min_vcpus=4&min_memory_mb=8000&torch=2.7&env_cache=true
+    """
+    try:
+        started = time.time()
+        filters = _fingerprint_filters(request.args)
+        vms = vm_inventory.list_vms()
+        targets = [vm for vm in vms if vm.get('floating_ip')]
+        results = fingerprint_cache.get_many(
+            [vm['floating_ip'] for vm in targets], _sweep_deadline(request.args), _fingerprint_max_age(request.args)
+        )
+
+        items = []
+        for vm in targets:
+            item = dict(results[vm['floating_ip']])
+            item.pop('collected_at', None)
+            item.update({'vm_id': vm.get('id'), 'target_ip': vm['floating_ip']})
+            if not filters or matches(item, filters):
+                items.append(item)
+        return jsonify({
+            'success': True,
+            'total': len(targets),
+            'count': len(items),
+            'filters': filters,
+            'fingerprints': items,
+            'elapsed_ms': int((time.time() - started) * 1000),
+            'timestamp': datetime.now().isoformat(),
+        })
+    except Exception as e:
+        logger.error(f"Error in list_fingerprints: {str(e)}")
+        return jsonify({'success': False, 'error': 'Failed to collect fingerprints'}), 500
+
+@vm_bp.route('/api/vms/<string:vm_id>/fingerprint', methods=['GET'])
+def get_fingerprint(vm_id: str):
+    """주어진 VM의 지문 (?refresh=true 이면 캐시를 무시하고 다시 수집)"""
+    try:
+        target = vm_inventory.get_by_id(vm_id)
+        if not target:
+            return jsonify({'success': False, 'error': f'VM {vm_id} not found'}), 404
+        ip = target.get('floating_ip')
+        if not ip:
+            return jsonify({'success': False, 'error': f'VM {vm_id} has no floating IP'}), 400
+
+        result = fingerprint_cache.get(ip, max_age=_fingerprint_max_age(request.args))
+        result.pop('collected_at', None)
+        result.update({'vm_id': vm_id, 'target_ip': ip})
+        return jsonify(result), 200 if result.get('success') else 502
+    except Exception as e:
+        logger.error(f"Error in get_fingerprint for {vm_id}: {str(e)}")
+        return jsonify({'success': False, 'error': 'Fingerprint collection failed'}), 500
+
 @vm_bp.route('/api/ssh-check', methods=['GET'])
 def ssh_check_by_ip():
     """IP를 직접 받아 SSH 접속 가능 여부 확인 (OpenStack 의존 없이 테스트용)"""
@@ -55,7 +180,8 @@ def ssh_check_by_ip():
         ip = request.args.get('ip')
         if not ip:
             return jsonify({'success': False, 'error': 'ip query parameter is required'}), 400
-        result = ssh_service.check_connection(ip)
+        result = ssh_health.check(ip, max_age=_max_age(request.args))
+        result.pop('checked_at', None)
         status = 200 if result.get('success') else 502
         result.update({'target_ip': ip, 'timestamp': datetime.now().isoformat()})
         return jsonify(result), status
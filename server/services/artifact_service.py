@@ -0,0 +1,128 @@
+import io
+import json
+import logging
+import os
+import re
+import tarfile
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from config.settings import Config
+from services.ssh_service import SSHService
+
+logger = logging.getLogger(__name__)
+
+# 파일 이름에 쓸 수 없는 문자 (VM ID는 보통 UUID라 그대로 남음)
+_UNSAFE_NAME = re.compile(r'[^A-Za-z0-9._-]')
+
+MANIFEST_NAME = 'manifest.json'
+
+
+class ArtifactCollector:
+    """작업에 참여한 모든 VM의 작업 공간(fl-workspace/<task_id>)을 동시에 내려받아 하나의 아카이브로 묶음
+
+    <root>/<task_id>/ 아래에 VM별 <vm_id>.tar.gz와 manifest.json, 이를 묶은 <task_id>-artifacts.tar를 둔다.
+    VM별 파일은 다음 수집 때 이어 받기/재사용되므로 지우지 않는다.
+    """
+
+    def __init__(self, ssh_service: Optional[SSHService] = None, root: Optional[str] = None):
+        self.ssh_service = ssh_service or SSHService()
+        self.root = root or Config.FL_ARTIFACT_DIR or os.path.join(tempfile.gettempdir(), 'fl-artifacts')
+        self._lock = threading.Lock()
+        # task_id -> 수집 중 잠금 (같은 작업을 동시에 수집하면 .part 파일이 섞임)
+        self._task_locks: Dict[str, threading.Lock] = {}
+
+    def task_dir(self, task_id: str) -> str:
+        return os.path.join(self.root, task_id)
+
+    def archive_path(self, task_id: str) -> str:
+        return os.path.join(self.task_dir(task_id), f'{task_id}-artifacts.tar')
+
+    def collect(self, task_id: str, vms: List[Dict], max_workers: Optional[int] = None) -> Dict:
+        """vms에서 동시에 산출물을 받아 하나의 tar로 묶고 manifest(VM별 결과 포함)를 반환"""
+        started = time.time()
+        task_dir = self.task_dir(task_id)
+        os.makedirs(task_dir, exist_ok=True)
+        workers = max(1, min(max_workers or Config.FL_ARTIFACT_MAX_WORKERS, len(vms)))
+
+        with self._task_lock(task_id):
+            results = []
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fl-artifacts') as executor:
+                futures = {executor.submit(self._collect_vm, task_id, vm, task_dir): vm for vm in vms}
+                for future in as_completed(futures):
+                    vm = futures[future]
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        logger.error(f"Artifact collection from {vm.get('id')} failed: {str(e)}")
+                        results.append({'vm_id': vm.get('id'), 'target_ip': vm.get('floating_ip'),
+                                        'success': False, 'error': str(e)})
+
+            order = {vm.get('id'): i for i, vm in enumerate(vms)}
+            results.sort(key=lambda r: order.get(r['vm_id'], len(order)))
+            manifest = {
+                'task_id': task_id,
+                'collected_at': datetime.now().isoformat(),
+                'total': len(vms),
+                'succeeded': sum(1 for r in results if r.get('success')),
+                'missing': sum(1 for r in results if r.get('missing')),
+                'participants': results,
+            }
+            manifest['failed'] = manifest['total'] - manifest['succeeded'] - manifest['missing']
+            manifest['archive_bytes'] = self._assemble(task_id, manifest)
+            manifest['elapsed_ms'] = int((time.time() - started) * 1000)
+            with open(os.path.join(task_dir, MANIFEST_NAME), 'w') as f:
+                json.dump(manifest, f, indent=2)
+
+        logger.info(f"Collected artifacts of {task_id}: {manifest['succeeded']}/{manifest['total']} VMs, "
+                    f"{manifest['archive_bytes']} bytes in {manifest['elapsed_ms']}ms")
+        return manifest
+
+    def get_manifest(self, task_id: str) -> Optional[Dict]:
+        """마지막 수집 결과 (수집한 적이 없으면 None)"""
+        try:
+            with open(os.path.join(self.task_dir(task_id), MANIFEST_NAME)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _collect_vm(self, task_id: str, vm: Dict, task_dir: str) -> Dict:
+        started = time.time()
+        name = _UNSAFE_NAME.sub('_', vm.get('id') or vm['floating_ip'])
+        result = self.ssh_service.collect_artifacts(vm['floating_ip'], task_id, os.path.join(task_dir, f'{name}.tar.gz'))
+        result.pop('path', None)
+        result.update({
+            'vm_id': vm.get('id'),
+            'target_ip': vm.get('floating_ip'),
+            'file': f'{name}.tar.gz' if result.get('success') else None,
+            'elapsed_ms': int((time.time() - started) * 1000),
+        })
+        return result
+
+    def _assemble(self, task_id: str, manifest: Dict) -> int:
+        """성공한 VM의 tar.gz와 manifest.json을 압축 없이 한 tar로 묶고 크기 반환 (이미 압축된 내용이라 다시 압축하지 않음)"""
+        task_dir = self.task_dir(task_id)
+        archive = self.archive_path(task_id)
+        tmp_path = f'{archive}.tmp'
+        with tarfile.open(tmp_path, 'w') as tar:
+            for result in manifest['participants']:
+                if result.get('file'):
+                    tar.add(os.path.join(task_dir, result['file']), arcname=f"{task_id}/{result['file']}")
+            data = json.dumps(manifest, indent=2).encode('utf-8')
+            info = tarfile.TarInfo(f'{task_id}/{MANIFEST_NAME}')
+            info.size = len(data)
+            info.mtime = int(time.time())
+            tar.addfile(info, io.BytesIO(data))
+        os.replace(tmp_path, archive)
+        return os.path.getsize(archive)
+
+    def _task_lock(self, task_id: str) -> threading.Lock:
+        with self._lock:
+            return self._task_locks.setdefault(task_id, threading.Lock())
+
+
+artifact_collector = ArtifactCollector()
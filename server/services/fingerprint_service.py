@@ -0,0 +1,120 @@
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from config.settings import Config
+from services.ssh_service import SSHService
+from utils.host_cache import HostCache
+
+logger = logging.getLogger(__name__)
+
+
+class FingerprintCache:
+    """VM별 하드웨어/소프트웨어 지문 캐시 (SSH 명령 1회로 수집해 ttl초 동안 재사용)
+
+    - 같은 호스트에 대한 동시 요청은 진행 중인 수집 하나를 공유 (utils.host_cache.HostCache)
+    - 실패한 수집은 캐시하지 않으므로 다음 요청에서 다시 시도
+    - 배포 경로는 이 지문으로 run_fl.sh의 Python/패키지 재확인을 건너뛴다
+    """
+
+    def __init__(
+        self,
+        ssh_service: Optional[SSHService] = None,
+        ttl: float = Config.FL_FINGERPRINT_TTL,
+        max_workers: int = Config.FL_FINGERPRINT_MAX_WORKERS,
+    ):
+        self.ssh_service = ssh_service or SSHService()
+        self.ttl = ttl
+        self._cache = HostCache(
+            self._collect, ttl, max_workers, 'collected_at', thread_name_prefix='fl-fingerprint', label='Fingerprint',
+        )
+
+    def get(self, ip: str, max_age: Optional[float] = None, timeout: Optional[float] = None) -> Dict:
+        """ip의 지문 (max_age초 이내의 캐시가 있으면 그대로, 없으면 수집 후 반환)"""
+        return self._cache.get(ip, max_age, timeout)
+
+    def get_many(self, ips: List[str], deadline: float, max_age: Optional[float] = None) -> Dict[str, Dict]:
+        """여러 호스트의 지문을 동시에 수집하고 deadline초 안에 끝난 결과만 반환 (나머지는 status 'pending')"""
+        return self._cache.get_many(ips, deadline, max_age)
+
+    def for_deploy(self, ip: str) -> Optional[Dict]:
+        """배포에 쓸 지문 (캐시가 없으면 수집, 실패하면 None이라 run_fl.sh가 모든 확인을 그대로 수행)"""
+        if self.ttl <= 0:
+            return None
+        try:
+            fingerprint = self.get(ip, timeout=Config.FL_FINGERPRINT_TIMEOUT + 5)
+        except Exception as e:
+            logger.warning(f"Fingerprint of {ip} unavailable, deploying without it: {str(e)}")
+            return None
+        return fingerprint if fingerprint.get('success') else None
+
+    def cached(self, ip: str, max_age: Optional[float] = None) -> Optional[Dict]:
+        """max_age(기본 ttl)초 이내에 수집한 지문"""
+        return self._cache.cached(ip, max_age)
+
+    def invalidate(self, ip: str) -> None:
+        """ip의 지문을 버림 (VM 상태가 바뀌었을 때 다음 요청에서 다시 수집)"""
+        self._cache.invalidate(ip)
+
+    # ------------------------------------------------------------------
+    # 내부 구현
+    # ------------------------------------------------------------------
+    def _collect(self, ip: str) -> Dict:
+        started = time.time()
+        result = self.ssh_service.collect_fingerprint(ip)
+        now = time.time()
+        result.update({
+            'status': 'ok' if result.get('success') else 'failed',
+            'latency_ms': int((now - started) * 1000),
+            'collected_at': now,
+            'timestamp': datetime.fromtimestamp(now).isoformat(),
+        })
+        if result['success']:
+            self._cache.store(ip, result)
+        return result
+
+
+def env_ready(fingerprint: Optional[Dict], key: str, py_tag: Optional[str] = None) -> Optional[Dict]:
+    """지문에 기록된 가상환경 캐시 중 의존성 해시 key(와 py_tag)에 맞는 것"""
+    for env in (fingerprint or {}).get('envs', ()):
+        if env['env_key'] == key and (py_tag is None or env['py_tag'] == py_tag):
+            return env
+    return None
+
+
+def matches(fingerprint: Dict, filters: Dict) -> bool:
+    """/api/vms/fingerprints 필터 조건을 모두 만족하는지
+
+    min_vcpus/min_gpus/min_memory_mb/min_disk_free_mb는 하한, python/flwr/torch는 버전 접두사
+    (패키지는 시스템 또는 가상환경 캐시 어느 쪽이든), env_cache는 캐시된 가상환경 존재 여부
+    """
+    if not fingerprint.get('success'):
+        return False
+    for key in ('vcpus', 'gpus', 'memory_mb', 'disk_free_mb'):
+        minimum = filters.get(f'min_{key}')
+        if minimum is not None and (fingerprint.get(key) or 0) < minimum:
+            return False
+    python = filters.get('python')
+    if python and not _version_matches(fingerprint.get('python'), python):
+        return False
+    for package in ('flwr', 'torch'):
+        wanted = filters.get(package)
+        if not wanted:
+            continue
+        versions = [fingerprint['packages'].get(package)] + [env['packages'].get(package) for env in fingerprint['envs']]
+        if not any(_version_matches(v, wanted) for v in versions):
+            return False
+    env_cache = filters.get('env_cache')
+    if env_cache is not None and fingerprint.get('env_cache') != env_cache:
+        return False
+    return True
+
+
+def _version_matches(version: Optional[str], prefix: str) -> bool:
+    """'3.11'은 '3.11.7'과 맞지만 '3.1'은 '3.11.7'과 맞지 않음"""
+    return bool(version) and (version == prefix or version.startswith(prefix + '.') or version.startswith(prefix + '+'))
+
+
+# 애플리케이션 전역에서 공유하는 VM 지문 캐시
+fingerprint_cache = FingerprintCache()
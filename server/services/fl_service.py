@@ -1,21 +1,405 @@
+import hashlib
 import logging
+import shlex
+import time
+import tomllib
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
-from utils.openstack import get_openstack_vmList
+from config.settings import Config
+from utils import tracing
+from utils.vm_inventory import vm_inventory
+from services.fingerprint_service import env_ready, fingerprint_cache
+from services.placement_service import placement_scheduler
+from services.selection_service import participant_selector
 from services.ssh_service import SSHService
+from services.workspace_upload import SpooledFile, file_text
 
 logger = logging.getLogger(__name__)
 
+REQUIRED_FL_FILES = ('pyproject.toml', 'client_app.py', 'server_app.py')
+DEFAULT_AGGREGATOR_ADDRESS = 'localhost:9092'
+RUN_COMMAND = 'chmod +x run_fl.sh && ./run_fl.sh'
+# pyproject.toml에서 의존성을 읽지 못했을 때 설치할 패키지
+DEFAULT_DEPENDENCIES = ('flwr>=1.20.0', 'torch==2.7.1', 'torchvision==0.22.1')
+
+
+def new_task_id(prefix: str = 'fl-task') -> str:
+    """작업 ID (같은 초에 여러 배포가 시작돼도 겹치지 않도록 임의 접미사 포함)"""
+    return f"{prefix}-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def parse_dependencies(pyproject_content: str) -> List[str]:
+    """pyproject.toml의 [project].dependencies (읽을 수 없으면 기본 의존성)"""
+    try:
+        deps = tomllib.loads(pyproject_content or '').get('project', {}).get('dependencies')
+    except (tomllib.TOMLDecodeError, AttributeError) as e:
+        logger.warning(f"Could not parse pyproject.toml dependencies, using defaults: {str(e)}")
+        deps = None
+    if not deps or not all(isinstance(d, str) for d in deps):
+        return list(DEFAULT_DEPENDENCIES)
+    return [d.strip() for d in deps if d.strip()]
+
+
+def env_key(dependencies: List[str]) -> str:
+    """의존성 집합을 식별하는 해시 (순서/공백/대소문자와 무관)"""
+    normalized = sorted({''.join(d.split()).lower() for d in dependencies})
+    return hashlib.sha256('\n'.join(normalized).encode('utf-8')).hexdigest()[:16]
+
+
+def build_run_script(
+    partition_id: int,
+    num_partitions: int,
+    aggregator_address: str,
+    dependencies: Optional[List[str]] = None,
+    use_wheelhouse: bool = False,
+    fingerprint: Optional[Dict] = None,
+) -> str:
+    """참가자 VM에서 의존성 가상환경을 준비하고 client_app.py를 실행하는 run_fl.sh 내용
+
+    가상환경은 의존성 해시(env_key)와 Python 버전별로 ~/.fl-envs 아래에 한 번만 만들어지고,
+    이후 작업은 .ready 표식만 확인한 뒤 바로 재사용한다. 같은 VM에서 동시에 시작된 작업은
+    flock으로 직렬화되어 하나만 설치를 수행한다.
+    fingerprint(VM 지문)가 주어지면 Python 버전 확인과, 캐시된 가상환경의 pip list 확인을 건너뛴다.
+    """
+    dependencies = dependencies or list(DEFAULT_DEPENDENCIES)
+    key = env_key(dependencies)
+    py_tag = (fingerprint or {}).get('py_tag')
+    if py_tag:
+        py_tag_line = f'PY_TAG="{py_tag}"'
+        python_version_line = f'echo "Python {fingerprint.get("python")} (VM 지문)"'
+    else:
+        py_tag_line = "PY_TAG=$(python3 -c 'import sys; print(\"py%d%d\" % sys.version_info[:2])')"
+        python_version_line = 'python3 --version'
+    cached_env = env_ready(fingerprint, key, py_tag) if py_tag else None
+    if cached_env:
+        versions = ' '.join(f'{name}=={version}' for name, version in sorted(cached_env['packages'].items()))
+        packages_line = f'echo "{versions or "(버전 정보 없음)"} (VM 지문)"'
+    else:
+        packages_line = '"$ENV_DIR/bin/python" -m pip list 2>/dev/null | grep -E "(flwr|torch)" || true'
+    return '''#!/bin/bash
+set -e
+
+ENV_KEY="{env_key}"
+{py_tag_line}
+ENV_ROOT="$HOME/{envs_dir}"
+ENV_DIR="$ENV_ROOT/$ENV_KEY-$PY_TAG"
+WHEELHOUSE="$HOME/{wheelhouse_dir}"
+USE_WHEELHOUSE="{use_wheelhouse}"
+AGGREGATOR_ADDRESS={aggregator_address}
+
+echo "=== Flower 클라이언트 설정 시작 ==="
+{python_version_line}
+
+build_env() {{
+    echo "의존성 가상환경을 생성합니다: $ENV_DIR"
+    rm -rf "$ENV_DIR"
+    if ! python3 -m venv "$ENV_DIR"; then
+        echo "python3-venv를 설치합니다..."
+        sudo apt update && sudo apt install -y python3-venv || return 1
+        python3 -m venv "$ENV_DIR" || return 1
+    fi
+    if [ "$USE_WHEELHOUSE" = "1" ] && [ -d "$WHEELHOUSE" ]; then
+        echo "wheelhouse에서 설치합니다 (인터넷 사용 안 함): $WHEELHOUSE"
+        PIP_ARGS="--no-index --find-links $WHEELHOUSE"
+    else
+        PIP_ARGS=""
+        "$ENV_DIR/bin/python" -m pip install --upgrade pip || return 1
+    fi
+    "$ENV_DIR/bin/python" -m pip install $PIP_ARGS {dependencies} || return 1
+    touch "$ENV_DIR/.ready"
+}}
+
+mkdir -p "$ENV_ROOT"
+if [ -f "$ENV_DIR/.ready" ]; then
+    echo "캐시된 가상환경을 사용합니다: $ENV_DIR"
+else
+    exec 9>"$ENV_ROOT/.$ENV_KEY-$PY_TAG.lock"
+    flock 9
+    if [ -f "$ENV_DIR/.ready" ]; then
+        echo "다른 작업이 만든 가상환경을 사용합니다: $ENV_DIR"
+    elif ! build_env; then
+        rm -rf "$ENV_DIR"
+        echo "의존성 설치에 실패했습니다" >&2
+        exit 1
+    fi
+    exec 9>&-
+fi
+
+echo "설치된 패키지 확인:"
+{packages_line}
+
+echo "Flower 클라이언트를 시작합니다..."
+echo "파티션 ID: {partition_id}"
+echo "전체 파티션 수: {num_partitions}"
+echo "집계자 주소: $AGGREGATOR_ADDRESS"
+exec "$ENV_DIR/bin/python" client_app.py --server-address "$AGGREGATOR_ADDRESS" --partition-id {partition_id} --num-partitions {num_partitions} --local-epochs 3
+'''.format(
+        env_key=key,
+        py_tag_line=py_tag_line,
+        python_version_line=python_version_line,
+        packages_line=packages_line,
+        envs_dir=Config.FL_ENV_DIR,
+        wheelhouse_dir=Config.FL_REMOTE_WHEELHOUSE_DIR,
+        use_wheelhouse='1' if use_wheelhouse else '0',
+        dependencies=' '.join(shlex.quote(d) for d in dependencies),
+        partition_id=partition_id,
+        num_partitions=num_partitions,
+        aggregator_address=shlex.quote(aggregator_address),
+    )
+
+
+def missing_fl_files(received_files: Dict) -> List[str]:
+    """요청 파일 중 누락된 필수 파일 목록"""
+    return [name for name in REQUIRED_FL_FILES if not (received_files or {}).get(name)]
+
+
+def build_workspace_files(
+    received_files: Dict,
+    partition_id: int,
+    num_partitions: int,
+    aggregator_address: str,
+    use_wheelhouse: bool = False,
+    fingerprint: Optional[Dict] = None,
+) -> Dict:
+    """요청으로 받은 파일과 run_fl.sh로 참가자 작업 공간 구성
+
+    받은 파일은 문자열(JSON 요청) 또는 SpooledFile(multipart/tar 업로드)이며, 필수 파일 외의 파일
+    (task.py, 체크포인트, 데이터 조각 등)도 같은 상대 경로로 작업 공간에 들어간다.
+    """
+    # 파일들이 백엔드에서 이미 완전히 준비된 상태로 옴 (추가 패치 불필요)
+    files = {name: received_files.get(name, '') for name in REQUIRED_FL_FILES}
+    for name, content in received_files.items():
+        if name not in files and isinstance(content, (str, SpooledFile)) and content:
+            files[name] = content
+    files['run_fl.sh'] = build_run_script(
+        partition_id,
+        num_partitions,
+        aggregator_address,
+        dependencies=parse_dependencies(file_text(files['pyproject.toml'])),
+        use_wheelhouse=use_wheelhouse,
+        fingerprint=fingerprint,
+    )
+    return files
+
+
 class FederatedLearningService:
     def __init__(self):
         self.ssh_service = SSHService()
 
-    def get_task_logs(self, task_id: str, vm_id: str) -> Dict:
-        """연합학습 작업 로그 조회"""
+    def select_vms(self, vm_ids: Optional[List[str]] = None, selector=None) -> Tuple[List[Dict], List[str]]:
+        """배포 대상 VM 선택
+
+        vm_ids가 주어지면 그 순서대로, 아니면 selector로 인벤토리에서 고름
+          - 'all': floating IP가 있는 모든 VM
+          - {'ids': [...]} / {'ip_prefix': '172.24.4.'} / {'limit': N}
+          - {'top_k': N}: Prometheus 지표 점수 상위 N개 (/api/fl/select와 같은 기준)
+        반환값: (찾은 VM 목록, 인벤토리에 없는 VM ID 목록)
+        """
+        if vm_ids:
+            found, not_found = [], []
+            for vm_id in dict.fromkeys(vm_ids):
+                vm = vm_inventory.get_by_id(vm_id)
+                if vm:
+                    found.append(vm)
+                else:
+                    not_found.append(vm_id)
+            return found, not_found
+
+        if selector == 'all':
+            selector = {}
+        if not isinstance(selector, dict):
+            return [], []
+        if selector.get('ids'):
+            return self.select_vms(vm_ids=selector['ids'])
+        if selector.get('top_k'):
+            return self._ranked_vms(participant_selector.select(k=int(selector['top_k']))), []
+        return self._filter_vms(vm_inventory.list_vms(), selector), []
+
+    @staticmethod
+    def _ranked_vms(selection: Dict) -> List[Dict]:
+        return [{'id': item['vm_id'], 'floating_ip': item['floating_ip']} for item in selection['selected']]
+
+    @staticmethod
+    def _filter_vms(vms: List[Dict], selector: Dict) -> List[Dict]:
+        vms = [vm for vm in vms if vm.get('floating_ip')]
+        prefix = selector.get('ip_prefix')
+        if prefix:
+            vms = [vm for vm in vms if vm['floating_ip'].startswith(prefix)]
+        vms.sort(key=lambda vm: vm['id'])
+        if selector.get('limit'):
+            vms = vms[:int(selector['limit'])]
+        return vms
+
+    def deploy_to_vm(
+        self,
+        vm: Dict,
+        task_id: str,
+        received_files: Dict,
+        partition_id: int,
+        num_partitions: int,
+        aggregator_address: str,
+        env_config: Optional[Dict] = None,
+        deploy_mode: Optional[str] = None,
+        on_phase: Optional[Callable[[str], None]] = None,
+        use_wheelhouse: bool = False,
+    ) -> Dict:
+        """VM 하나에 작업 공간을 배포하고 클라이언트 실행
+
+        use_wheelhouse가 True이면 서버의 FL_WHEELHOUSE_DIR을 먼저 VM에 동기화하고
+        인터넷 없이 그 wheel들로 가상환경을 만든다.
+        결과의 timings에는 단계별 소요 시간(추적 구간)이 들어간다.
+        """
+        with tracing.trace('fl.deploy', task_id=task_id, vm_id=vm.get('id'), host=vm.get('floating_ip')) as trace:
+            result = self._deploy_to_vm(
+                vm, task_id, received_files, partition_id, num_partitions, aggregator_address,
+                env_config, deploy_mode, on_phase, use_wheelhouse,
+            )
+            result['timings'] = trace.timings()
+            return result
+
+    def _deploy_to_vm(
+        self,
+        vm: Dict,
+        task_id: str,
+        received_files: Dict,
+        partition_id: int,
+        num_partitions: int,
+        aggregator_address: str,
+        env_config: Optional[Dict],
+        deploy_mode: Optional[str],
+        on_phase: Optional[Callable[[str], None]],
+        use_wheelhouse: bool,
+    ) -> Dict:
+        started = time.time()
+        result = {
+            'vm_id': vm.get('id'),
+            'target_ip': vm.get('floating_ip'),
+            'partition_id': partition_id,
+        }
+        if not vm.get('floating_ip'):
+            result.update({'success': False, 'error': f"VM {vm.get('id')} has no floating IP assigned"})
+            return result
+
+        if use_wheelhouse:
+            if on_phase:
+                on_phase('wheelhouse')
+            with tracing.span('wheelhouse.sync'):
+                sync = self.ssh_service.sync_wheelhouse(vm['floating_ip'], Config.FL_WHEELHOUSE_DIR)
+            if not sync['success']:
+                result.update({'success': False, 'error': f"Wheelhouse sync failed: {sync['error']}"})
+                return result
+            result['wheelhouse'] = {k: sync[k] for k in ('uploaded', 'skipped')}
+
+        with tracing.span('fingerprint'):
+            fingerprint = fingerprint_cache.for_deploy(vm['floating_ip'])
+        with tracing.span('workspace.build'):
+            additional_files = build_workspace_files(
+                received_files, partition_id, num_partitions, aggregator_address, use_wheelhouse, fingerprint
+            )
+        deploy_result = self.ssh_service.deploy_and_execute_fl_code(
+            floating_ip=vm['floating_ip'],
+            task_id=task_id,
+            env_config=env_config or {},
+            entry_point=None,
+            additional_files=additional_files,
+            custom_command=RUN_COMMAND,
+            deploy_mode=deploy_mode,
+            on_phase=on_phase,
+        )
+        result.update(deploy_result)
+        self._after_deploy(vm['floating_ip'], received_files, fingerprint, result)
+        result['elapsed_ms'] = int((time.time() - started) * 1000)
+        return result
+
+    @staticmethod
+    def _after_deploy(ip: str, received_files: Dict, fingerprint: Optional[Dict], result: Dict) -> None:
+        """배포 결과에 사용한 지문 정보를 남기고, run_fl.sh가 새 가상환경을 만들게 되면 지문을 무효화"""
+        if not fingerprint:
+            result['fingerprint'] = None
+            return
+        key = env_key(parse_dependencies(file_text(received_files.get('pyproject.toml', ''))))
+        cached_env = env_ready(fingerprint, key, fingerprint.get('py_tag'))
+        result['fingerprint'] = {
+            'cached': fingerprint.get('cached', False),
+            'age_seconds': fingerprint.get('age_seconds', 0),
+            'env_cached': cached_env is not None,
+        }
+        if cached_env is None and result.get('success'):
+            fingerprint_cache.invalidate(ip)
+
+    def deploy_batch(
+        self,
+        vms: List[Dict],
+        task_id: str,
+        received_files: Dict,
+        aggregator_address: str,
+        env_config: Optional[Dict] = None,
+        deploy_mode: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        host_timeout: Optional[float] = None,
+        use_wheelhouse: bool = False,
+    ) -> Iterator[Dict]:
+        """여러 VM에 동시에 배포하고, 끝나는 순서대로 VM별 결과를 yield
+
+        파티션 ID는 vms 순서대로 0..N-1이 할당된다. 작업 스레드는 중단할 수 없으므로
+        host_timeout을 넘긴 VM은 타임아웃 결과를 먼저 내보내고 백그라운드 작업은 그대로 둔다.
+        """
+        num_partitions = len(vms)
+        host_timeout = host_timeout or Config.FL_BATCH_HOST_TIMEOUT
+        workers = max(1, min(max_workers or Config.FL_BATCH_MAX_WORKERS, num_partitions))
+
+        # 파티션 ID -> 작업 스레드가 실제로 배포를 시작한 시각 (대기 중인 작업은 타임아웃 대상 아님)
+        started_at: Dict[int, float] = {}
+
+        def run(vm: Dict, partition_id: int) -> Dict:
+            started_at[partition_id] = time.time()
+            result = self.deploy_to_vm(
+                vm, task_id, received_files, partition_id, num_partitions,
+                aggregator_address, env_config, deploy_mode, use_wheelhouse=use_wheelhouse,
+            )
+            result.pop('output', None)
+            return result
+
+        def failure(vm: Dict, partition_id: int, error: str) -> Dict:
+            return {'vm_id': vm.get('id'), 'target_ip': vm.get('floating_ip'),
+                    'partition_id': partition_id, 'success': False, 'error': error}
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fl-deploy')
+        try:
+            pending: Dict[Future, Tuple[Dict, int]] = {
+                executor.submit(run, vm, partition_id): (vm, partition_id)
+                for partition_id, vm in enumerate(vms)
+            }
+
+            while pending:
+                running = [started_at[pid] for _, pid in pending.values() if pid in started_at]
+                wait_for = max(0.0, min(running) + host_timeout - time.time()) if running else host_timeout
+                done, _ = wait(list(pending), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    vm, partition_id = pending.pop(future)
+                    try:
+                        yield future.result()
+                    except Exception as e:
+                        logger.error(f"Batch deploy to {vm.get('id')} failed: {str(e)}")
+                        yield failure(vm, partition_id, str(e))
+
+                now = time.time()
+                for future, (vm, partition_id) in list(pending.items()):
+                    if partition_id in started_at and now - started_at[partition_id] >= host_timeout:
+                        del pending[future]
+                        logger.error(f"Batch deploy to {vm.get('id')} timed out after {host_timeout}s")
+                        yield failure(vm, partition_id, f'Deployment timed out after {host_timeout}s')
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_task_logs(self, task_id: str, vm_id: str, offset: int = 0, max_bytes: Optional[int] = None) -> Dict:
+        """연합학습 작업 로그 조회 (offset 이후 최대 max_bytes)"""
         # VM 정보 조회
-        vm_list = get_openstack_vmList()
-        target_vm = self._find_vm_by_id(vm_list, vm_id)
+        target_vm = vm_inventory.get_by_id(vm_id)
         
         if not target_vm:
             return {
@@ -31,16 +415,40 @@ class FederatedLearningService:
             }
         
         # SSH로 로그 조회
-        log_result = self.ssh_service.get_logs(floating_ip, task_id)
-        
+        log_result = self.ssh_service.get_logs(floating_ip, task_id, offset, max_bytes)
+        return self._task_logs_response(task_id, vm_id, log_result)
+
+    def get_task_status(self, task_id: str, vm_id: str) -> Dict:
+        """연합학습 작업 프로세스 상태 조회 (실행 래퍼의 기록 기반, 원격 명령 1회)"""
+        target_vm = vm_inventory.get_by_id(vm_id)
+        if not target_vm:
+            return {'success': False, 'error': f'VM {vm_id} not found'}
+        floating_ip = target_vm.get('floating_ip')
+        if not floating_ip:
+            return {'success': False, 'error': f'VM {vm_id} has no floating IP'}
+
+        status = self.ssh_service.get_process_status(floating_ip, task_id)
+        if status.get('success'):
+            # 끝난 작업이면 배치 스케줄러가 기다리지 않고 바로 자원을 반납
+            placement_scheduler.observe(task_id, vm_id, status.get('state'))
+        return dict(status, task_id=task_id, vm_id=vm_id, timestamp=datetime.now().isoformat())
+
+    @staticmethod
+    def _task_logs_response(task_id: str, vm_id: str, log_result: Dict) -> Dict:
         if log_result['success']:
             return {
                 'success': True,
                 'task_id': task_id,
                 'vm_id': vm_id,
                 'log_content': log_result['log_content'],
+                'log_path': log_result['log_path'],
+                'offset': log_result['offset'],
+                'next_offset': log_result['next_offset'],
+                'size': log_result['size'],
+                'eof': log_result['eof'],
+                'truncated': log_result['truncated'],
                 'process_running': log_result['process_running'],
-                'process_info': log_result['process_info'],
+                'process': log_result['process'],
                 'error': log_result.get('error'),
                 'timestamp': datetime.now().isoformat()
             }
@@ -49,10 +457,3 @@ class FederatedLearningService:
                 'success': False,
                 'error': log_result['error']
             }
-
-    def _find_vm_by_id(self, vm_list: list, vm_id: str) -> Optional[Dict]:
-        """VM ID로 VM 정보 찾기"""
-        for vm in vm_list:
-            if vm.get('id') == vm_id:
-                return vm
-        return None
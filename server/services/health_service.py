@@ -0,0 +1,112 @@
+import logging
+import socket
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+
+from config.settings import Config
+from services.ssh_service import SSHService
+from utils.host_cache import HostCache
+
+logger = logging.getLogger(__name__)
+
+
+class SSHHealthChecker:
+    """VM SSH 접속 상태 점검 (TCP 사전 확인 + SSH 인증, 호스트별 결과 캐시)
+
+    - SSH 포트로 TCP 연결이 되지 않으면 SSH 핸드셰이크를 시도하지 않고 바로 실패 처리
+    - 같은 호스트에 대한 동시 요청은 진행 중인 점검 하나를 공유 (utils.host_cache.HostCache)
+    - 결과는 ttl초 동안 캐시하고, 호스트별 최근 history개의 지연 시간 기록을 보관
+    """
+
+    def __init__(
+        self,
+        ssh_service: Optional[SSHService] = None,
+        ttl: float = Config.SSH_HEALTH_TTL,
+        history: int = Config.SSH_HEALTH_HISTORY,
+        tcp_timeout: float = Config.SSH_HEALTH_TCP_TIMEOUT,
+        max_workers: int = Config.SSH_HEALTH_MAX_WORKERS,
+    ):
+        self.ssh_service = ssh_service or SSHService()
+        self.ttl = ttl
+        self.history_size = history
+        self.tcp_timeout = tcp_timeout
+        self._cache = HostCache(
+            self._probe, ttl, max_workers, 'checked_at', thread_name_prefix='ssh-health', label='Check',
+        )
+        self._lock = threading.Lock()
+        self._history: Dict[str, Deque[Dict]] = {}
+
+    def check(self, ip: str, max_age: Optional[float] = None, timeout: Optional[float] = None) -> Dict:
+        """ip의 점검 결과 (max_age초 이내의 캐시가 있으면 그대로, 없으면 점검 후 반환)"""
+        return self._cache.get(ip, max_age, timeout)
+
+    def sweep(self, ips: List[str], deadline: float, max_age: Optional[float] = None) -> Dict[str, Dict]:
+        """여러 호스트를 동시에 점검하고 deadline초 안에 끝난 결과만 반환
+
+        시간 안에 끝나지 않은 호스트는 status 'pending'으로 표시되며, 점검은 백그라운드에서
+        계속되어 다음 조회 때 캐시로 제공된다.
+        """
+        return self._cache.get_many(ips, deadline, max_age)
+
+    def cached(self, ip: str, max_age: Optional[float] = None) -> Optional[Dict]:
+        """max_age(기본 ttl)초 이내에 끝난 점검 결과"""
+        return self._cache.cached(ip, max_age)
+
+    def history(self, ip: str) -> List[Dict]:
+        with self._lock:
+            return list(self._history.get(ip, ()))
+
+    # ------------------------------------------------------------------
+    # 내부 구현
+    # ------------------------------------------------------------------
+    def _probe(self, ip: str) -> Dict:
+        started = time.time()
+        try:
+            with socket.create_connection((ip, Config.SSH_PORT), timeout=self.tcp_timeout):
+                pass
+        except OSError as e:
+            return self._store(ip, self._unreachable(e, started))
+        tcp_latency_ms = int((time.time() - started) * 1000)
+        return self._store(ip, self._ssh_result(self.ssh_service.check_connection(ip), tcp_latency_ms))
+
+    @staticmethod
+    def _unreachable(error: Exception, started: float) -> Dict:
+        return {
+            'success': False,
+            'status': 'unreachable',
+            'stage': 'tcp',
+            'message': 'TCP connection to SSH port failed',
+            'error': str(error) or 'timed out',
+            'latency_ms': int((time.time() - started) * 1000),
+        }
+
+    @staticmethod
+    def _ssh_result(result: Dict, tcp_latency_ms: int) -> Dict:
+        result.update({
+            'status': 'ok' if result.get('success') else 'ssh_failed',
+            'stage': 'ssh',
+            'tcp_latency_ms': tcp_latency_ms,
+        })
+        return result
+
+    def _store(self, ip: str, result: Dict) -> Dict:
+        """점검 결과를 캐시와 기록에 저장"""
+        now = time.time()
+        result['checked_at'] = now
+        result['timestamp'] = datetime.fromtimestamp(now).isoformat()
+        self._cache.store(ip, result)
+        with self._lock:
+            history = self._history.setdefault(ip, deque(maxlen=self.history_size))
+            history.append({
+                'timestamp': result['timestamp'],
+                'success': result['success'],
+                'latency_ms': result.get('latency_ms'),
+            })
+        return result
+
+
+# 애플리케이션 전역에서 공유하는 SSH 상태 점검기
+ssh_health = SSHHealthChecker()
@@ -0,0 +1,180 @@
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 차 작업을 받을 수 없음 (HTTP 429로 응답)"""
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(ts).isoformat() if ts else None
+
+
+class Job:
+    """대기열에 제출된 작업 하나의 상태와 단계별 진행 기록"""
+
+    def __init__(self, kind: str, fn: Callable[['Job'], Dict], meta: Optional[Dict] = None):
+        self.id = f"job-{uuid.uuid4().hex[:12]}"
+        self.kind = kind
+        self.fn = fn
+        self.meta = meta or {}
+        self.status = 'queued'
+        self.phases: List[Dict] = []
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def phase(self, name: str) -> None:
+        """현재 단계를 name으로 전환 (이전 단계는 완료 처리)"""
+        now = time.time()
+        with self._lock:
+            self._close_phase(now, 'done')
+            self.phases.append({'name': name, 'status': 'running', 'started_at': now})
+
+    def _close_phase(self, now: float, status: str) -> None:
+        if self.phases and self.phases[-1]['status'] == 'running':
+            current = self.phases[-1]
+            current['status'] = status
+            current['duration_ms'] = int((now - current['started_at']) * 1000)
+
+    def _finish(self, status: str, result: Optional[Dict] = None, error: Optional[str] = None) -> None:
+        now = time.time()
+        with self._lock:
+            self._close_phase(now, 'done' if status == 'succeeded' else 'failed')
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished_at = now
+
+    @property
+    def done(self) -> bool:
+        return self.status in ('succeeded', 'failed')
+
+    def to_dict(self, include_result: bool = False) -> Dict:
+        with self._lock:
+            phases = [
+                dict(p, started_at=_iso(p['started_at']))
+                for p in self.phases
+            ]
+        data = {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'current_phase': phases[-1]['name'] if phases and phases[-1]['status'] == 'running' else None,
+            'phases': phases,
+            'submitted_at': _iso(self.submitted_at),
+            'started_at': _iso(self.started_at),
+            'finished_at': _iso(self.finished_at),
+            'error': self.error,
+        }
+        data.update(self.meta)
+        if include_result:
+            data['result'] = self.result
+        return data
+
+
+class JobQueue:
+    """고정 크기 작업자 풀과 제한된 대기열로 배포 작업을 비동기 실행
+
+    - submit은 대기열이 가득 차면 즉시 QueueFullError를 발생 (admission control)
+    - 완료된 작업은 최대 max_history개까지 보관하고 오래된 것부터 정리
+    """
+
+    def __init__(
+        self,
+        name: str,
+        workers: int = Config.FL_JOB_WORKERS,
+        max_queue: int = Config.FL_JOB_QUEUE_SIZE,
+        max_history: int = Config.FL_JOB_HISTORY,
+    ):
+        self.name = name
+        self.workers = max(1, workers)
+        self.max_history = max_history
+        self._queue: 'queue.Queue[Job]' = queue.Queue(maxsize=max(1, max_queue))
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._running = 0
+        self._threads: List[threading.Thread] = []
+
+    def submit(self, kind: str, fn: Callable[[Job], Dict], meta: Optional[Dict] = None) -> Job:
+        """작업을 대기열에 넣고 즉시 반환 (fn(job)의 반환값이 작업 결과)"""
+        self._ensure_workers()
+        job = Job(kind, fn, meta)
+        with self._lock:
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise QueueFullError(f"{self.name} queue is full ({self._queue.maxsize} jobs waiting)")
+            self._jobs[job.id] = job
+            self._prune()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self, limit: int = 50) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())[-limit:][::-1]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            running = self._running
+        return {
+            'queued': self._queue.qsize(),
+            'running': running,
+            'workers': self.workers,
+            'max_queue': self._queue.maxsize,
+        }
+
+    def _ensure_workers(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                t = threading.Thread(target=self._worker, name=f"{self.name}-worker-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def _worker(self) -> None:
+        while True:
+            job = self._queue.get()
+            with self._lock:
+                self._running += 1
+            job.started_at = time.time()
+            job.status = 'running'
+            try:
+                result = job.fn(job) or {}
+                job._finish('succeeded' if result.get('success', True) else 'failed', result, result.get('error'))
+            except Exception as e:
+                logger.error(f"{self.name} job {job.id} failed: {str(e)}")
+                job._finish('failed', error=str(e))
+            finally:
+                with self._lock:
+                    self._running -= 1
+                self._queue.task_done()
+
+    def _prune(self) -> None:
+        # 호출 측에서 self._lock 보유
+        excess = len(self._jobs) - self.max_history
+        if excess <= 0:
+            return
+        for job_id in [j.id for j in self._jobs.values() if j.done][:excess]:
+            del self._jobs[job_id]
+
+
+# 원격 배포 작업 대기열
+deployment_queue = JobQueue('deploy')
@@ -0,0 +1,309 @@
+import logging
+import os
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import Config
+from services.job_queue import Job, JobQueue
+
+logger = logging.getLogger(__name__)
+
+# mkdtemp로 만드는 로컬 작업 공간 접두사 (남아 있는 오래된 디렉터리 정리에 사용)
+WORKSPACE_PREFIX = 'fl_client_'
+
+# (단계 이름, 명령, 타임아웃 초)
+Step = Tuple[str, List[str], float]
+
+
+class _RotatingLogWriter:
+    """크기 제한이 있는 로그 파일 (max_bytes를 넘으면 .1, .2 ... 로 밀어내고 backups개만 보관)"""
+
+    def __init__(self, path: str, max_bytes: int, backups: int):
+        self.path = path
+        self.max_bytes = max(1024, max_bytes)
+        self.backups = max(0, backups)
+        self.total_bytes = 0
+        self._file = open(path, 'ab')
+        self._size = self._file.tell()
+
+    def write(self, data: bytes) -> None:
+        self.total_bytes += len(data)
+        while data:
+            room = self.max_bytes - self._size
+            if room <= 0:
+                self._rotate()
+                room = self.max_bytes
+            self._file.write(data[:room])
+            self._size += min(room, len(data))
+            data = data[room:]
+        self._file.flush()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        if self.backups:
+            for i in range(self.backups - 1, 0, -1):
+                src = f"{self.path}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        self._file = open(self.path, 'wb')
+        self._size = 0
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class LocalTask:
+    """로컬에서 실행하는 연합학습 클라이언트 하나의 상태"""
+
+    def __init__(self, task_id: str, workspace: str, steps: List[Step], env: Dict[str, str], log_path: str, meta: Dict):
+        self.task_id = task_id
+        self.workspace = workspace
+        self.steps = steps
+        self.env = env
+        self.log_path = log_path
+        self.meta = meta
+        self.job: Optional[Job] = None
+        self.proc: Optional[subprocess.Popen] = None
+        self.returncode: Optional[int] = None
+        self.cancelled = False
+        self.timed_out = False
+        self.log_bytes = 0
+        self.workspace_removed = False
+        self._lock = threading.Lock()
+
+    @property
+    def status(self) -> str:
+        if self.cancelled and self.job and self.job.done:
+            return 'cancelled'
+        return self.job.status if self.job else 'queued'
+
+    def log_tail(self, max_bytes: int = 4096) -> str:
+        """현재 로그 파일의 마지막 max_bytes"""
+        try:
+            with open(self.log_path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - max_bytes))
+                return f.read().decode('utf-8', errors='replace')
+        except OSError:
+            return ''
+
+    def to_dict(self, include_log: bool = False) -> Dict:
+        data = self.job.to_dict() if self.job else {}
+        data.update(self.meta)
+        data.update({
+            'task_id': self.task_id,
+            'status': self.status,
+            'pid': self.proc.pid if self.proc else None,
+            'returncode': self.returncode,
+            'timed_out': self.timed_out,
+            'temp_dir': self.workspace,
+            'workspace_removed': self.workspace_removed,
+            'log_path': self.log_path,
+            'log_bytes': self.log_bytes,
+        })
+        if include_log:
+            data['log_tail'] = self.log_tail()
+        return data
+
+
+class LocalProcessSupervisor:
+    """로컬 연합학습 클라이언트 프로세스 관리
+
+    - JobQueue로 동시에 실행하는 클라이언트 수를 max_concurrent개로 제한 (대기열이 가득 차면 QueueFullError)
+    - 출력은 메모리에 모으지 않고 크기 제한이 있는 로그 파일로 바로 기록
+    - 각 프로세스는 새 세션으로 실행해 취소/타임아웃 시 하위 프로세스까지 함께 종료
+    - 끝난 작업의 작업 공간은 삭제하고, 기록에서 밀려난 작업의 로그도 삭제
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = Config.FL_LOCAL_MAX_CONCURRENT,
+        max_queue: int = Config.FL_LOCAL_QUEUE_SIZE,
+        max_history: int = Config.FL_LOCAL_HISTORY,
+        log_dir: str = Config.FL_LOCAL_LOG_DIR,
+        log_max_bytes: int = Config.FL_LOCAL_LOG_MAX_BYTES,
+        log_backups: int = Config.FL_LOCAL_LOG_BACKUPS,
+        keep_workspace: bool = Config.FL_LOCAL_KEEP_WORKSPACE,
+    ):
+        self.max_history = max_history
+        self.log_dir = log_dir or os.path.join(tempfile.gettempdir(), 'fl-local-logs')
+        self.log_max_bytes = log_max_bytes
+        self.log_backups = log_backups
+        self.keep_workspace = keep_workspace
+        self._queue = JobQueue('local-fl', workers=max_concurrent, max_queue=max_queue, max_history=max_history)
+        self._tasks: 'OrderedDict[str, LocalTask]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._swept = False
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+    def submit(self, task_id: str, workspace: str, steps: List[Step], env: Dict[str, str], meta: Optional[Dict] = None) -> LocalTask:
+        """steps를 순서대로 실행하는 작업을 대기열에 넣음 (한 단계라도 실패하면 중단)"""
+        self._sweep_stale_workspaces()
+        os.makedirs(self.log_dir, exist_ok=True)
+        task = LocalTask(task_id, workspace, steps, env, os.path.join(self.log_dir, f"{task_id}.log"), meta or {})
+        try:
+            task.job = self._queue.submit('local', lambda job: self._run(task, job), meta={'task_id': task_id})
+        except Exception:
+            self._remove_workspace(task)
+            raise
+        with self._lock:
+            self._tasks[task_id] = task
+            self._prune()
+        return task
+
+    def get(self, task_id: str) -> Optional[LocalTask]:
+        with self._lock:
+            return self._tasks.get(task_id)
+
+    def list(self, limit: int = 50) -> List[LocalTask]:
+        with self._lock:
+            return list(self._tasks.values())[-limit:][::-1]
+
+    def stats(self) -> Dict:
+        return self._queue.stats()
+
+    def active_processes(self) -> int:
+        """현재 살아 있는 클라이언트 프로세스 수"""
+        with self._lock:
+            tasks = list(self._tasks.values())
+        return sum(1 for task in tasks if task.proc is not None and task.proc.poll() is None)
+
+    def cancel(self, task_id: str) -> Optional[LocalTask]:
+        """대기 중이면 실행하지 않고, 실행 중이면 프로세스 그룹에 SIGTERM (5초 후 SIGKILL)"""
+        task = self.get(task_id)
+        if task is None or (task.job and task.job.done):
+            return task
+        with task._lock:
+            task.cancelled = True
+            proc = task.proc
+        if proc is not None:
+            self._terminate(proc)
+        return task
+
+    # ------------------------------------------------------------------
+    # 내부 구현
+    # ------------------------------------------------------------------
+    def _run(self, task: LocalTask, job: Job) -> Dict:
+        writer = _RotatingLogWriter(task.log_path, self.log_max_bytes, self.log_backups)
+        try:
+            for name, cmd, timeout in task.steps:
+                if task.cancelled:
+                    break
+                job.phase(name)
+                writer.write(f"$ {' '.join(cmd)}\n".encode())
+                returncode = self._run_step(task, cmd, timeout, writer)
+                task.returncode = returncode
+                if returncode != 0:
+                    break
+        finally:
+            task.log_bytes = writer.total_bytes
+            writer.close()
+            self._remove_workspace(task)
+
+        if task.cancelled:
+            logger.info(f"Local FL client {task.task_id} cancelled")
+            return {'success': False, 'error': 'Cancelled', 'returncode': task.returncode}
+        if task.timed_out:
+            return {'success': False, 'error': 'Timed out', 'returncode': task.returncode}
+        if task.returncode != 0:
+            logger.error(f"Local FL client {task.task_id} failed with return code {task.returncode}")
+            return {'success': False, 'error': f'Process exited with code {task.returncode}', 'returncode': task.returncode}
+        logger.info(f"Local FL client {task.task_id} completed successfully")
+        return {'success': True, 'returncode': 0}
+
+    def _run_step(self, task: LocalTask, cmd: List[str], timeout: float, writer: _RotatingLogWriter) -> int:
+        with task._lock:
+            if task.cancelled:
+                return -signal.SIGTERM
+            proc = task.proc = subprocess.Popen(
+                cmd,
+                cwd=task.workspace,
+                env=task.env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+
+        def on_timeout():
+            task.timed_out = True
+            logger.error(f"Local FL client {task.task_id} timed out after {timeout}s")
+            self._terminate(proc)
+
+        timer = threading.Timer(timeout, on_timeout)
+        timer.daemon = True
+        timer.start()
+        try:
+            for chunk in iter(lambda: proc.stdout.read1(65536), b''):
+                writer.write(chunk)
+            return proc.wait()
+        finally:
+            timer.cancel()
+            proc.stdout.close()
+
+    @staticmethod
+    def _terminate(proc: subprocess.Popen, grace: float = 5) -> None:
+        def kill(sig: int) -> None:
+            try:
+                os.killpg(proc.pid, sig)
+            except (ProcessLookupError, PermissionError):
+                pass
+
+        if proc.poll() is not None:
+            return
+        kill(signal.SIGTERM)
+
+        def escalate():
+            if proc.poll() is None:
+                kill(signal.SIGKILL)
+
+        timer = threading.Timer(grace, escalate)
+        timer.daemon = True
+        timer.start()
+
+    def _remove_workspace(self, task: LocalTask) -> None:
+        if self.keep_workspace or task.workspace_removed:
+            return
+        shutil.rmtree(task.workspace, ignore_errors=True)
+        task.workspace_removed = True
+
+    def _prune(self) -> None:
+        # 호출 측에서 self._lock 보유
+        excess = len(self._tasks) - self.max_history
+        if excess <= 0:
+            return
+        for task in [t for t in self._tasks.values() if t.job and t.job.done][:excess]:
+            del self._tasks[task.task_id]
+            for path in [task.log_path] + [f"{task.log_path}.{i}" for i in range(1, self.log_backups + 1)]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _sweep_stale_workspaces(self, max_age: float = 24 * 3600) -> None:
+        """이전 서버 프로세스가 남긴 오래된 작업 공간을 처음 한 번만 정리"""
+        if self._swept or self.keep_workspace:
+            return
+        self._swept = True
+        root = tempfile.gettempdir()
+        cutoff = time.time() - max_age
+        for name in os.listdir(root):
+            path = os.path.join(root, name)
+            try:
+                if name.startswith(WORKSPACE_PREFIX) and os.path.getmtime(path) < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+            except OSError:
+                pass
+
+
+# 애플리케이션 전역에서 공유하는 로컬 프로세스 관리자
+local_supervisor = LocalProcessSupervisor()
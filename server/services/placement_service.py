@@ -0,0 +1,419 @@
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional
+
+from config.settings import Config
+from services.fingerprint_service import fingerprint_cache
+from services.job_queue import QueueFullError
+from services.ssh_service import SSHService
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ('spread', 'binpack')
+
+# 원격 프로세스가 이 상태면 VM 자원을 돌려받음 (get_process_status의 state)
+_TERMINAL_STATES = ('succeeded', 'failed', 'lost', 'not_found')
+
+
+class PlacementConflict(Exception):
+    """요청한 자원을 후보 VM에 배치할 수 없음 (HTTP 409로 응답)"""
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(ts).isoformat() if ts else None
+
+
+class Placement:
+    """작업 하나의 배치 요청과 VM별 자원 할당
+
+    status: queued(대기) -> placed(할당됨) -> released(반납) / expired(대기 시간 초과) / failed(시작 실패)
+    할당의 state는 배포 중이면 deploying, 배포가 끝나 원격 프로세스가 돌면 running
+    """
+
+    def __init__(
+        self,
+        task_id: str,
+        vms: List[Dict],
+        count: int,
+        demand: Dict,
+        policy: str,
+        on_placed: Optional[Callable[['Placement'], None]] = None,
+        on_cancelled: Optional[Callable[['Placement'], None]] = None,
+    ):
+        self.task_id = task_id
+        self.candidates = vms
+        self.count = count
+        self.demand = demand
+        self.policy = policy
+        self.on_placed = on_placed
+        self.on_cancelled = on_cancelled
+        self.status = 'queued'
+        self.allocations: 'OrderedDict[str, Dict]' = OrderedDict()
+        self.job_id: Optional[str] = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.placed_at: Optional[float] = None
+        self.released_at: Optional[float] = None
+
+    @property
+    def vms(self) -> List[Dict]:
+        """할당된 VM (후보 목록의 VM 정보, 정책이 고른 순서)"""
+        by_id = {vm['id']: vm for vm in self.candidates}
+        return [by_id[vm_id] for vm_id in self.allocations]
+
+    def to_dict(self) -> Dict:
+        return {
+            'task_id': self.task_id,
+            'status': self.status,
+            'policy': self.policy,
+            'count': self.count,
+            'demand': dict(self.demand),
+            'allocations': [
+                {'vm_id': vm_id, 'target_ip': a['floating_ip'], 'state': a['state'], 'placed_at': _iso(a['placed_at'])}
+                for vm_id, a in self.allocations.items()
+            ],
+            'job_id': self.job_id,
+            'error': self.error,
+            'submitted_at': _iso(self.submitted_at),
+            'placed_at': _iso(self.placed_at),
+            'released_at': _iso(self.released_at),
+        }
+
+
+class PlacementScheduler:
+    """VM별 실행 중인 작업과 그 작업이 요구한 자원(vCPU, 메모리)을 추적해 새 작업을 배치
+
+    - VM 용량은 캐시된 VM 지문(fingerprint_service)의 vCPU/메모리, 없으면 FL_PLACEMENT_DEFAULT_*
+    - 'spread'는 사용률이 가장 낮은 VM부터, 'binpack'은 남는 vCPU가 가장 적어지는 VM부터 고름
+    - place는 지금 배치할 수 없으면 PlacementConflict, submit은 대기열에 넣었다가 자원이 반납되면 배치
+    - 반납: 배포 실패, 원격 프로세스 종료(주기적 확인 또는 observe), release 호출
+    """
+
+    def __init__(
+        self,
+        ssh_service: Optional[SSHService] = None,
+        policy: str = Config.FL_PLACEMENT_POLICY,
+        max_queue: int = Config.FL_PLACEMENT_QUEUE_SIZE,
+        queue_timeout: float = Config.FL_PLACEMENT_QUEUE_TIMEOUT,
+        reap_interval: float = Config.FL_PLACEMENT_REAP_INTERVAL,
+        max_history: int = Config.FL_JOB_HISTORY,
+    ):
+        self.ssh_service = ssh_service or SSHService()
+        self.policy = policy if policy in POLICIES else 'spread'
+        self.max_queue = max(1, max_queue)
+        self.queue_timeout = queue_timeout
+        self.reap_interval = reap_interval
+        self.max_history = max_history
+        self._lock = threading.Lock()
+        self._placements: 'OrderedDict[str, Placement]' = OrderedDict()
+        self._pending: Deque[Placement] = deque()
+        self._reaper: Optional[threading.Thread] = None
+
+    def demand(self, vcpus: Optional[float] = None, memory_mb: Optional[int] = None) -> Dict:
+        """작업 하나가 VM마다 요구하는 자원 (주지 않은 값은 FL_PLACEMENT_TASK_*)"""
+        return {
+            'vcpus': float(vcpus if vcpus is not None else Config.FL_PLACEMENT_TASK_VCPUS),
+            'memory_mb': int(memory_mb if memory_mb is not None else Config.FL_PLACEMENT_TASK_MEMORY_MB),
+        }
+
+    def place(self, task_id: str, vms: List[Dict], count: int, demand: Dict, policy: Optional[str] = None) -> Placement:
+        """vms 중 서로 다른 count개의 VM에 demand를 지금 할당 (모두 할당하거나 PlacementConflict)"""
+        placement = self._new_placement(task_id, vms, count, demand, policy)
+        with self._lock:
+            if not self._try_place(placement):
+                raise PlacementConflict(self._conflict_message(placement))
+            self._remember(placement)
+        self._ensure_reaper()
+        return placement
+
+    def submit(
+        self,
+        task_id: str,
+        vms: List[Dict],
+        count: int,
+        demand: Dict,
+        policy: Optional[str] = None,
+        on_placed: Optional[Callable[[Placement], None]] = None,
+        on_cancelled: Optional[Callable[[Placement], None]] = None,
+    ) -> Placement:
+        """place와 같지만 지금 자원이 없으면 대기열에 넣고 반환 (배치되면 on_placed(placement),
+        대기 중에 만료·취소되거나 대기 후 배치된 시점의 on_placed가 실패하면 on_cancelled(placement) 호출)
+
+        대기열이 가득 차면 QueueFullError, 후보 VM의 전체 용량으로도 불가능한 요청은 PlacementConflict.
+        바로 배치된 경우 on_placed는 이 호출 안에서 실행되며, 그 예외는 할당을 반납한 뒤 그대로 전달된다.
+        """
+        placement = self._new_placement(task_id, vms, count, demand, policy, on_placed, on_cancelled)
+        with self._lock:
+            if not self._try_place(placement):
+                if not self._ever_fits(placement):
+                    raise PlacementConflict(self._conflict_message(placement))
+                if len(self._pending) >= self.max_queue:
+                    raise QueueFullError(f"Placement queue is full ({len(self._pending)} tasks waiting)")
+                self._pending.append(placement)
+            self._remember(placement)
+        self._ensure_reaper()
+        if placement.status == 'placed' and on_placed:
+            try:
+                on_placed(placement)
+            except Exception:
+                self.release(task_id, status='failed')
+                raise
+        return placement
+
+    def deployed(self, task_id: str, vm_id: str, success: bool) -> None:
+        """VM 하나의 배포가 끝남: 성공이면 running으로 표시하고, 실패면 그 VM의 할당을 반납"""
+        with self._lock:
+            placement = self._placements.get(task_id)
+            allocation = placement.allocations.get(vm_id) if placement else None
+            if allocation is None:
+                return
+            if success:
+                allocation['state'] = 'running'
+                allocation['checked_at'] = time.time()
+                return
+        self.release(task_id, vm_id)
+
+    def observe(self, task_id: str, vm_id: str, state: Optional[str]) -> None:
+        """원격 프로세스 상태를 본 쪽(/api/fl/status 등)에서 알려 줌: 끝난 상태면 바로 반납"""
+        if state not in _TERMINAL_STATES:
+            return
+        with self._lock:
+            placement = self._placements.get(task_id)
+            allocation = placement.allocations.get(vm_id) if placement else None
+            if allocation is None or allocation['state'] != 'running':
+                return
+        self.release(task_id, vm_id)
+
+    def abandon(self, task_id: str) -> None:
+        """결과를 더 받지 않을 배포(스트림 연결 끊김 등): 아직 배포 중인 할당을 배포 제한 시간까지 기다리지 않고 반납"""
+        with self._lock:
+            placement = self._placements.get(task_id)
+            if placement is None:
+                return
+            deploying = [vm_id for vm_id, a in placement.allocations.items() if a['state'] == 'deploying']
+        for vm_id in deploying:
+            self.release(task_id, vm_id)
+
+    def release(self, task_id: str, vm_id: Optional[str] = None, status: str = 'released') -> Optional[Placement]:
+        """task_id의 할당(vm_id가 있으면 그 VM만)을 반납하고 대기 중인 요청을 배치 (대기 중이면 취소)"""
+        with self._lock:
+            placement = self._placements.get(task_id)
+            if placement is None:
+                return None
+            cancelled = placement.status == 'queued'
+            if cancelled:
+                self._pending.remove(placement)
+                placement.status = 'released'
+                placement.released_at = time.time()
+            elif vm_id is not None:
+                placement.allocations.pop(vm_id, None)
+            else:
+                placement.allocations.clear()
+            if not placement.allocations and placement.status == 'placed':
+                placement.status = status
+                placement.released_at = time.time()
+        if cancelled:
+            self._cancelled(placement)
+        else:
+            self._dispatch()
+        return placement
+
+    def get(self, task_id: str) -> Optional[Placement]:
+        with self._lock:
+            return self._placements.get(task_id)
+
+    def snapshot(self, vms: Optional[List[Dict]] = None) -> Dict:
+        """VM별 용량/사용량/작업 목록과 대기열 (vms를 주면 할당이 없는 VM도 포함)"""
+        with self._lock:
+            usage = self._usage()
+            pending = [p.to_dict() for p in self._pending]
+        known = {vm['id']: vm for vm in vms or ()}
+        for vm_id, used in usage.items():
+            known.setdefault(vm_id, {'id': vm_id, 'floating_ip': used['floating_ip']})
+        fleet = []
+        for vm_id, vm in sorted(known.items()):
+            capacity = self._capacity(vm)
+            used = usage.get(vm_id, {'vcpus': 0.0, 'memory_mb': 0, 'tasks': []})
+            fleet.append({
+                'vm_id': vm_id,
+                'target_ip': vm.get('floating_ip'),
+                'capacity': capacity,
+                'used': {'vcpus': used['vcpus'], 'memory_mb': used['memory_mb']},
+                'utilization': round(used['vcpus'] / capacity['vcpus'], 3) if capacity['vcpus'] else None,
+                'tasks': used['tasks'],
+            })
+        return {'policy': self.policy, 'vms': fleet, 'queued': len(pending), 'pending': pending}
+
+    # ------------------------------------------------------------------
+    # 내부 구현
+    # ------------------------------------------------------------------
+    def _new_placement(self, task_id, vms, count, demand, policy, on_placed=None, on_cancelled=None) -> Placement:
+        policy = policy or self.policy
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown placement policy '{policy}' (expected one of {', '.join(POLICIES)})")
+        vms = [vm for vm in vms if vm.get('floating_ip')]
+        return Placement(task_id, vms, max(1, count), demand, policy, on_placed, on_cancelled)
+
+    @staticmethod
+    def _capacity(vm: Dict) -> Dict:
+        """VM 용량 (캐시된 지문이 오래됐어도 하드웨어 값은 그대로 사용)"""
+        fingerprint = fingerprint_cache.cached(vm['floating_ip'], max_age=float('inf')) if vm.get('floating_ip') else None
+        vcpus = (fingerprint or {}).get('vcpus') or Config.FL_PLACEMENT_DEFAULT_VCPUS
+        memory_mb = (fingerprint or {}).get('memory_mb') or Config.FL_PLACEMENT_DEFAULT_MEMORY_MB
+        return {
+            'vcpus': round(vcpus * Config.FL_PLACEMENT_CPU_OVERCOMMIT, 3),
+            'memory_mb': memory_mb,
+            'source': 'fingerprint' if fingerprint else 'default',
+        }
+
+    def _usage(self) -> Dict[str, Dict]:
+        # 호출 측에서 self._lock 보유
+        usage: Dict[str, Dict] = {}
+        for placement in self._placements.values():
+            for vm_id, allocation in placement.allocations.items():
+                used = usage.setdefault(
+                    vm_id, {'vcpus': 0.0, 'memory_mb': 0, 'tasks': [], 'floating_ip': allocation['floating_ip']}
+                )
+                used['vcpus'] += placement.demand['vcpus']
+                used['memory_mb'] += placement.demand['memory_mb']
+                used['tasks'].append(placement.task_id)
+        return usage
+
+    def _try_place(self, placement: Placement) -> bool:
+        """정책 순서로 count개의 VM을 골라 할당 (호출 측에서 self._lock 보유)"""
+        usage = self._usage()
+        demand = placement.demand
+        ranked = []
+        for vm in placement.candidates:
+            capacity = self._capacity(vm)
+            used = usage.get(vm['id'], {'vcpus': 0.0, 'memory_mb': 0, 'tasks': []})
+            free_vcpus = capacity['vcpus'] - used['vcpus'] - demand['vcpus']
+            free_memory = capacity['memory_mb'] - used['memory_mb'] - demand['memory_mb']
+            if free_vcpus < -1e-9 or free_memory < 0:
+                continue
+            if placement.policy == 'binpack':
+                key = (free_vcpus, free_memory, vm['id'])
+            else:
+                key = ((used['vcpus'] + demand['vcpus']) / capacity['vcpus'], len(used['tasks']), vm['id'])
+            ranked.append((key, vm))
+        if len(ranked) < placement.count:
+            return False
+
+        now = time.time()
+        for _, vm in sorted(ranked, key=lambda item: item[0])[:placement.count]:
+            placement.allocations[vm['id']] = {
+                'floating_ip': vm['floating_ip'], 'state': 'deploying', 'placed_at': now, 'checked_at': now,
+            }
+        placement.status = 'placed'
+        placement.placed_at = now
+        return True
+
+    def _ever_fits(self, placement: Placement) -> bool:
+        """다른 작업이 모두 끝나면 배치할 수 있는 요청인지"""
+        fits = 0
+        for vm in placement.candidates:
+            capacity = self._capacity(vm)
+            if placement.demand['vcpus'] <= capacity['vcpus'] + 1e-9 and placement.demand['memory_mb'] <= capacity['memory_mb']:
+                fits += 1
+        return fits >= placement.count
+
+    def _conflict_message(self, placement: Placement) -> str:
+        demand = placement.demand
+        return (
+            f"No capacity for {placement.count} VM(s) with {demand['vcpus']:g} vCPU / {demand['memory_mb']} MB "
+            f"among {len(placement.candidates)} candidate(s)"
+        )
+
+    def _remember(self, placement: Placement) -> None:
+        # 호출 측에서 self._lock 보유 (같은 task_id의 이전 기록은 덮어씀)
+        self._placements.pop(placement.task_id, None)
+        self._placements[placement.task_id] = placement
+        excess = len(self._placements) - self.max_history
+        if excess > 0:
+            finished = [
+                task_id for task_id, p in self._placements.items()
+                if p.status in ('released', 'expired', 'failed') and not p.allocations
+            ]
+            for task_id in finished[:excess]:
+                del self._placements[task_id]
+
+    def _dispatch(self) -> None:
+        """반납된 자원으로 대기 중인 요청을 앞에서부터 배치 (앞 요청이 크면 뒤의 작은 요청이 먼저 들어갈 수 있음)"""
+        placed = []
+        with self._lock:
+            for placement in list(self._pending):
+                if self._try_place(placement):
+                    self._pending.remove(placement)
+                    placed.append(placement)
+        for placement in placed:
+            logger.info(f"Placed queued task {placement.task_id} on {list(placement.allocations)}")
+            if not placement.on_placed:
+                continue
+            try:
+                placement.on_placed(placement)
+            except Exception as e:
+                logger.error(f"Failed to start placed task {placement.task_id}: {str(e)}")
+                placement.error = str(e)
+                self.release(placement.task_id, status='failed')
+                # submit 호출자는 이미 반환했으므로 정리(업로드 임시 파일 등)는 on_cancelled가 맡는다
+                self._cancelled(placement)
+
+    @staticmethod
+    def _cancelled(placement: Placement) -> None:
+        if placement.on_cancelled:
+            try:
+                placement.on_cancelled(placement)
+            except Exception as e:
+                logger.error(f"Error cancelling placement {placement.task_id}: {str(e)}")
+
+    def _ensure_reaper(self) -> None:
+        with self._lock:
+            if self._reaper is not None or self.reap_interval <= 0:
+                return
+            self._reaper = threading.Thread(target=self._reap_loop, name='fl-placement-reaper', daemon=True)
+            self._reaper.start()
+
+    def _reap_loop(self) -> None:
+        while True:
+            time.sleep(self.reap_interval)
+            try:
+                self._reap()
+            except Exception as e:
+                logger.error(f"Placement reaper failed: {str(e)}")
+
+    def _reap(self) -> None:
+        """대기 시간이 지난 요청을 만료시키고, 할당된 VM의 원격 프로세스가 끝났으면 반납"""
+        now = time.time()
+        expired, targets = [], []
+        with self._lock:
+            for placement in list(self._pending):
+                if self.queue_timeout > 0 and now - placement.submitted_at > self.queue_timeout:
+                    self._pending.remove(placement)
+                    placement.status = 'expired'
+                    placement.released_at = now
+                    expired.append(placement)
+            for placement in self._placements.values():
+                for vm_id, allocation in placement.allocations.items():
+                    # 배포 중인 할당은 배포가 멈춘 것으로 볼 만큼 오래됐을 때만 확인
+                    if allocation['state'] == 'running' or now - allocation['placed_at'] > Config.FL_PLACEMENT_DEPLOY_TIMEOUT:
+                        targets.append((placement.task_id, vm_id, allocation['floating_ip']))
+        for placement in expired:
+            logger.warning(f"Placement of {placement.task_id} expired after {self.queue_timeout}s in queue")
+            self._cancelled(placement)
+
+        if not targets:
+            return
+        with ThreadPoolExecutor(max_workers=min(len(targets), 16), thread_name_prefix='fl-placement') as executor:
+            states = list(executor.map(lambda t: self.ssh_service.get_process_status(t[2], t[0]), targets))
+        for (task_id, vm_id, _), status in zip(targets, states):
+            if status.get('success') and status.get('state') in _TERMINAL_STATES:
+                logger.info(f"Releasing {task_id} on {vm_id}: process {status['state']}")
+                self.release(task_id, vm_id)
+
+
+# 애플리케이션 전역에서 공유하는 작업 배치 스케줄러
+placement_scheduler = PlacementScheduler()
@@ -0,0 +1,199 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional
+
+from config.settings import Config
+from utils.prometheus import PrometheusClient, PrometheusError, get_prometheus_client
+from utils.vm_inventory import VMInventory, vm_inventory
+
+logger = logging.getLogger(__name__)
+
+# 점수에 쓰는 지표 (모두 0~1로 정규화한 뒤 가중합, 클수록 여유 있는 VM)
+#   cpu_idle: CPU 유휴 비율 / memory: MemAvailable / MemTotal
+#   load: 1 / (1 + 코어당 load1) / network: 1 - 송수신량 / 후보 중 최대 송수신량
+METRIC_NAMES = ('cpu_idle', 'load', 'memory', 'network')
+
+
+def parse_weights(text: str) -> Dict[str, float]:
+    """'cpu_idle=0.4,memory=0.3' 형식(':'도 허용)의 가중치 (알 수 없는 지표나 음수면 ValueError)"""
+    weights = {}
+    for item in (text or '').split(','):
+        if not item.strip():
+            continue
+        name, sep, value = item.replace(':', '=').partition('=')
+        name = name.strip()
+        if not sep or name not in METRIC_NAMES:
+            raise ValueError(f"weights must be <metric>=<number> with metric in {', '.join(METRIC_NAMES)}, got {item!r}")
+        try:
+            weights[name] = float(value)
+        except ValueError:
+            raise ValueError(f'weight for {name} must be a number, got {value!r}')
+        if weights[name] < 0:
+            raise ValueError(f'weight for {name} must not be negative, got {value!r}')
+    if not any(weights.values()):
+        raise ValueError('at least one weight must be positive')
+    return weights
+
+
+class ParticipantSelector:
+    """node_exporter 지표로 참가자 VM 순위를 매겨 상위 K개를 선택
+
+    - 지표마다 모든 대상을 한 번에 조회하는 PromQL 쿼리를 동시에 실행 (VM 수와 무관하게 쿼리 4개)
+    - 결과는 instance 라벨의 호스트를 인벤토리의 floating IP와 맞춰 VM에 연결
+    - 지표 스냅샷은 cache_ttl초 동안 재사용하고, 동시에 들어온 요청은 한 번의 조회를 공유
+    - 과부하(load/CPU/메모리 기준 미달) VM은 순위에 넣기 전에 제외
+    """
+
+    def __init__(
+        self,
+        client: Optional[PrometheusClient] = None,
+        inventory: VMInventory = vm_inventory,
+        cache_ttl: float = Config.SELECTION_CACHE_TTL,
+        job: str = Config.PROMETHEUS_NODE_JOB,
+        rate_window: str = Config.PROMETHEUS_RATE_WINDOW,
+    ):
+        self._client = client
+        self.inventory = inventory
+        self.cache_ttl = cache_ttl
+        self.job = job
+        self.rate_window = rate_window
+        self._executor = ThreadPoolExecutor(max_workers=len(METRIC_NAMES), thread_name_prefix='prom-query')
+        self._lock = threading.Lock()
+        self._snapshot: Optional[Dict] = None
+
+    @property
+    def client(self) -> PrometheusClient:
+        return self._client or get_prometheus_client()
+
+    def queries(self) -> Dict[str, str]:
+        """지표 이름 -> instance별 값을 돌려주는 PromQL"""
+        job, window = self.job, self.rate_window
+        return {
+            'cpu_idle': f'avg by (instance) (rate(node_cpu_seconds_total{{job="{job}",mode="idle"}}[{window}]))',
+            'load': (
+                f'max by (instance) (node_load1{{job="{job}"}}) / '
+                f'count by (instance) (node_cpu_seconds_total{{job="{job}",mode="idle"}})'
+            ),
+            'memory': (
+                f'max by (instance) (node_memory_MemAvailable_bytes{{job="{job}"}}) / '
+                f'max by (instance) (node_memory_MemTotal_bytes{{job="{job}"}})'
+            ),
+            'network': (
+                f'sum by (instance) (rate(node_network_receive_bytes_total{{job="{job}",device!="lo"}}[{window}])'
+                f' + rate(node_network_transmit_bytes_total{{job="{job}",device!="lo"}}[{window}]))'
+            ),
+        }
+
+    def snapshot(self, max_age: Optional[float] = None) -> Dict:
+        """호스트별 지표 스냅샷 {'hosts': {ip: {지표: 값}}, 'errors': {...}, 'fetched_at': ...}
+
+        max_age초(기본 cache_ttl)보다 오래된 스냅샷이면 새로 조회한다. 모든 쿼리가 실패하면 PrometheusError
+        """
+        max_age = self.cache_ttl if max_age is None else max_age
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or time.time() - snapshot['fetched_at'] > max_age:
+                snapshot = self._fetch()
+                self._snapshot = snapshot
+            return snapshot
+
+    def select(
+        self,
+        k: int = Config.SELECTION_DEFAULT_K,
+        weights: Optional[Dict[str, float]] = None,
+        max_load: float = Config.SELECTION_MAX_LOAD,
+        min_cpu_idle: float = Config.SELECTION_MIN_CPU_IDLE,
+        min_memory: float = Config.SELECTION_MIN_MEMORY,
+        max_age: Optional[float] = None,
+    ) -> Dict:
+        """점수 상위 k개 VM과 제외된 VM(사유 포함)"""
+        weights = weights or parse_weights(Config.SELECTION_WEIGHTS)
+        snapshot = self.snapshot(max_age)
+        hosts = snapshot['hosts']
+
+        candidates, excluded = [], []
+        for vm in self.inventory.list_vms():
+            ip = vm.get('floating_ip')
+            metrics = hosts.get(ip) if ip else None
+            if not ip:
+                excluded.append({'vm_id': vm.get('id'), 'floating_ip': None, 'reason': 'no_ip'})
+            elif not metrics:
+                excluded.append({'vm_id': vm.get('id'), 'floating_ip': ip, 'reason': 'no_metrics'})
+            else:
+                reason = self._overload_reason(metrics, max_load, min_cpu_idle, min_memory)
+                if reason:
+                    excluded.append({'vm_id': vm.get('id'), 'floating_ip': ip, 'reason': reason, 'metrics': metrics})
+                else:
+                    candidates.append({'vm_id': vm.get('id'), 'floating_ip': ip, 'metrics': metrics})
+
+        max_network = max((c['metrics'].get('network', 0.0) for c in candidates), default=0.0)
+        total_weight = sum(weights.values())
+        for candidate in candidates:
+            scores = self._normalize(candidate['metrics'], max_network)
+            candidate['score'] = round(sum(w * scores.get(name, 0.0) for name, w in weights.items()) / total_weight, 4)
+            candidate['missing'] = [name for name in weights if name not in candidate['metrics']]
+        candidates.sort(key=lambda c: (-c['score'], c['vm_id'] or ''))
+
+        selected = candidates[:max(0, k)]
+        return {
+            'selected': selected,
+            'vm_ids': [c['vm_id'] for c in selected],
+            'candidates': len(candidates),
+            'excluded': excluded,
+            'weights': weights,
+            'thresholds': {'max_load': max_load, 'min_cpu_idle': min_cpu_idle, 'min_memory': min_memory},
+            'query_errors': snapshot['errors'],
+            'metrics_age_seconds': round(time.time() - snapshot['fetched_at'], 3),
+            'metrics_fetched_at': datetime.fromtimestamp(snapshot['fetched_at']).isoformat(),
+        }
+
+    def _fetch(self) -> Dict:
+        futures = {
+            name: self._executor.submit(self.client.query_by_host, name, promql)
+            for name, promql in self.queries().items()
+        }
+        hosts: Dict[str, Dict[str, float]] = {}
+        errors = {}
+        for name, future in futures.items():
+            try:
+                values = future.result()
+            except PrometheusError as e:
+                logger.error(str(e))
+                errors[name] = str(e)
+                continue
+            for host, value in values.items():
+                hosts.setdefault(host, {})[name] = round(value, 4)
+
+        if len(errors) == len(futures):
+            raise PrometheusError(f"All Prometheus queries failed: {next(iter(errors.values()))}")
+        return {'hosts': hosts, 'errors': errors, 'fetched_at': time.time()}
+
+    @staticmethod
+    def _overload_reason(metrics: Dict[str, float], max_load: float, min_cpu_idle: float, min_memory: float) -> Optional[str]:
+        """지표가 있는 항목만 기준과 비교 (통과하면 None)"""
+        if metrics.get('load', 0.0) > max_load:
+            return 'load'
+        if metrics.get('cpu_idle', 1.0) < min_cpu_idle:
+            return 'cpu_idle'
+        if metrics.get('memory', 1.0) < min_memory:
+            return 'memory'
+        return None
+
+    @staticmethod
+    def _normalize(metrics: Dict[str, float], max_network: float) -> Dict[str, float]:
+        scores = {}
+        if 'cpu_idle' in metrics:
+            scores['cpu_idle'] = min(max(metrics['cpu_idle'], 0.0), 1.0)
+        if 'memory' in metrics:
+            scores['memory'] = min(max(metrics['memory'], 0.0), 1.0)
+        if 'load' in metrics:
+            scores['load'] = 1.0 / (1.0 + max(metrics['load'], 0.0))
+        if 'network' in metrics:
+            scores['network'] = 1.0 - metrics['network'] / max_network if max_network > 0 else 1.0
+        return scores
+
+
+participant_selector = ParticipantSelector()
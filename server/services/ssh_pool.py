@@ -0,0 +1,245 @@
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+import paramiko
+
+from config.settings import Config
+from utils.metrics import ssh_timer
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# 연결 자체가 끊겼음을 뜻하는 예외 (SFTP의 일반 IOError는 포함하지 않음)
+_BROKEN_CONNECTION_ERRORS = (paramiko.SSHException, EOFError, ConnectionError)
+
+HostKey = Tuple[str, int, str]
+
+
+class SSHPoolTimeout(Exception):
+    """호스트별 최대 연결 수에 도달해 대기 시간 안에 연결을 얻지 못함"""
+
+
+class _PooledConnection:
+    __slots__ = ('client', 'key', 'created_at', 'last_used', 'uses')
+
+    def __init__(self, client: paramiko.SSHClient, key: HostKey):
+        self.client = client
+        self.key = key
+        self.created_at = time.time()
+        self.last_used = self.created_at
+        self.uses = 0
+
+    def is_alive(self) -> bool:
+        transport = self.client.get_transport()
+        return transport is not None and transport.is_active()
+
+    def probe(self) -> bool:
+        """유휴 연결을 넘겨주기 전에 IGNORE 패킷을 보내 소켓이 아직 쓸 수 있는지 확인"""
+        if not self.is_alive():
+            return False
+        try:
+            self.client.get_transport().send_ignore()
+        except Exception:
+            return False
+        return self.is_alive()
+
+    def close(self) -> None:
+        try:
+            self.client.close()
+        except Exception:
+            pass
+
+
+class _HostPool:
+    def __init__(self):
+        self.idle: List[_PooledConnection] = []
+        self.total = 0
+        self.cond = threading.Condition()
+
+
+class SSHConnectionPool:
+    """호스트별로 살아 있는 paramiko 연결을 재사용하는 풀
+
+    - (host, port, user) 단위로 최대 max_per_host개의 연결을 유지하고, 모두 사용 중이면 반납될 때까지 대기
+    - 연결마다 keepalive를 설정하고, idle_timeout 동안 사용되지 않은 연결은 정리
+    - 유휴 연결은 넘겨주기 전에 살아 있는지 확인하고, 끊겨 있으면 버리고 새로 연결
+    - fn은 한 번만 실행. idempotent=True인 호출만 재사용 연결이 도중에 끊겼을 때 새 연결로 한 번 재시도
+    """
+
+    def __init__(
+        self,
+        max_per_host: int = Config.SSH_POOL_MAX_PER_HOST,
+        idle_timeout: float = Config.SSH_POOL_IDLE_TIMEOUT,
+        keepalive_interval: int = Config.SSH_KEEPALIVE_INTERVAL,
+        acquire_timeout: float = Config.SSH_POOL_ACQUIRE_TIMEOUT,
+    ):
+        self.max_per_host = max(1, max_per_host)
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self.acquire_timeout = acquire_timeout
+
+        self._hosts: Dict[HostKey, _HostPool] = {}
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+    def run(
+        self,
+        host: str,
+        fn: Callable[[paramiko.SSHClient], T],
+        port: int,
+        username: str,
+        key_filename: str,
+        timeout: float = 10,
+        idempotent: bool = False,
+    ) -> T:
+        """풀에서 연결을 빌려 fn(client)를 실행하고 반납
+
+        배포처럼 두 번 실행되면 안 되는 fn은 실패해도 재시도하지 않는다.
+        로그 조회 같은 읽기 전용 fn만 idempotent=True로 호출할 것.
+        """
+        key = (host, port, username)
+        for attempt in range(2):
+            conn = self._acquire(key, key_filename, timeout)
+            reused = conn.uses > 0
+            conn.uses += 1
+            try:
+                result = fn(conn.client)
+            except _BROKEN_CONNECTION_ERRORS as e:
+                self._release(conn, broken=True)
+                if idempotent and reused and attempt == 0:
+                    logger.warning(f"Pooled SSH connection to {host} failed ({str(e)}), retrying on a new connection")
+                    continue
+                raise
+            except Exception:
+                self._release(conn, broken=not conn.is_alive())
+                raise
+            self._release(conn, broken=False)
+            return result
+        raise RuntimeError("unreachable")
+
+    def connect(self, host: str, port: int, username: str, key_filename: str, timeout: float = 10) -> paramiko.SSHClient:
+        """풀에 넣지 않는 전용 연결 (tail -F처럼 오래 유지되는 스트림용, 호출 측에서 close)"""
+        return self._connect((host, port, username), key_filename, timeout)
+
+    def close_host(self, host: str) -> None:
+        """해당 호스트의 유휴 연결을 모두 닫음"""
+        with self._lock:
+            pools = [(k, p) for k, p in self._hosts.items() if k[0] == host]
+        for _, pool in pools:
+            self._drain(pool, lambda conn: True)
+
+    def close_all(self) -> None:
+        with self._lock:
+            pools = list(self._hosts.values())
+        for pool in pools:
+            self._drain(pool, lambda conn: True)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """호스트별 전체/유휴 연결 수"""
+        with self._lock:
+            items = list(self._hosts.items())
+        return {
+            f"{user}@{host}:{port}": {'total': pool.total, 'idle': len(pool.idle)}
+            for (host, port, user), pool in items
+        }
+
+    # ------------------------------------------------------------------
+    # 내부 구현
+    # ------------------------------------------------------------------
+    def _host_pool(self, key: HostKey) -> _HostPool:
+        with self._lock:
+            pool = self._hosts.get(key)
+            if pool is None:
+                pool = self._hosts[key] = _HostPool()
+            if self._reaper is None and self.idle_timeout > 0:
+                self._reaper = threading.Thread(target=self._reap_loop, name='ssh-pool-reaper', daemon=True)
+                self._reaper.start()
+            return pool
+
+    def _acquire(self, key: HostKey, key_filename: str, timeout: float) -> _PooledConnection:
+        pool = self._host_pool(key)
+        deadline = time.time() + self.acquire_timeout
+        with pool.cond:
+            while True:
+                while pool.idle:
+                    conn = pool.idle.pop()
+                    if conn.probe():
+                        return conn
+                    pool.total -= 1
+                    conn.close()
+                if pool.total < self.max_per_host:
+                    pool.total += 1
+                    break
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise SSHPoolTimeout(f"No SSH connection available for {key[0]} (max {self.max_per_host} per host)")
+                pool.cond.wait(remaining)
+
+        # 연결 수립은 락 밖에서 수행
+        try:
+            return _PooledConnection(self._connect(key, key_filename, timeout), key)
+        except Exception:
+            with pool.cond:
+                pool.total -= 1
+                pool.cond.notify()
+            raise
+
+    def _connect(self, key: HostKey, key_filename: str, timeout: float) -> paramiko.SSHClient:
+        host, port, username = key
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        logger.info(f"Opening SSH connection to {username}@{host}:{port}")
+        with ssh_timer(host, 'connect'):
+            client.connect(
+                hostname=host,
+                port=port,
+                username=username,
+                key_filename=os.path.expanduser(key_filename),
+                timeout=timeout,
+            )
+        if self.keepalive_interval > 0:
+            client.get_transport().set_keepalive(self.keepalive_interval)
+        return client
+
+    def _release(self, conn: _PooledConnection, broken: bool) -> None:
+        pool = self._host_pool(conn.key)
+        with pool.cond:
+            if broken or not conn.is_alive():
+                pool.total -= 1
+                conn.close()
+            else:
+                conn.last_used = time.time()
+                pool.idle.append(conn)
+            pool.cond.notify()
+
+    def _drain(self, pool: _HostPool, predicate: Callable[[_PooledConnection], bool]) -> None:
+        with pool.cond:
+            keep, drop = [], []
+            for conn in pool.idle:
+                (drop if predicate(conn) else keep).append(conn)
+            pool.idle = keep
+            pool.total -= len(drop)
+            pool.cond.notify_all()
+        for conn in drop:
+            conn.close()
+
+    def _reap_loop(self) -> None:
+        interval = max(1.0, self.idle_timeout / 2)
+        while True:
+            time.sleep(interval)
+            cutoff = time.time() - self.idle_timeout
+            with self._lock:
+                pools = list(self._hosts.values())
+            for pool in pools:
+                self._drain(pool, lambda conn: conn.last_used < cutoff or not conn.is_alive())
+
+
+# 애플리케이션 전역에서 공유하는 연결 풀
+ssh_pool = SSHConnectionPool()
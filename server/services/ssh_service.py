@@ -1,18 +1,102 @@
 import paramiko
+import codecs
+import gzip
+import hashlib
+import io
+import json
 import os
 import logging
+import posixpath
+import shlex
+import socket
+import tarfile
+import threading
 import time
-from typing import Dict
+from datetime import datetime
+from typing import IO, Callable, Dict, Iterator, List, Optional, Set, Tuple, TypeVar, Union
 
 from config.settings import Config
+from services.ssh_pool import SSHConnectionPool, ssh_pool
+from services.workspace_upload import SpooledFile
+from utils.metrics import PhaseRecorder, ssh_timer
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
+# 호스트별로 원격 콘텐츠 저장소(~/.fl-cache)에 이미 있는 것으로 확인된 blob 해시
+# (모든 SSHService 인스턴스가 공유하며, 서버 재시작 시 비워짐)
+_known_blobs: Dict[str, Set[str]] = {}
+_known_blobs_lock = threading.Lock()
+
+# 원격 스크립트가 "저장소에 없는 blob"을 보고할 때 사용하는 종료 코드
+_MISSING_BLOBS_EXIT = 3
+
+# 작업 공간 파일: (sha256, 상대 경로) 목록과 sha256 -> (내용, 권한)
+# 내용은 메모리의 bytes이거나 업로드로 받아 디스크에 스풀된 SpooledFile
+Manifest = List[Tuple[str, str]]
+BlobData = Union[bytes, SpooledFile]
+Blobs = Dict[str, Tuple[BlobData, int]]
+
+# 아카이브를 원격 명령의 표준 입력으로 흘려보내는 단위
+_STREAM_CHUNK = 256 * 1024
+
+# 클라이언트(client_app.py)가 작업 공간에 남기는 학습 진행 기록 (JSON 한 줄씩)
+TELEMETRY_FILE = 'telemetry.jsonl'
+
+# 작업 공간 안의 실행 기록 디렉토리: pid, start_ticks, started_at, ended_at, exit_code
+_PROC_DIR = '.fl-proc'
+
+# /proc/<pid>/stat의 프로세스 시작 시각(클럭 틱) — 같은 pid가 재사용된 다른 프로세스를 걸러냄
+# (명령 이름에 공백이 있어도 되도록 ") " 앞을 잘라낸 뒤 상태가 1번째, 시작 시각이 20번째 필드, 좀비는 빈 값)
+_START_TICKS = "awk '{sub(/^.*\\) /, \"\"); if ($1 != \"Z\") print $20}' /proc/%s/stat 2>/dev/null"
+
+
+def _open_blob(data: BlobData) -> IO[bytes]:
+    return data.open() if isinstance(data, SpooledFile) else io.BytesIO(data)
+
+
+class _CountingWriter:
+    """쓴 바이트 수를 세며 write를 그대로 넘기는 파일 객체 (스트리밍 전송 크기 기록용)"""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.written = 0
+
+    def write(self, data) -> int:
+        self.raw.write(data)
+        self.written += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        if hasattr(self.raw, 'flush'):
+            self.raw.flush()
+
+
 class SSHService:
-    def __init__(self):
+    def __init__(self, pool: SSHConnectionPool | None = None):
         self.ssh_user = Config.SSH_USER
         self.ssh_key_path = Config.SSH_KEY_PATH
         self.ssh_port = Config.SSH_PORT
+        self.pool = pool or ssh_pool
+
+    def _run(
+        self,
+        floating_ip: str,
+        fn: Callable[[paramiko.SSHClient], T],
+        timeout: float = 10,
+        idempotent: bool = False,
+    ) -> T:
+        """풀에서 floating_ip에 대한 SSH 연결을 빌려 fn(client) 실행 (재시도는 idempotent한 fn만)"""
+        return self.pool.run(
+            floating_ip,
+            fn,
+            port=self.ssh_port,
+            username=self.ssh_user,
+            key_filename=self.ssh_key_path,
+            timeout=timeout,
+            idempotent=idempotent,
+        )
 
     def deploy_and_execute_fl_code(
         self,
@@ -22,190 +106,655 @@ class SSHService:
         entry_point: str | None = None,
         additional_files: Dict[str, str] | None = None,
         custom_command: str | None = None,
+        deploy_mode: str | None = None,
+        on_phase: Callable[[str], None] | None = None,
     ) -> dict:
-        """SSH를 통해 연합학습 코드를 VM에 배포하고 실행"""
+        """SSH를 통해 연합학습 코드를 VM에 배포하고 실행
+
+        deploy_mode
+          - 'archive' (기본값): 작업 공간을 tar.gz 하나로 묶어 한 번의 exec 채널로 전송하고,
+            같은 원격 명령에서 압축 해제/실행/상태 보고까지 수행 (왕복 1회)
+          - 'sftp': 파일마다 SFTP로 업로드하고 단계별로 명령을 실행하는 기존 방식
+        on_phase: 단계가 바뀔 때마다 'connect', 'upload', 'launch' 순으로 호출되는 콜백
+        """
+        mode = (deploy_mode or Config.FL_DEPLOY_MODE).lower()
+        deploy = self._deploy_archive if mode == 'archive' else self._deploy_and_execute
+        phase = PhaseRecorder(mode, on_phase, host=floating_ip)
         try:
-            # SSH 클라이언트 생성
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-
-            # SSH 연결
-            key_path = os.path.expanduser(self.ssh_key_path)
-            logger.info(f"Connecting to {floating_ip} with key {key_path}")
-            client.connect(
-                hostname=floating_ip,
-                port=self.ssh_port,
-                username=self.ssh_user,
-                key_filename=key_path,
-                timeout=10,
+            phase('connect')
+            result = self._run(
+                floating_ip,
+                lambda client: deploy(
+                    client, floating_ip, task_id, env_config, entry_point, additional_files, custom_command, phase
+                ),
             )
-            
-            # 연결 테스트
-            stdin, stdout, stderr = client.exec_command("whoami && pwd && date")
-            test_out = stdout.read().decode("utf-8")
-            test_err = stderr.read().decode("utf-8")
-            logger.info(f"SSH connection test: {test_out}")
-            if test_err:
-                logger.error(f"SSH test error: {test_err}")
-
-            # SFTP 클라이언트 생성
-            sftp = client.open_sftp()
+        except Exception as e:
+            logger.error(f"Failed to deploy FL code to {floating_ip}: {str(e)}")
+            result = {"success": False, "error": str(e), "message": "Failed to deploy and execute federated learning code"}
+        phase.finish(result.get("success", False))
+        return result
 
-            # 홈 디렉토리 경로 얻기
-            stdin, stdout, stderr = client.exec_command("echo $HOME")
-            home_dir = stdout.read().decode("utf-8").strip()
-            logger.info(f"Home directory: {home_dir}")
-
-            # 현재 디렉토리를 작업 디렉토리로 사용 (가장 안전)
-            remote_work_dir = f"./fl-workspace/{task_id}"
-            logger.info(f"Creating remote directory: {remote_work_dir}")
-            stdin, stdout, stderr = client.exec_command(f"mkdir -p {remote_work_dir}")
-            
-            # 디렉토리 생성 확인
-            stdin, stdout, stderr = client.exec_command(f"ls -la {remote_work_dir}")
-            ls_out = stdout.read().decode("utf-8")
-            ls_err = stderr.read().decode("utf-8")
-            logger.info(f"Directory listing: {ls_out}")
-            if ls_err:
-                logger.error(f"Error listing directory: {ls_err}")
-
-            # 파일 업로드
-            if additional_files:
-                for rel_path, content in additional_files.items():
-                    rel_path = rel_path.lstrip("/")
-                    if ".." in rel_path:
-                        continue
-                    remote_path = f"{remote_work_dir}/{rel_path}"
-                    remote_dir = os.path.dirname(remote_path)
-                    if remote_dir and remote_dir != remote_work_dir:
-                        client.exec_command(f'mkdir -p "{remote_dir}"')
-                    with sftp.open(remote_path, "w") as f:
-                        f.write(content if isinstance(content, str) else str(content))
-
-            # .env 파일 생성
-            env_lines = [f"{k}={v}" for k, v in (env_config or {}).items()]
-            with sftp.open(f"{remote_work_dir}/.env", "w") as f:
-                f.write("\n".join(env_lines))
-
-            sftp.close()
-
-            # 실행 커맨드 작성
-            if custom_command:
-                execute_cmd = (
-                    f"cd {remote_work_dir} && "
-                    f"export $(cat .env | xargs) && "
-                    f"nohup {custom_command} > {task_id}.log 2>&1 &"
-                )
-            else:
-                ep = entry_point or "main.py"
-                execute_cmd = (
-                    f"cd {remote_work_dir} && "
-                    f"export $(cat .env | xargs) && "
-                    f"nohup python3 {ep} > {task_id}.log 2>&1 &"
-                )
+    def _deploy_and_execute(
+        self,
+        client: paramiko.SSHClient,
+        floating_ip: str,
+        task_id: str,
+        env_config: dict,
+        entry_point: str | None,
+        additional_files: Dict[str, str] | None,
+        custom_command: str | None,
+        phase: Callable[[str], None],
+    ) -> dict:
+        """deploy_and_execute_fl_code의 실제 배포 단계 (풀에서 빌린 연결 사용)"""
+        # 사용자/홈 디렉토리 등 호스트 정보는 VM 지문(fingerprint_service)으로 한 번만 수집하므로 여기서 다시 묻지 않음
+        # 현재 디렉토리를 작업 디렉토리로 사용 (가장 안전)
+        # 디렉터리 생성과 .env 작성은 별도 왕복 없이 실행 커맨드에서 함께 수행
+        remote_work_dir = f"./fl-workspace/{task_id}"
+
+        # 파일 업로드 (저장소에 없는 blob만 SFTP로 올리고 작업 공간에는 하드링크)
+        phase('upload')
+        manifest, blobs = self._content_manifest(additional_files)
+        if manifest:
+            with ssh_timer(floating_ip, 'sftp'):
+                sftp = client.open_sftp()
+                try:
+                    self._upload_blobs_sftp(client, sftp, floating_ip, remote_work_dir, manifest, blobs)
+                finally:
+                    sftp.close()
 
-            logger.info(f"Executing command on {floating_ip}: {execute_cmd}")
+        # 실행 커맨드 작성
+        command = custom_command or f"python3 {entry_point or 'main.py'}"
+        env_file = "\n".join(f"{k}={v}" for k, v in (env_config or {}).items())
+        execute_cmd = (
+            f"mkdir -p {remote_work_dir} && cd {remote_work_dir} && "
+            f"printf '%s' {shlex.quote(env_file)} > .env && "
+            f"export $(cat .env | xargs) && "
+            f"{self._launch_command(task_id, command)}"
+        )
+
+        phase('launch')
+        logger.info(f"Executing command on {floating_ip}: {execute_cmd}")
+        with ssh_timer(floating_ip, 'exec'):
             stdin, stdout, stderr = client.exec_command(execute_cmd)
             output = stdout.read().decode("utf-8")
             error = stderr.read().decode("utf-8")
-            
-            logger.info(f"Command output: {output}")
-            if error:
-                logger.error(f"Command error: {error}")
-
-            # 파일 목록 확인
-            check_files_cmd = f"ls -la {remote_work_dir}"
-            _, files_out, _ = client.exec_command(check_files_cmd)
-            files_list = files_out.read().decode("utf-8")
-            logger.info(f"Files in remote directory: {files_list}")
-
-            # 프로세스 시작 확인
-            if custom_command and "flwr run" in custom_command:
-                check_target = "flwr"
-            elif custom_command:
-                check_target = custom_command.split()[0]
+        
+        logger.info(f"Command output: {output}")
+        if error:
+            logger.error(f"Command error: {error}")
+
+        # 프로세스 시작 확인 (래퍼가 남긴 실행 기록을 한 번에 조회)
+        _, out2, _ = client.exec_command(
+            f"sleep {Config.FL_LAUNCH_GRACE_SECONDS}\n{self._process_status_script(task_id, remote_work_dir)}"
+        )
+        process = self._parse_process_status(out2.read().decode("utf-8", errors="replace"))
+
+        if error and "nohup" not in error:
+            logger.error(f"Error executing FL code on {floating_ip}: {error}")
+            return {"success": False, "error": error, "message": "Failed to execute federated learning code"}
+
+        return {
+            "success": True,
+            "output": output,
+            "remote_path": remote_work_dir,
+            "message": f"Federated learning code deployed and started in {remote_work_dir}",
+            "pid": process.get('pid'),
+            "process_running": process['state'] == 'running',
+            "process": process,
+            "deploy_mode": "sftp",
+        }
+
+    def _deploy_archive(
+        self,
+        client: paramiko.SSHClient,
+        floating_ip: str,
+        task_id: str,
+        env_config: dict,
+        entry_point: str | None,
+        additional_files: Dict[str, str] | None,
+        custom_command: str | None,
+        phase: Callable[[str], None],
+    ) -> dict:
+        """작업 공간을 압축 아카이브 하나로 전송하고 한 번의 원격 명령으로 해제/실행/상태 확인"""
+        remote_work_dir = f"fl-workspace/{task_id}"
+        command = custom_command or f"python3 {entry_point or 'main.py'}"
+        manifest, blobs = self._content_manifest(additional_files)
+        script = self._archive_script(task_id, command)
+
+        phase('upload')
+        known = self._known_blobs(floating_ip)
+        for attempt in range(2):
+            upload = {sha: blob for sha, blob in blobs.items() if sha not in known}
+            logger.info(
+                f"Deploying workspace archive to {floating_ip}:{remote_work_dir} "
+                f"({len(upload)} new / {len(blobs) - len(upload)} cached blobs, {self._blob_bytes(upload)} bytes)"
+            )
+            with ssh_timer(floating_ip, 'exec'):
+                stdin, stdout, stderr = client.exec_command(script)
+                # 아카이브를 메모리에 만들지 않고 채널로 바로 압축해 보냄
+                self._write_workspace_archive(stdin, upload, manifest, env_config)
+                stdin.flush()
+                stdin.channel.shutdown_write()
+                if attempt == 0:
+                    phase('launch')
+                output = stdout.read().decode("utf-8", errors="replace")
+                error = stderr.read().decode("utf-8", errors="replace")
+                exit_status = stdout.channel.recv_exit_status()
+
+            missing = self._parse_missing_blobs(output)
+            if exit_status == _MISSING_BLOBS_EXIT and missing and attempt == 0:
+                # 원격 저장소가 정리/초기화된 경우: 기억을 지우고 누락된 blob을 포함해 한 번 더 전송
+                logger.warning(f"{len(missing)} cached blobs missing on {floating_ip}, re-sending")
+                self._forget_blobs(floating_ip, missing)
+                known = known - set(missing)
+                continue
+            break
+
+        return self._archive_result(floating_ip, remote_work_dir, exit_status, output, error, blobs, len(upload))
+
+    def _archive_script(self, task_id: str, command: str) -> str:
+        """표준 입력으로 받은 작업 공간 아카이브를 해제하고 command를 백그라운드로 실행하는 원격 스크립트"""
+        remote_work_dir = f"fl-workspace/{task_id}"
+        cache_dir = Config.FL_BLOB_CACHE_DIR
+        return "\n".join([
+            "set -e",
+            f"mkdir -p {cache_dir} {remote_work_dir}",
+            # trap은 cd 이후에 실행될 수도 있으므로 스테이징 디렉터리는 절대 경로로 만든다
+            f"S=$(mktemp -d \"$(cd {cache_dir} && pwd)/.incoming.XXXXXX\")",
+            "trap 'rm -rf \"$S\"' EXIT",
+            "tar -xzf - -C \"$S\"",
+            f"for b in \"$S\"/blobs/*; do [ -f \"$b\" ] || continue; mv -f \"$b\" {cache_dir}/; done",
+            *self._link_blobs_script(remote_work_dir, '"$S/manifest"'),
+            f"cp -f \"$S/.env\" {remote_work_dir}/.env",
+            "rm -rf \"$S\"",
+            "trap - EXIT",
+            self._prune_blobs_command(),
+            f"cd {remote_work_dir}",
+            "if [ -s .env ]; then export $(xargs < .env); fi",
+            self._launch_command(task_id, command),
+            f"sleep {Config.FL_LAUNCH_GRACE_SECONDS}",
+            "echo \"__FL_PATH__=$(pwd)\"",
+            self._process_status_script(task_id, '.'),
+            "ls -1A | sed 's/^/__FL_FILE__=/'",
+        ])
+
+    def _archive_result(
+        self,
+        floating_ip: str,
+        remote_work_dir: str,
+        exit_status: int,
+        output: str,
+        error: str,
+        blobs: Blobs,
+        uploaded: int,
+    ) -> dict:
+        """아카이브 배포 스크립트의 종료 코드와 출력을 배포 결과로 변환"""
+        if exit_status == 0:
+            self._remember_blobs(floating_ip, blobs.keys())
+
+        status = self._parse_launch_status(output)
+        if exit_status != 0:
+            logger.error(f"Error deploying FL code on {floating_ip} (exit {exit_status}): {error}")
+            return {"success": False, "error": error or f"exit status {exit_status}", "message": "Failed to execute federated learning code"}
+
+        remote_path = status.get('path') or remote_work_dir
+        return {
+            "success": True,
+            "output": output,
+            "remote_path": remote_path,
+            "message": f"Federated learning code deployed and started in {remote_path}",
+            "pid": status.get('pid'),
+            "process_running": status.get('running', False),
+            "process": status.get('process'),
+            "files": status.get('files', []),
+            "uploaded_blobs": uploaded,
+            "cached_blobs": len(blobs) - uploaded,
+            "deploy_mode": "archive",
+        }
+
+    @staticmethod
+    def _content_manifest(additional_files: Dict[str, BlobData] | None) -> Tuple[Manifest, Blobs]:
+        """배포할 파일들을 sha256으로 주소화 (같은 내용은 blob 하나로 합쳐짐)
+
+        파일 내용은 문자열, bytes, 또는 업로드로 받은 SpooledFile (해시는 스풀할 때 계산해 둔 값 사용)
+        """
+        manifest: Manifest = []
+        blobs: Blobs = {}
+        for rel_path, content in (additional_files or {}).items():
+            rel_path = rel_path.lstrip("/")
+            if ".." in rel_path or not rel_path or "\n" in rel_path:
+                continue
+            if isinstance(content, SpooledFile):
+                data, sha = content, content.sha256
             else:
-                check_target = entry_point or "python3"
-            check_cmd = f"ps aux | grep {check_target} | grep -v grep"
-            _, out2, _ = client.exec_command(check_cmd)
-            process_check = out2.read().decode("utf-8")
+                data = content.encode("utf-8") if isinstance(content, str) else bytes(content)
+                sha = hashlib.sha256(data).hexdigest()
+            # 저장소의 blob은 읽기 전용으로 두어 작업 중 파일 수정이 캐시를 오염시키지 않도록 함
+            mode = 0o555 if rel_path.endswith(".sh") or (sha in blobs and blobs[sha][1] == 0o555) else 0o444
+            manifest.append((sha, rel_path))
+            blobs[sha] = (data, mode)
+        return manifest, blobs
 
-            client.close()
+    @staticmethod
+    def _blob_bytes(blobs: Blobs) -> int:
+        return sum(len(data) for data, _ in blobs.values())
 
-            if error and "nohup" not in error:
-                logger.error(f"Error executing FL code on {floating_ip}: {error}")
-                return {"success": False, "error": error, "message": "Failed to execute federated learning code"}
+    @staticmethod
+    def _write_workspace_archive(fileobj, blobs: Blobs, manifest: Manifest, env_config: dict) -> int:
+        """전송할 blob, 링크 목록(manifest), .env를 tar.gz로 묶어 fileobj에 스트리밍으로 쓰고 쓴 바이트 수를 반환
 
-            return {
-                "success": True,
-                "output": output,
-                "remote_path": remote_work_dir,
-                "message": f"Federated learning code deployed and started in {remote_work_dir}",
-                "process_check": process_check.strip() if process_check else "Process check unavailable",
-            }
+        blob은 조각 단위로 읽어 압축하므로 스풀된 큰 파일도 메모리에 올리지 않는다.
+        """
+        out = _CountingWriter(fileobj)
+        now = time.time()
+
+        def add(name: str, source: IO[bytes], size: int, mode: int = 0o644) -> None:
+            info = tarfile.TarInfo(name)
+            info.size = size
+            info.mode = mode
+            info.mtime = now
+            tar.addfile(info, source)
+
+        with gzip.GzipFile(fileobj=out, mode="wb", compresslevel=6, mtime=now) as gz:
+            with tarfile.open(fileobj=gz, mode="w|", bufsize=_STREAM_CHUNK) as tar:
+                for sha, (data, mode) in blobs.items():
+                    with _open_blob(data) as source:
+                        add(f"blobs/{sha}", source, len(data), mode)
+                listing = "".join(f"{sha} {rel_path}\n" for sha, rel_path in manifest).encode("utf-8")
+                add("manifest", io.BytesIO(listing), len(listing))
+                env = "\n".join(f"{k}={v}" for k, v in (env_config or {}).items()).encode("utf-8")
+                add(".env", io.BytesIO(env), len(env))
+        return out.written
+
+    @staticmethod
+    def _link_blobs_script(remote_work_dir: str, manifest_path: str) -> List[str]:
+        """manifest("sha 경로" 줄)에 따라 저장소 blob을 작업 공간에 하드링크하는 셸 스크립트 줄
+
+        저장소에 없는 blob이 있으면 __FL_MISSING__로 보고하고 _MISSING_BLOBS_EXIT로 종료한다.
+        """
+        cache_dir = Config.FL_BLOB_CACHE_DIR
+        target = f'{remote_work_dir}/$rel'
+        return [
+            'MISSING=""',
+            'while read -r sha rel; do',
+            '  [ -n "$sha" ] || continue',
+            f'  if [ -f "{cache_dir}/$sha" ]; then',
+            f'    mkdir -p "$(dirname "{target}")"',
+            f'    ln -f "{cache_dir}/$sha" "{target}" 2>/dev/null || cp -f "{cache_dir}/$sha" "{target}"',
+            '  else',
+            '    MISSING="$MISSING $sha"',
+            '  fi',
+            f'done < {manifest_path}',
+            f'if [ -n "$MISSING" ]; then echo "__FL_MISSING__=$MISSING"; exit {_MISSING_BLOBS_EXIT}; fi',
+        ]
+
+    @staticmethod
+    def _prune_blobs_command() -> str:
+        """어떤 작업 공간에서도 참조하지 않는(링크 수 1) 오래된 blob과 중단된 배포가 남긴 스테이징 디렉터리 정리"""
+        cache_dir = Config.FL_BLOB_CACHE_DIR
+        return (
+            f"find {cache_dir} -maxdepth 1 -type f -links 1 "
+            f"-mtime +{Config.FL_BLOB_CACHE_MAX_AGE_DAYS} -delete 2>/dev/null || true; "
+            f"find {cache_dir} -mindepth 1 -maxdepth 1 -type d -name '.incoming.*' -mmin +60 "
+            f"-exec rm -rf {{}} + 2>/dev/null || true"
+        )
+
+    def _upload_blobs_sftp(
+        self,
+        client: paramiko.SSHClient,
+        sftp: paramiko.SFTPClient,
+        floating_ip: str,
+        remote_work_dir: str,
+        manifest: Manifest,
+        blobs: Blobs,
+    ) -> None:
+        """SFTP 모드: 저장소에 없는 blob만 업로드한 뒤 한 번의 명령으로 작업 공간에 링크"""
+        cache_dir = Config.FL_BLOB_CACHE_DIR
+        # 작업 공간 디렉터리는 아직 없을 수 있으므로 manifest는 저장소 디렉터리에 둔다 (링크 스크립트가 작업 공간을 만듦)
+        manifest_path = f"{cache_dir}/.manifest-{posixpath.basename(remote_work_dir)}"
+        try:
+            sftp.mkdir(cache_dir)
+        except IOError:
+            pass  # 이미 존재
+
+        known = self._known_blobs(floating_ip)
+        pending = [sha for sha in blobs if sha not in known]
+        for attempt in range(2):
+            for sha in pending:
+                data, mode = blobs[sha]
+                tmp_path = f"{cache_dir}/.{sha}.part"
+                with _open_blob(data) as source:
+                    sftp.putfo(source, tmp_path, file_size=len(data))
+                sftp.chmod(tmp_path, mode)
+                sftp.posix_rename(tmp_path, f"{cache_dir}/{sha}")
+
+            with sftp.open(manifest_path, "w") as f:
+                f.write("".join(f"{sha} {rel_path}\n" for sha, rel_path in manifest))
+            script = "\n".join(self._link_blobs_script(remote_work_dir, manifest_path) + [f"rm -f {manifest_path}"])
+            _, stdout, stderr = client.exec_command(script)
+            output = stdout.read().decode("utf-8", errors="replace")
+            exit_status = stdout.channel.recv_exit_status()
+            if exit_status == 0:
+                break
+            missing = self._parse_missing_blobs(output)
+            if exit_status != _MISSING_BLOBS_EXIT or not missing or attempt == 1:
+                raise IOError(f"Failed to link workspace files: {stderr.read().decode('utf-8', errors='replace')}")
+            logger.warning(f"{len(missing)} cached blobs missing on {floating_ip}, re-uploading")
+            self._forget_blobs(floating_ip, missing)
+            pending = missing
+
+        logger.info(f"Uploaded {len(pending)} new / {len(blobs) - len(pending)} cached blobs to {floating_ip}")
+        self._remember_blobs(floating_ip, blobs.keys())
+
+    def _blob_host_key(self, floating_ip: str) -> str:
+        return f"{self.ssh_user}@{floating_ip}:{self.ssh_port}"
+
+    def _known_blobs(self, floating_ip: str) -> Set[str]:
+        with _known_blobs_lock:
+            return set(_known_blobs.get(self._blob_host_key(floating_ip), ()))
+
+    def _remember_blobs(self, floating_ip: str, shas) -> None:
+        with _known_blobs_lock:
+            _known_blobs.setdefault(self._blob_host_key(floating_ip), set()).update(shas)
+
+    def _forget_blobs(self, floating_ip: str, shas) -> None:
+        with _known_blobs_lock:
+            _known_blobs.get(self._blob_host_key(floating_ip), set()).difference_update(shas)
+
+    @staticmethod
+    def _parse_missing_blobs(output: str) -> List[str]:
+        for line in output.splitlines():
+            if line.startswith("__FL_MISSING__="):
+                return list(dict.fromkeys(line.split("=", 1)[1].split()))
+        return []
+
+    @staticmethod
+    def _parse_launch_status(output: str) -> Dict:
+        """원격 실행 스크립트가 출력한 __FL_*__ 표식을 구조화된 상태로 변환"""
+        status: Dict = {}
+        files: List[str] = []
+        for line in output.splitlines():
+            if line.startswith("__FL_PATH__="):
+                status['path'] = line.split("=", 1)[1]
+            elif line.startswith("__FL_FILE__="):
+                files.append(line.split("=", 1)[1])
+        process = SSHService._parse_process_status(output)
+        status.update(pid=process.get('pid'), running=process['state'] == 'running', process=process, files=files)
+        return status
+
+    @staticmethod
+    def _launch_command(task_id: str, command: str) -> str:
+        """작업 디렉토리에서 command를 백그라운드로 실행하는 셸 명령 (nohup만 백그라운드로 보내 호출한 셸의 출력을 붙잡지 않음)
+
+        nohup만으로는 종료 코드를 알 수 없으므로 래퍼 셸이 command를 자식으로 실행하고 기다리며
+        .fl-proc에 pid, 시작 시각(초와 /proc 클럭 틱), 종료 시각과 종료 코드를 기록한다.
+        자식은 setsid로 새 세션을 만들어 command가 띄운 하위 프로세스까지 세션 ID(= pid)로 묶인다.
+        """
+        wrapper = "; ".join([
+            f"P={_PROC_DIR}",
+            'date +%s > "$P/started_at"',
+            'S=; if command -v setsid > /dev/null; then S=setsid; fi',
+            '$S sh -c "$1" & C=$!',
+            f'{_START_TICKS % "$C"} > "$P/start_ticks"',
+            'echo $C > "$P/pid.tmp" && mv -f "$P/pid.tmp" "$P/pid"',
+            'wait $C; RC=$?',
+            'date +%s > "$P/ended_at"',
+            'echo $RC > "$P/exit_code.tmp" && mv -f "$P/exit_code.tmp" "$P/exit_code"',
+        ])
+        return (
+            f"mkdir -p {_PROC_DIR} && rm -f {_PROC_DIR}/* && "
+            f"{{ nohup sh -c {shlex.quote(wrapper)} fl-run {shlex.quote(command)} > {task_id}.log 2>&1 < /dev/null & }}"
+        )
+
+    def _process_status_script(self, task_id: str, work_dir: Optional[str] = None) -> str:
+        """실행 기록으로 작업 상태를 판단해 __FL_STATUS__=<JSON> 한 줄을 출력하는 원격 스크립트
 
+        state: running / succeeded / failed (종료 코드 != 0) / lost (종료 기록 없이 사라짐) /
+        starting (pid 기록 전) / unknown (실행 기록이 없는 이전 방식 배포) / not_found (작업 공간 없음)
+        ps 전체 목록을 훑지 않고 기록된 pid의 세션만 조회한다.
+        """
+        return "\n".join([
+            f'D={shlex.quote(work_dir)}' if work_dir else self._workspace_dir_script(task_id),
+            f'PD="$D/{_PROC_DIR}"; ST=not_found; PID=null; RC=null; T0=null; T1=null; CPU=null; RSS=null',
+            'if [ -n "$D" ]; then',
+            '  ST=unknown; if [ -d "$PD" ]; then ST=starting; fi',
+            '  if [ -s "$PD/pid" ]; then',
+            '    PID=$(cat "$PD/pid"); T0=$(cat "$PD/started_at" 2>/dev/null); T0=${T0:-null}',
+            '    if [ -s "$PD/exit_code" ]; then',
+            '      RC=$(cat "$PD/exit_code"); T1=$(cat "$PD/ended_at" 2>/dev/null); T1=${T1:-null}',
+            '      if [ "$RC" = 0 ]; then ST=succeeded; else ST=failed; fi',
+            f'    elif kill -0 "$PID" 2>/dev/null && [ "$({_START_TICKS % "$PID"})" = "$(cat "$PD/start_ticks" 2>/dev/null)" ]; then',
+            '      ST=running',
+            # 세션의 모든 프로세스 합계 (세션을 못 만든 경우 pid 하나)
+            '      set -- $({ ps -o pcpu= -o rss= --sid "$PID" 2>/dev/null || ps -o pcpu= -o rss= -p "$PID"; }'
+            ' | awk \'{c += $1; r += $2} END {if (NR) print c, r}\'); CPU=${1:-null}; RSS=${2:-null}',
+            '    else',
+            '      ST=lost',
+            '    fi',
+            '  fi',
+            'fi',
+            'printf \'__FL_STATUS__={"state":"%s","pid":%s,"exit_code":%s,"started_at":%s,"ended_at":%s,'
+            '"cpu_percent":%s,"rss_kb":%s,"now":%s}\\n\' "$ST" "$PID" "$RC" "$T0" "$T1" "$CPU" "$RSS" "$(date +%s)"',
+        ])
+
+    @staticmethod
+    def _parse_process_status(output: str) -> Dict:
+        """__FL_STATUS__ 표식을 {'state', 'pid', 'exit_code', 'started_at', 'ended_at', 'elapsed_seconds', 'cpu_percent', 'rss_kb'}로 변환"""
+        for line in output.splitlines():
+            if not line.startswith("__FL_STATUS__="):
+                continue
+            try:
+                status = json.loads(line.split("=", 1)[1])
+            except ValueError:
+                break
+            now = status.pop('now', None)
+            started, ended = status.get('started_at'), status.get('ended_at')
+            status['elapsed_seconds'] = (ended or now) - started if started and (ended or now) else None
+            for key in ('started_at', 'ended_at'):
+                if status.get(key):
+                    status[key] = datetime.fromtimestamp(status[key]).isoformat()
+            return status
+        return {'state': 'unknown', 'pid': None, 'exit_code': None, 'started_at': None, 'ended_at': None,
+                'elapsed_seconds': None, 'cpu_percent': None, 'rss_kb': None}
+
+    def sync_wheelhouse(self, floating_ip: str, local_dir: str) -> Dict:
+        """서버의 wheelhouse 디렉토리를 VM의 FL_REMOTE_WHEELHOUSE_DIR로 동기화
+
+        이름과 크기가 같은 파일은 건너뛰므로 두 번째부터는 목록 조회 한 번으로 끝난다.
+        """
+        local_dir = os.path.expanduser(local_dir or '')
+        if not local_dir or not os.path.isdir(local_dir):
+            return {'success': False, 'error': f'Wheelhouse directory not found: {local_dir or "(not configured)"}'}
+
+        wheels = [
+            name for name in sorted(os.listdir(local_dir))
+            if name.endswith(('.whl', '.tar.gz', '.zip')) and os.path.isfile(os.path.join(local_dir, name))
+        ]
+        remote_dir = Config.FL_REMOTE_WHEELHOUSE_DIR
+
+        def sync(client: paramiko.SSHClient) -> Dict:
+            sftp = client.open_sftp()
+            try:
+                try:
+                    remote = {attr.filename: attr.st_size for attr in sftp.listdir_attr(remote_dir)}
+                except IOError:
+                    sftp.mkdir(remote_dir)
+                    remote = {}
+                uploaded = []
+                for name in wheels:
+                    local_path = os.path.join(local_dir, name)
+                    if remote.get(name) == os.path.getsize(local_path):
+                        continue
+                    tmp_path = f"{remote_dir}/.{name}.part"
+                    sftp.put(local_path, tmp_path)
+                    sftp.posix_rename(tmp_path, f"{remote_dir}/{name}")
+                    uploaded.append(name)
+                return {'success': True, 'uploaded': uploaded, 'skipped': len(wheels) - len(uploaded)}
+            finally:
+                sftp.close()
+
+        try:
+            with ssh_timer(floating_ip, 'sftp'):
+                result = self._run(floating_ip, sync, idempotent=True)
+            logger.info(f"Wheelhouse synced to {floating_ip}: {len(result['uploaded'])} uploaded, {result['skipped']} up to date")
+            return result
         except Exception as e:
-            logger.error(f"Failed to deploy FL code to {floating_ip}: {str(e)}")
-            return {"success": False, "error": str(e), "message": "Failed to deploy and execute federated learning code"}
+            logger.error(f"Failed to sync wheelhouse to {floating_ip}: {str(e)}")
+            return {'success': False, 'error': str(e)}
 
-    def get_logs(self, floating_ip: str, task_id: str) -> Dict:
-        """SSH를 통해 원격 로그 파일 조회"""
+    def collect_artifacts(self, floating_ip: str, task_id: str, dest_path: str) -> Dict:
+        """원격 작업 공간(fl-workspace/<task_id>)을 VM에서 tar.gz로 묶어 dest_path로 내려받음
+
+        전송은 SFTP 청크 읽기를 여러 개씩 파이프라이닝하고, 끊기면 받은 만큼(dest_path.<sha>.part)부터
+        이어 받는다. 원격 아카이브는 작업 공간이 바뀌지 않는 한 재사용되므로 다시 호출해도 이어 받기가 된다.
+        """
         try:
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            client.connect(
-                hostname=floating_ip,
-                port=self.ssh_port,
-                username=self.ssh_user,
-                key_filename=os.path.expanduser(self.ssh_key_path),
-                timeout=10
-            )
-            
-            # 홈 디렉토리 경로 얻기
-            stdin, stdout, stderr = client.exec_command("echo $HOME")
-            home_dir = stdout.read().decode("utf-8").strip()
-            
-            # 로그 파일 읽기 (여러 경로에서 시도)
-            possible_paths = [
-                f'./fl-workspace/{task_id}/{task_id}.log',
-                f'/var/tmp/fl-workspace/{task_id}/{task_id}.log',
-                f'/home/ubuntu/fl-workspace/{task_id}/{task_id}.log'
-            ]
-            
-            log_content = ""
-            error = ""
-            log_found = False
-            
-            for log_path in possible_paths:
-                stdin, stdout, stderr = client.exec_command(f'cat {log_path}')
-                temp_content = stdout.read().decode('utf-8')
-                temp_error = stderr.read().decode('utf-8')
-                
-                if temp_content and not temp_error:
-                    log_content = temp_content
-                    log_found = True
-                    logger.info(f"Found log at: {log_path}")
-                    break
-                elif not temp_error or "No such file" not in temp_error:
-                    error = temp_error
-            
-            if not log_found:
-                error = f"Log file not found in any of the expected locations: {possible_paths}"
-            
-            # 프로세스 상태 확인
-            stdin, stdout, stderr = client.exec_command(f'ps aux | grep {task_id} | grep -v grep')
-            process_status = stdout.read().decode('utf-8')
-            
-            client.close()
-            
+            with ssh_timer(floating_ip, 'exec'):
+                info = self._run(
+                    floating_ip, lambda client: self._pack_artifacts(client, task_id),
+                    timeout=Config.FL_ARTIFACT_PACK_TIMEOUT, idempotent=True,
+                )
+            if info is None:
+                return {'success': False, 'missing': True, 'error': f'Workspace for task {task_id} not found'}
+
+            cached = self._artifact_up_to_date(dest_path, info['sha256'])
+            resumed_from = 0
+            if not cached:
+                retries = max(1, Config.FL_ARTIFACT_RETRIES)
+                for attempt in range(retries):
+                    try:
+                        with ssh_timer(floating_ip, 'sftp'):
+                            resumed_from = self._run(
+                                floating_ip, lambda client: self._download_artifact(client, info, dest_path),
+                                idempotent=True,
+                            )
+                        break
+                    except (paramiko.SSHException, EOFError, OSError) as e:
+                        if attempt + 1 == retries:
+                            raise
+                        logger.warning(f"Artifact transfer from {floating_ip} interrupted ({str(e)}), resuming")
+
+            logger.info(f"Collected artifacts of {task_id} from {floating_ip}: {info['size']} bytes"
+                        f"{' (cached)' if cached else f' (resumed from {resumed_from})' if resumed_from else ''}")
             return {
                 'success': True,
-                'log_content': log_content,
-                'process_running': bool(process_status.strip()),
-                'process_info': process_status.strip(),
-                'error': error if error else None
+                'path': dest_path,
+                'bytes': info['size'],
+                'sha256': info['sha256'],
+                'cached': cached,
+                'resumed_from': resumed_from,
             }
-            
+        except Exception as e:
+            logger.error(f"Failed to collect artifacts from {floating_ip}: {str(e)}")
+            return {'success': False, 'error': str(e)}
+
+    def _pack_artifacts(self, client: paramiko.SSHClient, task_id: str) -> Optional[Dict]:
+        """원격에서 작업 공간을 압축하고 {'path', 'size', 'sha256'} 반환 (작업 공간이 없으면 None)"""
+        _, stdout, stderr = client.exec_command(self._pack_artifacts_script(task_id))
+        output = stdout.read().decode('utf-8', errors='replace')
+        exit_status = stdout.channel.recv_exit_status()
+        for line in output.splitlines():
+            if line == '__FL_ARTIFACT_MISSING__':
+                return None
+            if line.startswith('__FL_ARTIFACT__='):
+                size, sha256, path = line.split('=', 1)[1].split(' ', 2)
+                return {'path': path, 'size': int(size), 'sha256': sha256}
+        raise IOError(f"Failed to pack artifacts (exit {exit_status}): {stderr.read().decode('utf-8', errors='replace').strip()}")
+
+    def _pack_artifacts_script(self, task_id: str) -> str:
+        """작업 공간을 ~/fl-workspace/.artifacts/<task_id>.tar.gz로 묶고 크기/해시/경로를 표식으로 출력
+
+        작업 공간에 아카이브보다 새 파일이 없으면 다시 압축하지 않는다 (이어 받기 중 내용이 바뀌지 않도록).
+        .env(실행 설정)와 venv는 제외한다.
+        """
+        archive = shlex.quote(f'fl-workspace/.artifacts/{task_id}.tar.gz')
+        max_age = Config.FL_BLOB_CACHE_MAX_AGE_DAYS
+        return "\n".join([
+            self._workspace_dir_script(task_id),
+            'if [ -z "$D" ]; then echo __FL_ARTIFACT_MISSING__; exit 0; fi',
+            'mkdir -p fl-workspace/.artifacts || exit 1',
+            f'find fl-workspace/.artifacts -type f -mtime +{max_age} -delete 2>/dev/null',
+            f'A={archive}',
+            'if [ ! -f "$A" ] || [ -n "$(find "$D" -newer "$A" -print -quit)" ]; then',
+            '  T="$A.$$.tmp"',
+            f'  tar -C "$D" --exclude=./.env --exclude=./{_PROC_DIR} --exclude=./.venv --exclude=./venv -cf - . | gzip -{Config.FL_ARTIFACT_GZIP_LEVEL} > "$T"'
+            ' && mv -f "$T" "$A" || { rm -f "$T"; exit 1; }',
+            'fi',
+            'echo "__FL_ARTIFACT__=$(wc -c < "$A" | tr -d " ") $(sha256sum "$A" | cut -d" " -f1) $A"',
+        ])
+
+    @staticmethod
+    def _artifact_up_to_date(dest_path: str, sha256: str) -> bool:
+        """이전에 받은 dest_path가 원격 아카이브와 같은지 (받을 때 기록한 .sha256으로 비교)"""
+        try:
+            with open(f"{dest_path}.sha256") as f:
+                return f.read().strip() == sha256 and os.path.exists(dest_path)
+        except OSError:
+            return False
+
+    @staticmethod
+    def _download_artifact(client: paramiko.SSHClient, info: Dict, dest_path: str) -> int:
+        """원격 아카이브를 dest_path로 내려받고 이어 받기를 시작한 offset 반환
+
+        FL_ARTIFACT_WINDOW_BYTES 만큼의 읽기 요청을 한꺼번에 보내 (SFTPFile.readv) 왕복 지연을 숨기고,
+        받은 조각은 바로 .part 파일에 덧붙인다. 해시가 맞으면 dest_path로 이름을 바꾼다.
+        """
+        size, sha256 = info['size'], info['sha256']
+        part_path = f"{dest_path}.{sha256[:16]}.part"
+        for name in os.listdir(os.path.dirname(dest_path) or '.'):
+            stale = os.path.join(os.path.dirname(dest_path), name)
+            if stale.startswith(f"{dest_path}.") and stale.endswith('.part') and stale != part_path:
+                os.remove(stale)  # 원격 아카이브가 바뀌기 전의 조각
+
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if offset > size:
+            offset = 0
+        hasher = hashlib.sha256()
+        with open(part_path, 'r+b' if offset else 'wb') as out:
+            while out.tell() < offset:
+                data = out.read(min(_STREAM_CHUNK, offset - out.tell()))
+                if not data:
+                    break
+                hasher.update(data)
+            out.truncate(offset)
+
+            request_size = paramiko.SFTPFile.MAX_REQUEST_SIZE
+            window = max(request_size, Config.FL_ARTIFACT_WINDOW_BYTES)
+            sftp = client.open_sftp()
+            try:
+                with sftp.open(info['path'], 'rb') as remote:
+                    position = offset
+                    while position < size:
+                        end = min(size, position + window)
+                        chunks = [(o, min(request_size, end - o)) for o in range(position, end, request_size)]
+                        for (_, length), data in zip(chunks, remote.readv(chunks)):
+                            if len(data) != length:
+                                raise EOFError(f"Short read from {info['path']}")
+                            out.write(data)
+                            hasher.update(data)
+                        out.flush()
+                        position = end
+            finally:
+                sftp.close()
+
+        if hasher.hexdigest() != sha256:
+            os.remove(part_path)
+            raise IOError(f"Checksum mismatch for {info['path']}")
+        os.replace(part_path, dest_path)
+        with open(f"{dest_path}.sha256", 'w') as f:
+            f.write(sha256)
+        return offset
+
+    def get_logs(self, floating_ip: str, task_id: str, offset: int = 0, max_bytes: Optional[int] = None) -> Dict:
+        """SSH를 통해 원격 로그 파일에서 offset 이후 최대 max_bytes만 조회
+
+        반환값의 next_offset을 다음 호출의 offset으로 넘기면 새로 추가된 부분만 받는다.
+        """
+        try:
+            with ssh_timer(floating_ip, 'exec'):
+                return self._run(
+                    floating_ip, lambda client: self._read_logs(client, task_id, offset, max_bytes), idempotent=True
+                )
         except Exception as e:
             logger.error(f"Error getting logs from {floating_ip}: {str(e)}")
             return {
@@ -213,24 +762,250 @@ class SSHService:
                 'error': str(e)
             }
 
+    def get_process_status(self, floating_ip: str, task_id: str) -> Dict:
+        """작업 프로세스 상태 (state, pid, exit_code, 시작/종료 시각, CPU, RSS)를 원격 명령 1회로 조회"""
+        def read_status(client: paramiko.SSHClient) -> Dict:
+            _, stdout, _ = client.exec_command(self._process_status_script(task_id))
+            return self._parse_process_status(stdout.read().decode('utf-8', errors='replace'))
+
+        try:
+            with ssh_timer(floating_ip, 'exec'):
+                return dict(self._run(floating_ip, read_status, idempotent=True), success=True)
+        except Exception as e:
+            logger.error(f"Error getting process status from {floating_ip}: {str(e)}")
+            return {'success': False, 'error': str(e)}
+
+    def read_telemetry(self, floating_ip: str, task_id: str, offset: int = 0, max_bytes: Optional[int] = None) -> Dict:
+        """작업 공간의 telemetry.jsonl에서 offset 이후 최대 max_bytes를 읽어 완전한 줄만 기록으로 변환
+
+        반환값의 next_offset은 마지막 완전한 줄의 끝이라 쓰는 중인 줄은 다음 조회에서 받는다.
+        """
+        max_bytes = max_bytes or Config.FL_TELEMETRY_MAX_PULL_BYTES
+
+        def read(client: paramiko.SSHClient) -> bytes:
+            _, stdout, _ = client.exec_command(self._read_telemetry_script(task_id, offset, max_bytes))
+            return stdout.read()
+
+        try:
+            with ssh_timer(floating_ip, 'exec'):
+                raw = self._run(floating_ip, read, idempotent=True)
+            return self._parse_telemetry_output(raw, offset, max_bytes)
+        except Exception as e:
+            logger.error(f"Error reading telemetry from {floating_ip}: {str(e)}")
+            return {'success': False, 'error': str(e)}
+
+    def _read_telemetry_script(self, task_id: str, offset: int, max_bytes: int) -> str:
+        return "\n".join([
+            self._workspace_dir_script(task_id),
+            f'F="$D/{TELEMETRY_FILE}"',
+            'if [ -z "$D" ] || [ ! -f "$F" ]; then echo __FL_SIZE__=-1; exit 0; fi',
+            'S=$(wc -c < "$F"); O=%d' % offset,
+            'if [ "$O" -gt "$S" ]; then O=0; echo __FL_TRUNCATED__=1; fi',
+            'echo "__FL_SIZE__=$S"',
+            'echo __FL_DATA__',
+            f'tail -c +$((O + 1)) "$F" | head -c {max_bytes}',
+        ])
+
+    @staticmethod
+    def _parse_telemetry_output(raw: bytes, offset: int, max_bytes: int) -> Dict:
+        header, _, data = raw.partition(b'__FL_DATA__\n')
+        size, truncated = -1, False
+        for line in header.decode('utf-8', errors='replace').splitlines():
+            key, _, value = line.partition('=')
+            if key == '__FL_SIZE__':
+                size = int(value)
+            elif key == '__FL_TRUNCATED__':
+                truncated = True
+        if truncated:
+            offset = 0
+
+        end = data.rfind(b'\n') + 1
+        if not end and len(data) >= max_bytes:
+            end = len(data)  # max_bytes보다 긴 한 줄은 건너뜀
+        records, invalid = [], 0
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if isinstance(record, dict):
+                records.append(record)
+            elif line.strip():
+                invalid += 1
+        return {
+            'success': True,
+            'records': records,
+            'invalid': invalid,
+            'offset': offset,
+            'next_offset': offset + end,
+            'size': size if size >= 0 else None,
+            'truncated': truncated,
+        }
+
+    def _read_logs(self, client: paramiko.SSHClient, task_id: str, offset: int = 0, max_bytes: Optional[int] = None) -> Dict:
+        """get_logs의 실제 조회 단계 (풀에서 빌린 연결로 원격 명령 1회)"""
+        stdin, stdout, stderr = client.exec_command(self._read_logs_script(task_id, offset, max_bytes))
+        return self._parse_logs_output(stdout.read(), task_id, offset)
+
+    def _read_logs_script(self, task_id: str, offset: int = 0, max_bytes: Optional[int] = None) -> str:
+        """로그 크기/경로/프로세스 정보를 표식으로 출력한 뒤 offset 이후 최대 max_bytes를 출력하는 원격 스크립트"""
+        max_bytes = max_bytes or Config.FL_LOG_MAX_CHUNK_BYTES
+        return "\n".join([
+            self._log_path_script(task_id),
+            'if [ -z "$F" ]; then echo __FL_SIZE__=-1; O=0; else',
+            '  S=$(wc -c < "$F"); O=%d' % offset,
+            '  if [ "$O" -gt "$S" ]; then O=0; echo __FL_TRUNCATED__=1; fi',
+            '  echo "__FL_SIZE__=$S"; echo "__FL_LOG_PATH__=$F"',
+            'fi',
+            self._process_status_script(task_id),
+            'echo __FL_DATA__',
+            f'if [ -n "$F" ]; then tail -c +$((O + 1)) "$F" | head -c {max_bytes}; fi',
+        ])
+
+    def _parse_logs_output(self, raw: bytes, task_id: str, offset: int) -> Dict:
+        """_read_logs_script의 출력을 get_logs 결과로 변환"""
+        header, _, data = raw.partition(b'__FL_DATA__\n')
+
+        size, log_path, truncated = -1, None, False
+        header = header.decode('utf-8', errors='replace')
+        for line in header.splitlines():
+            key, _, value = line.partition('=')
+            if key == '__FL_SIZE__':
+                size = int(value)
+            elif key == '__FL_LOG_PATH__':
+                log_path = value
+            elif key == '__FL_TRUNCATED__':
+                truncated = True
+
+        if truncated:
+            # 로그 파일이 다시 만들어졌으면 처음부터 읽음
+            offset = 0
+        log_content, next_offset = self._decode_log_chunk(data, offset)
+        process = self._parse_process_status(header)
+        return {
+            'success': True,
+            'log_content': log_content,
+            'log_path': log_path,
+            'offset': offset,
+            'next_offset': next_offset,
+            'size': size if size >= 0 else None,
+            'eof': size < 0 or offset + len(data) >= size,
+            'truncated': truncated,
+            'process_running': process['state'] == 'running',
+            'process': process,
+            'error': None if size >= 0 else f"Log file not found in any of the expected locations: {self._log_paths(task_id)}"
+        }
+
+    def follow_logs(
+        self,
+        floating_ip: str,
+        task_id: str,
+        offset: int = 0,
+        max_bytes: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Optional[Dict]]:
+        """하나의 SSH 채널에서 tail -F로 로그를 따라가며 새로 추가된 부분을 yield
+
+        각 값은 {'log_content', 'offset', 'next_offset'}이고, FL_LOG_HEARTBEAT_SECONDS 동안
+        출력이 없으면 None을 yield 한다. 연결 풀의 자리를 오래 차지하지 않도록 전용 연결을 쓴다.
+        """
+        max_bytes = max_bytes or Config.FL_LOG_MAX_CHUNK_BYTES
+        deadline = time.time() + (timeout or Config.FL_LOG_FOLLOW_TIMEOUT)
+        script = self._follow_logs_script(task_id, offset)
+
+        client = self.pool.connect(
+            floating_ip, port=self.ssh_port, username=self.ssh_user, key_filename=self.ssh_key_path
+        )
+        channel = None
+        try:
+            channel = client.get_transport().open_session()
+            channel.settimeout(Config.FL_LOG_HEARTBEAT_SECONDS)
+            channel.exec_command(script)
+
+            header = b''
+            while b'\n' not in header:
+                chunk = channel.recv(256)
+                if not chunk:
+                    return
+                header += chunk
+            line, _, data = header.partition(b'\n')
+            offset = int(line.decode().partition('=')[2])
+
+            # received: 채널에서 받은 바이트 위치, emitted: 텍스트로 내보낸 바이트 위치
+            received = emitted = offset
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            while time.time() < deadline:
+                if not data:
+                    try:
+                        data = channel.recv(max_bytes)
+                    except socket.timeout:
+                        yield None
+                        continue
+                    if not data:
+                        return
+                text = decoder.decode(data)
+                received += len(data)
+                data = b''
+                if not text:
+                    continue
+                next_offset = received - len(decoder.getstate()[0])
+                yield {'log_content': text, 'offset': emitted, 'next_offset': next_offset}
+                emitted = next_offset
+        finally:
+            if channel is not None:
+                channel.close()
+            client.close()
+
+    def _follow_logs_script(self, task_id: str, offset: int = 0) -> str:
+        """시작 offset을 __FL_OFFSET__ 줄로 알린 뒤 tail -F로 로그를 계속 출력하는 원격 스크립트"""
+        return "\n".join([
+            self._log_path_script(task_id),
+            # 아직 로그가 없으면 기본 위치에 생길 때까지 tail -F가 기다림
+            f'[ -n "$F" ] || F={shlex.quote(self._log_paths(task_id)[0])}',
+            'S=$(wc -c < "$F" 2>/dev/null || echo 0); O=%d' % offset,
+            'if [ "$O" -gt "$S" ]; then O=0; fi',
+            'echo "__FL_OFFSET__=$O"',
+            'exec tail -c +$((O + 1)) -F "$F" 2>/dev/null',
+        ])
+
+    @staticmethod
+    def _log_paths(task_id: str) -> List[str]:
+        """배포 위치별 로그 파일 후보 (홈 디렉토리 기준 경로가 우선)"""
+        return [
+            f'fl-workspace/{task_id}/{task_id}.log',
+            f'/var/tmp/fl-workspace/{task_id}/{task_id}.log',
+            f'/home/ubuntu/fl-workspace/{task_id}/{task_id}.log'
+        ]
+
+    def _workspace_dir_script(self, task_id: str) -> str:
+        """존재하는 첫 번째 작업 공간 디렉토리를 셸 변수 D에 저장 (없으면 빈 값)"""
+        candidates = ' '.join(shlex.quote(posixpath.dirname(p)) for p in self._log_paths(task_id))
+        return f'D=; for d in {candidates}; do if [ -d "$d" ]; then D=$d; break; fi; done'
+
+    def _log_path_script(self, task_id: str) -> str:
+        """존재하는 첫 번째 로그 경로를 셸 변수 F에 저장 (없으면 빈 값)"""
+        candidates = ' '.join(shlex.quote(p) for p in self._log_paths(task_id))
+        return f'F=; for p in {candidates}; do if [ -f "$p" ]; then F=$p; break; fi; done'
+
+    @staticmethod
+    def _decode_log_chunk(data: bytes, offset: int) -> Tuple[str, int]:
+        """잘린 UTF-8 문자는 다음 조회로 넘기고 (텍스트, 다음 offset) 반환"""
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        text = decoder.decode(data)
+        pending = len(decoder.getstate()[0])
+        return text, offset + len(data) - pending
+
     def check_connection(self, floating_ip: str) -> Dict:
         """주어진 IP로 SSH 연결이 가능한지 빠르게 체크"""
         start = time.time()
         try:
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            client.connect(
-                hostname=floating_ip,
-                port=self.ssh_port,
-                username=self.ssh_user,
-                key_filename=os.path.expanduser(self.ssh_key_path),
-                timeout=5
-            )
             # 원격 호스트 확인
-            stdin, stdout, stderr = client.exec_command('whoami && uname -srm')
-            out = stdout.read().decode('utf-8').strip()
-            err = stderr.read().decode('utf-8').strip()
-            client.close()
+            def remote_info(client: paramiko.SSHClient):
+                stdin, stdout, stderr = client.exec_command('whoami && uname -srm')
+                return stdout.read().decode('utf-8').strip(), stderr.read().decode('utf-8').strip()
+
+            with ssh_timer(floating_ip, 'exec'):
+                out, err = self._run(floating_ip, remote_info, timeout=5, idempotent=True)
 
             latency_ms = int((time.time() - start) * 1000)
             return {
@@ -249,3 +1024,105 @@ class SSHService:
                 'error': str(e),
                 'latency_ms': latency_ms
             }
+
+    def collect_fingerprint(self, floating_ip: str) -> Dict:
+        """VM의 하드웨어/소프트웨어 지문(vCPU, 메모리, 디스크 여유, Python, flwr/torch 버전, 가상환경 캐시)을 원격 명령 1회로 수집"""
+        def read(client: paramiko.SSHClient) -> str:
+            _, stdout, _ = client.exec_command(self._fingerprint_script())
+            return stdout.read().decode('utf-8', errors='replace')
+
+        try:
+            with ssh_timer(floating_ip, 'exec'):
+                output = self._run(floating_ip, read, timeout=Config.FL_FINGERPRINT_TIMEOUT, idempotent=True)
+            return dict(self._parse_fingerprint(output), success=True)
+        except Exception as e:
+            logger.error(f"Error collecting fingerprint from {floating_ip}: {str(e)}")
+            return {'success': False, 'error': str(e)}
+
+    @staticmethod
+    def _fingerprint_script() -> str:
+        """key=value 줄로 지문을 출력하는 원격 스크립트
+
+        Python 정보는 인터프리터를 한 번만 띄워 얻고, 가상환경 캐시(.ready가 있는 ~/FL_ENV_DIR/*)의
+        패키지 버전은 Python을 실행하지 않고 site-packages의 *.dist-info 이름에서 읽는다.
+        """
+        packages = 'flwr|torch|torchvision'
+        python_info = (
+            'import importlib.metadata as m, importlib.util as u, sys\n'
+            'print("python=%d.%d.%d" % sys.version_info[:3])\n'
+            'print("py_tag=py%d%d" % sys.version_info[:2])\n'
+            'print("venv=%d" % (u.find_spec("ensurepip") is not None))\n'
+            'print("pip=%d" % (u.find_spec("pip") is not None))\n'
+            'for name in ("flwr", "torch", "torchvision"):\n'
+            '    try:\n'
+            '        print("pkg=%s=%s" % (name, m.version(name)))\n'
+            '    except m.PackageNotFoundError:\n'
+            '        pass\n'
+        )
+        return "\n".join([
+            'echo "user=$(id -un)"',
+            'echo "home=$HOME"',
+            'echo "kernel=$(uname -srm)"',
+            'echo "vcpus=$(nproc 2>/dev/null || getconf _NPROCESSORS_ONLN)"',
+            "awk '/^MemTotal:/ {print \"mem_total_kb=\" $2} /^MemAvailable:/ {print \"mem_available_kb=\" $2}' /proc/meminfo",
+            "df -Pk \"$HOME\" | awk 'NR == 2 {print \"disk_total_kb=\" $2; print \"disk_free_kb=\" $4}'",
+            'echo "gpus=$(nvidia-smi -L 2>/dev/null | grep -c ^GPU)"',
+            'command -v flock > /dev/null && echo flock=1',
+            f'[ -d "$HOME/{Config.FL_REMOTE_WHEELHOUSE_DIR}" ] && echo wheelhouse=1',
+            f'python3 -c {shlex.quote(python_info)} 2>/dev/null',
+            f'for E in "$HOME/{Config.FL_ENV_DIR}"/*/; do',
+            '  [ -f "$E.ready" ] || continue',
+            f"  echo \"env=$(basename \"$E\") $(ls \"$E\"lib/python*/site-packages 2>/dev/null"
+            f" | sed -nE 's/^({packages})-(.+)\\.dist-info$/\\1=\\2/p' | tr '\\n' ' ')\"",
+            'done',
+            'exit 0',
+        ])
+
+    @staticmethod
+    def _parse_fingerprint(output: str) -> Dict:
+        values: Dict[str, str] = {}
+        packages: Dict[str, str] = {}
+        envs = []
+        for line in output.splitlines():
+            key, _, value = line.partition('=')
+            if key == 'pkg':
+                name, _, version = value.partition('=')
+                packages[name] = version
+            elif key == 'env':
+                name, _, pkgs = value.partition(' ')
+                env_key, _, py_tag = name.rpartition('-')
+                envs.append({
+                    'name': name,
+                    'env_key': env_key or name,
+                    'py_tag': py_tag if env_key else None,
+                    'packages': dict(item.split('=', 1) for item in pkgs.split() if '=' in item),
+                })
+            elif key:
+                values[key] = value.strip()
+
+        def number(key: str, scale: int = 1) -> Optional[int]:
+            try:
+                return int(values[key]) // scale
+            except (KeyError, ValueError):
+                return None
+
+        return {
+            'user': values.get('user'),
+            'home': values.get('home'),
+            'kernel': values.get('kernel'),
+            'vcpus': number('vcpus'),
+            'gpus': number('gpus') or 0,
+            'memory_mb': number('mem_total_kb', 1024),
+            'memory_available_mb': number('mem_available_kb', 1024),
+            'disk_total_mb': number('disk_total_kb', 1024),
+            'disk_free_mb': number('disk_free_kb', 1024),
+            'python': values.get('python'),
+            'py_tag': values.get('py_tag'),
+            'venv': values.get('venv') == '1',
+            'pip': values.get('pip') == '1',
+            'flock': values.get('flock') == '1',
+            'wheelhouse': values.get('wheelhouse') == '1',
+            'packages': packages,
+            'envs': envs,
+            'env_cache': bool(envs),
+        }
@@ -0,0 +1,300 @@
+import logging
+import math
+import statistics
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.settings import Config
+from services.ssh_service import SSHService
+
+logger = logging.getLogger(__name__)
+
+# 시계열로 다루는 숫자 필드 (client_app.py의 Telemetry 기록)
+METRIC_FIELDS = ('samples_per_sec', 'train_loss', 'eval_loss', 'eval_accuracy', 'step_time_ms', 'samples', 'step', 'duration_s')
+DEFAULT_METRICS = ('samples_per_sec', 'train_loss', 'eval_accuracy', 'step_time_ms')
+# progress: fit 도중 주기적 기록 / fit, evaluate: 라운드마다 한 번
+EVENTS = ('progress', 'fit', 'evaluate')
+ALIGNMENTS = ('round', 'time')
+
+# 한 번의 pull에서 VM마다 이어 읽는 최대 횟수 (FL_TELEMETRY_MAX_PULL_BYTES씩)
+_MAX_PULL_READS = 16
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def normalize_record(record) -> Optional[Dict]:
+    """클라이언트 기록에서 알려진 필드만 남김 (ts가 없거나 형식이 틀리면 None)"""
+    if not isinstance(record, dict) or not _is_number(record.get('ts')):
+        return None
+    clean = {'ts': float(record['ts']), 'event': record.get('event') if record.get('event') in EVENTS else 'progress'}
+    for name in ('round', 'partition_id'):
+        if _is_number(record.get(name)):
+            clean[name] = int(record[name])
+    if isinstance(record.get('node'), str):
+        clean['node'] = record['node'][:255]
+    for name in METRIC_FIELDS:
+        if _is_number(record.get(name)):
+            clean[name] = float(record[name])
+    return clean
+
+
+def _merge(records: List[Dict]) -> Dict:
+    """같은 종류의 기록 여러 개를 하나로 (지표는 count 가중 평균, 나머지 필드는 마지막 값)"""
+    merged = dict(records[-1])
+    weights = [record.get('count', 1) for record in records]
+    merged['count'] = sum(weights)
+    for name in METRIC_FIELDS:
+        pairs = [(record[name], weight) for record, weight in zip(records, weights) if name in record]
+        if pairs:
+            merged[name] = sum(value * weight for value, weight in pairs) / sum(weight for _, weight in pairs)
+    return merged
+
+
+class _SeriesBuffer:
+    """참가자 한 명의 기록 (capacity를 넘으면 오래된 절반을 종류별로 두 개씩 합쳐 해상도를 낮춤)
+
+    최근 기록은 원래 해상도로, 오래된 기록은 점점 성기게 남아 학습 전체 구간을 고정된 메모리로 보관한다.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(4, capacity)
+        self.points: List[Dict] = []
+
+    def extend(self, records: Iterable[Dict]) -> None:
+        for record in records:
+            self.points.append(record)
+            if len(self.points) > self.capacity:
+                self._compact()
+
+    def _compact(self) -> None:
+        half = len(self.points) // 2
+        groups: Dict[str, List[Dict]] = {}
+        for record in self.points[:half]:
+            groups.setdefault(record['event'], []).append(record)
+        merged = [_merge(group[i:i + 2]) for group in groups.values() for i in range(0, len(group), 2)]
+        merged.sort(key=lambda record: record['ts'])
+        self.points = merged + self.points[half:]
+
+
+class TelemetryStore:
+    """작업별 학습 텔레메트리 (메모리, 참가자별 _SeriesBuffer)
+
+    - 클라이언트가 직접 보내는 기록(push)과 SSH로 telemetry.jsonl을 이어 읽은 기록(pull)을 같은 버퍼에 쌓음
+    - pull 참가자는 VM ID, push 참가자는 클라이언트가 보낸 이름(기본 partition-<id>)으로 구분
+    - 최근에 쓰이지 않은 작업부터 FL_TELEMETRY_MAX_TASKS개를 넘는 만큼 버림
+    """
+
+    def __init__(
+        self,
+        ssh_service: Optional[SSHService] = None,
+        max_points: int = Config.FL_TELEMETRY_MAX_POINTS,
+        max_tasks: int = Config.FL_TELEMETRY_MAX_TASKS,
+    ):
+        self.ssh_service = ssh_service or SSHService()
+        self.max_points = max_points
+        self.max_tasks = max(1, max_tasks)
+        self._lock = threading.Lock()
+        self._tasks: 'OrderedDict[str, Dict[str, _SeriesBuffer]]' = OrderedDict()
+        # (task_id, vm_id) -> telemetry.jsonl에서 다음에 읽을 위치
+        self._offsets: Dict[Tuple[str, str], int] = {}
+        self._pulling = set()
+
+    def add(self, task_id: str, participant: str, records: Iterable) -> int:
+        """기록을 정리해 participant의 버퍼에 추가하고 받아들인 개수 반환"""
+        clean = [record for record in map(normalize_record, records) if record]
+        if clean:
+            with self._lock:
+                buffers = self._task(task_id)
+                buffers.setdefault(participant, _SeriesBuffer(self.max_points)).extend(clean)
+        return len(clean)
+
+    def pulled_vms(self, task_id: str) -> List[str]:
+        """이 작업에서 SSH로 기록을 가져온 적이 있는 VM ID"""
+        with self._lock:
+            return [vm_id for task, vm_id in self._offsets if task == task_id]
+
+    def pull(self, task_id: str, vms: List[Dict], max_workers: Optional[int] = None) -> Dict:
+        """각 VM의 telemetry.jsonl에서 지난 pull 이후 추가된 기록을 동시에 가져옴"""
+        started = time.time()
+        workers = max(1, min(max_workers or Config.FL_BATCH_MAX_WORKERS, len(vms)))
+        results = []
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fl-telemetry') as executor:
+            futures = {executor.submit(self._pull_vm, task_id, vm): vm for vm in vms}
+            for future in as_completed(futures):
+                vm = futures[future]
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"Telemetry pull from {vm.get('id')} failed: {str(e)}")
+                    results.append({'vm_id': vm.get('id'), 'success': False, 'error': str(e)})
+        return {
+            'task_id': task_id,
+            'added': sum(result.get('added', 0) for result in results),
+            'participants': results,
+            'elapsed_ms': int((time.time() - started) * 1000),
+        }
+
+    def _pull_vm(self, task_id: str, vm: Dict) -> Dict:
+        key = (task_id, vm['id'])
+        with self._lock:
+            if key in self._pulling:
+                return {'vm_id': vm['id'], 'success': True, 'added': 0, 'skipped': 'pull already in progress'}
+            self._pulling.add(key)
+            offset = self._offsets.get(key, 0)
+        try:
+            added, invalid, result, error = 0, 0, {}, None
+            for _ in range(_MAX_PULL_READS):
+                result = self.ssh_service.read_telemetry(vm['floating_ip'], task_id, offset)
+                if not result['success']:
+                    error = result['error']
+                    break
+                added += self.add(task_id, vm['id'], result['records'])
+                invalid += result['invalid']
+                progressed = result['next_offset'] != offset
+                offset = result['next_offset']
+                if not progressed or result['size'] is None or offset >= result['size']:
+                    break
+            # 실패해도 이미 버퍼에 넣은 기록까지는 위치를 기억해 다음 pull에서 중복되지 않게 함
+            with self._lock:
+                self._offsets[key] = offset
+            if error is not None:
+                return {'vm_id': vm['id'], 'success': False, 'added': added, 'error': error}
+            return {
+                'vm_id': vm['id'],
+                'success': True,
+                'added': added,
+                'invalid': invalid,
+                'next_offset': offset,
+                'pending_bytes': max(0, (result.get('size') or 0) - offset),
+                'found': result.get('size') is not None,
+            }
+        finally:
+            with self._lock:
+                self._pulling.discard(key)
+
+    def query(
+        self,
+        task_id: str,
+        metrics: Optional[List[str]] = None,
+        align: str = 'round',
+        step: Optional[float] = None,
+        since: Optional[float] = None,
+        max_points: Optional[int] = None,
+        participants: Optional[List[str]] = None,
+    ) -> Optional[Dict]:
+        """참가자별 지표를 같은 x축(라운드 또는 시각 구간)에 맞춘 시계열 (작업 기록이 없으면 None)
+
+        x축 구간이 max_points개를 넘지 않도록 구간 폭(step)을 넓혀 구간 안의 값을 평균한다.
+        align='round'는 라운드별 fit/evaluate 기록만, 'time'은 fit 도중 progress 기록까지 사용한다.
+        """
+        if align not in ALIGNMENTS:
+            raise ValueError(f"align must be one of {', '.join(ALIGNMENTS)}, got {align!r}")
+        metrics = list(metrics or DEFAULT_METRICS)
+        unknown = [name for name in metrics if name not in METRIC_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown metrics: {', '.join(unknown)} (available: {', '.join(METRIC_FIELDS)})")
+        max_points = max(1, max_points or Config.FL_TELEMETRY_QUERY_POINTS)
+
+        with self._lock:
+            buffers = self._tasks.get(task_id)
+            if buffers is None:
+                return None
+            snapshot = {
+                name: list(buffer.points) for name, buffer in buffers.items()
+                if not participants or name in participants
+            }
+
+        points: Dict[str, List[Tuple[float, Dict]]] = {}
+        for name, records in snapshot.items():
+            if since is not None:
+                records = [record for record in records if record['ts'] >= since]
+            if align == 'round':
+                points[name] = [(record['round'], record) for record in records
+                                if record['event'] != 'progress' and 'round' in record]
+            else:
+                points[name] = [(record['ts'], record) for record in records]
+
+        xs = [x for series in points.values() for x, _ in series]
+        lo, hi = (min(xs), max(xs)) if xs else (0, 0)
+        if align == 'round':
+            width = max(int(step or 1), math.ceil((hi - lo + 1) / max_points))
+        else:
+            width = max(float(step or 0), (hi - lo) / max_points if hi > lo else 0, 0.001)
+
+        # 참가자 -> 지표 -> 구간 번호 -> [합, 개수]
+        sums: Dict[str, Dict[str, Dict[int, List[float]]]] = {}
+        buckets = set()
+        for name, series in points.items():
+            sums[name] = {metric: {} for metric in metrics}
+            for x, record in series:
+                bucket = int((x - lo) // width)
+                buckets.add(bucket)
+                for metric in metrics:
+                    if metric in record:
+                        total = sums[name][metric].setdefault(bucket, [0.0, 0])
+                        total[0] += record[metric]
+                        total[1] += 1
+        order = sorted(buckets)
+
+        latest = {name: self._latest(records, metrics) for name, records in snapshot.items() if records}
+        return {
+            'task_id': task_id,
+            'align': align,
+            'step': width,
+            'x': [lo + bucket * width for bucket in order],
+            'series': {
+                name: {
+                    metric: [
+                        round(by_bucket[bucket][0] / by_bucket[bucket][1], 6) if bucket in by_bucket else None
+                        for bucket in order
+                    ]
+                    for metric, by_bucket in by_metric.items()
+                }
+                for name, by_metric in sums.items()
+            },
+            'latest': latest,
+            'slow': self._slow(latest),
+        }
+
+    @staticmethod
+    def _latest(records: List[Dict], metrics: List[str]) -> Dict:
+        """참가자의 가장 최근 기록 시각/라운드와 지표별 마지막 값"""
+        last = records[-1]
+        latest = {
+            'ts': last['ts'],
+            'age_seconds': round(time.time() - last['ts'], 3),
+            'round': max((record.get('round', 0) for record in records), default=0),
+            'event': last['event'],
+        }
+        for metric in dict.fromkeys(list(metrics) + ['samples_per_sec']):
+            latest[metric] = next((record[metric] for record in reversed(records) if metric in record), None)
+        return latest
+
+    @staticmethod
+    def _slow(latest: Dict[str, Dict]) -> List[str]:
+        """최근 samples_per_sec가 참가자 중앙값의 FL_TELEMETRY_SLOW_RATIO 미만인 참가자"""
+        rates = {name: item['samples_per_sec'] for name, item in latest.items() if item.get('samples_per_sec') is not None}
+        if len(rates) < 2:
+            return []
+        median = statistics.median(rates.values())
+        return sorted(name for name, rate in rates.items() if rate < median * Config.FL_TELEMETRY_SLOW_RATIO)
+
+    def _task(self, task_id: str) -> Dict[str, _SeriesBuffer]:
+        """작업의 버퍼 (없으면 만들고, 오래된 작업은 pull 위치와 함께 버림) — _lock을 잡고 호출"""
+        if task_id in self._tasks:
+            self._tasks.move_to_end(task_id)
+            return self._tasks[task_id]
+        self._tasks[task_id] = {}
+        while len(self._tasks) > self.max_tasks:
+            evicted, _ = self._tasks.popitem(last=False)
+            for key in [key for key in self._offsets if key[0] == evicted]:
+                del self._offsets[key]
+        return self._tasks[task_id]
+
+
+telemetry_store = TelemetryStore()
@@ -0,0 +1,402 @@
+"""FL 작업 공간 스트리밍 업로드 (multipart/form-data 또는 tar(.gz) 본문)
+
+JSON의 files 필드는 문자열만 담을 수 있고 본문 전체가 메모리에 올라간다. 체크포인트나 데이터 조각처럼
+크거나 바이너리인 파일은 이 형식으로 받아, 요청 본문을 조각 단위로 읽으면서 바로 스풀 디렉토리에 쓴다.
+쓰는 동안 sha256을 함께 계산해 두므로 배포 단계(SSHService._content_manifest)는 파일을 다시 읽지 않는다.
+
+  - multipart/form-data: 파일 파트의 filename이 작업 공간 상대 경로 (하위 디렉토리 허용),
+    나머지 필드는 JSON 요청의 같은 이름 필드 (env_config는 JSON 문자열)
+  - application/x-tar, application/gzip 등: 본문이 작업 공간 tar(.gz), 나머지 값은 쿼리 문자열로 전달
+  - Content-Encoding: gzip 이면 본문을 스트리밍으로 풀어서 처리 (JSON 요청도 동일)
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+import time
+import zlib
+from typing import Dict, IO, Mapping, Optional, Tuple
+
+from werkzeug.sansio.multipart import Data, Epilogue, Field, File, MultipartDecoder, NeedData
+from werkzeug.http import parse_options_header
+
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+_CHUNK = 256 * 1024
+# multipart 일반 필드 하나의 최대 크기
+_MAX_FIELD_BYTES = 1024 * 1024
+# gzip 헤더 자동 인식 (zlib.decompressobj의 wbits)
+_GZIP_WBITS = zlib.MAX_WBITS | 16
+# 스풀 디렉토리 접두사 (남아 있는 오래된 디렉토리 정리에 사용)
+UPLOAD_PREFIX = 'fl-upload-'
+_STALE_UPLOAD_SECONDS = 24 * 3600
+
+TAR_MIMETYPES = (
+    'application/x-tar',
+    'application/tar',
+    'application/gzip',
+    'application/x-gzip',
+    'application/x-gtar',
+    'application/x-compressed-tar',
+)
+JSON_FIELDS = ('env_config',)
+
+_swept_lock = threading.Lock()
+_swept_dirs = set()
+
+
+class UploadError(ValueError):
+    """업로드 형식 오류 (HTTP 400)"""
+
+
+class UploadTooLarge(UploadError):
+    """크기 또는 파일 수 제한 초과 (HTTP 413)"""
+
+
+class SpooledFile:
+    """스풀 디렉토리에 저장된 업로드 파일 (받은 files 딕셔너리에서 문자열 대신 쓰임)"""
+
+    def __init__(self, path: str, size: int, sha256: str):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __repr__(self) -> str:
+        return f'SpooledFile({self.path!r}, size={self.size})'
+
+    def open(self) -> IO[bytes]:
+        return open(self.path, 'rb')
+
+    def read_text(self) -> str:
+        with open(self.path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read()
+
+
+def file_text(content) -> str:
+    """받은 파일 내용을 문자열로 (SpooledFile이면 디스크에서 읽음)"""
+    if isinstance(content, SpooledFile):
+        return content.read_text()
+    if isinstance(content, bytes):
+        return content.decode('utf-8', errors='replace')
+    return content or ''
+
+
+class GzipReader(io.RawIOBase):
+    """gzip 스트림을 조각 단위로 풀어 읽는 파일 객체 (여러 멤버로 된 gzip도 처리)"""
+
+    def __init__(self, raw: IO[bytes]):
+        self._raw = raw
+        self._decoder = zlib.decompressobj(_GZIP_WBITS)
+        self._pending = b''
+        self._in_member = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while True:
+            if self._decoder.eof:
+                self._pending = self._decoder.unused_data + self._pending
+                self._decoder = zlib.decompressobj(_GZIP_WBITS)
+                self._in_member = False
+            data = self._pending or self._raw.read(_CHUNK)
+            self._pending = b''
+            if not data:
+                if self._in_member:
+                    raise UploadError('Truncated gzip request body')
+                return 0
+            self._in_member = True
+            try:
+                out = self._decoder.decompress(data, len(buffer))
+            except zlib.error as e:
+                raise UploadError(f'Invalid gzip request body: {str(e)}')
+            self._pending = self._decoder.unconsumed_tail
+            if out:
+                memoryview(buffer)[:len(out)] = out
+                return len(out)
+
+
+def decoded_stream(stream: IO[bytes], content_encoding: Optional[str]) -> IO[bytes]:
+    """Content-Encoding(gzip 또는 identity)을 푼 본문 스트림"""
+    encoding = (content_encoding or 'identity').strip().lower()
+    if encoding in ('', 'identity'):
+        return stream
+    if encoding in ('gzip', 'x-gzip'):
+        return io.BufferedReader(GzipReader(stream), _CHUNK)
+    raise UploadError(f'Unsupported Content-Encoding: {content_encoding}')
+
+
+def mimetype(headers: Mapping) -> str:
+    return parse_options_header(headers.get('Content-Type') or '')[0].lower()
+
+
+def is_upload_request(headers: Mapping) -> bool:
+    """multipart 또는 tar(.gz) 작업 공간 업로드 요청인지"""
+    kind = mimetype(headers)
+    return kind == 'multipart/form-data' or kind in TAR_MIMETYPES
+
+
+def needs_stream(headers: Mapping) -> bool:
+    """본문을 스트리밍으로 읽어야 하는 요청인지 (업로드이거나 압축된 본문)"""
+    encoding = (headers.get('Content-Encoding') or '').strip().lower()
+    return is_upload_request(headers) or encoding not in ('', 'identity')
+
+
+def normalize_path(name: str) -> str:
+    """업로드 파일 이름을 작업 공간 상대 경로로 정규화 (밖을 가리키는 경로는 UploadError)"""
+    parts = []
+    for part in (name or '').replace('\\', '/').split('/'):
+        if part in ('', '.'):
+            continue
+        if part == '..':
+            raise UploadError(f'Invalid file path in upload: {name!r}')
+        parts.append(part)
+    path = '/'.join(parts)
+    if not path or any(c in path for c in '\0\n\r'):
+        raise UploadError(f'Invalid file path in upload: {name!r}')
+    return path
+
+
+class WorkspaceUpload:
+    """스풀 디렉토리에 받은 작업 공간 (root 아래에 상대 경로 그대로 저장)
+
+    작업이 끝나면 cleanup()으로 지운다 (여러 번 호출해도 됨).
+    """
+
+    def __init__(self, spool_dir: Optional[str] = None, prefix: str = UPLOAD_PREFIX,
+                 max_bytes: Optional[int] = None, max_files: Optional[int] = None):
+        spool_dir = spool_dir or Config.FL_UPLOAD_SPOOL_DIR or tempfile.gettempdir()
+        os.makedirs(spool_dir, exist_ok=True)
+        if prefix == UPLOAD_PREFIX:
+            _sweep_stale(spool_dir)
+        self.root = tempfile.mkdtemp(prefix=prefix, dir=spool_dir)
+        self.files: Dict[str, SpooledFile] = {}
+        self.fields: Dict[str, str] = {}
+        self.total_bytes = 0
+        self.max_bytes = max_bytes or Config.FL_UPLOAD_MAX_BYTES
+        self.max_files = max_files or Config.FL_UPLOAD_MAX_FILES
+
+    def __enter__(self) -> 'WorkspaceUpload':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cleanup()
+
+    def cleanup(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def open_file(self, name: str) -> '_SpoolWriter':
+        path = normalize_path(name)
+        if path not in self.files and len(self.files) >= self.max_files:
+            raise UploadTooLarge(f'Upload has more than {self.max_files} files')
+        previous = self.files.pop(path, None)
+        if previous:
+            self.total_bytes -= previous.size
+        return _SpoolWriter(self, path)
+
+    def add_file(self, name: str, source: IO[bytes]) -> SpooledFile:
+        with self.open_file(name) as writer:
+            for chunk in iter(lambda: source.read(_CHUNK), b''):
+                writer.write(chunk)
+        return self.files[writer.rel_path]
+
+    def request_data(self, args: Optional[Mapping] = None) -> Dict:
+        """JSON 요청 본문과 같은 형식의 딕셔너리 (쿼리 문자열 < multipart 필드 순으로 덮어씀)"""
+        data = {key: args.get(key) for key in args or ()}
+        data.update(self.fields)
+        for name in JSON_FIELDS:
+            if isinstance(data.get(name), str):
+                try:
+                    data[name] = json.loads(data[name]) if data[name].strip() else {}
+                except json.JSONDecodeError as e:
+                    raise UploadError(f'{name} must be a JSON object: {str(e)}')
+                if not isinstance(data[name], dict):
+                    raise UploadError(f'{name} must be a JSON object')
+        data['files'] = dict(self.files)
+        return data
+
+
+class _SpoolWriter:
+    """업로드 파일 하나를 쓰면서 크기 제한을 검사하고 sha256을 계산"""
+
+    def __init__(self, upload: WorkspaceUpload, rel_path: str):
+        self.upload = upload
+        self.rel_path = rel_path
+        self.path = os.path.join(upload.root, *rel_path.split('/'))
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.path, 'wb')
+        self._hash = hashlib.sha256()
+        self._size = 0
+
+    def write(self, data: bytes) -> None:
+        self.upload.total_bytes += len(data)
+        if self.upload.total_bytes > self.upload.max_bytes:
+            raise UploadTooLarge(f'Upload exceeds {self.upload.max_bytes} bytes')
+        self._file.write(data)
+        self._hash.update(data)
+        self._size += len(data)
+
+    def close(self, complete: bool = True) -> None:
+        """파일을 닫고, 끝까지 받았으면 upload.files에 등록"""
+        if self._file.closed:
+            return
+        self._file.close()
+        if complete:
+            self.upload.files[self.rel_path] = SpooledFile(self.path, self._size, self._hash.hexdigest())
+
+    def __enter__(self) -> '_SpoolWriter':
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        self.close(complete=exc_type is None)
+
+
+def read_upload(
+    stream: IO[bytes],
+    headers: Mapping,
+    spool_dir: Optional[str] = None,
+    prefix: str = UPLOAD_PREFIX,
+) -> WorkspaceUpload:
+    """multipart 또는 tar(.gz) 요청 본문을 스풀 디렉토리에 받음
+
+    형식이 잘못되면 UploadError, 제한을 넘으면 UploadTooLarge. 실패하면 받던 파일은 지운다.
+    """
+    kind = mimetype(headers)
+    upload = WorkspaceUpload(spool_dir, prefix)
+    content_length = headers.get('Content-Length')
+    try:
+        if content_length and int(content_length) > upload.max_bytes:
+            raise UploadTooLarge(f'Upload exceeds {upload.max_bytes} bytes')
+        body = decoded_stream(stream, headers.get('Content-Encoding'))
+        if kind == 'multipart/form-data':
+            boundary = parse_options_header(headers.get('Content-Type'))[1].get('boundary')
+            if not boundary:
+                raise UploadError('multipart/form-data request without boundary')
+            _read_multipart(body, boundary.encode('latin-1'), upload)
+        elif kind in TAR_MIMETYPES:
+            _read_tar(body, upload)
+        else:
+            raise UploadError(f'Unsupported upload Content-Type: {kind}')
+    except Exception:
+        upload.cleanup()
+        raise
+    logger.info(f"Spooled {len(upload.files)} uploaded files ({upload.total_bytes} bytes) to {upload.root}")
+    return upload
+
+
+def _read_multipart(body: IO[bytes], boundary: bytes, upload: WorkspaceUpload) -> None:
+    decoder = MultipartDecoder(boundary, max_form_memory_size=_MAX_FIELD_BYTES, max_parts=upload.max_files + 64)
+    field_name, field_data, writer = None, [], None
+    try:
+        while True:
+            chunk = body.read(_CHUNK)
+            decoder.receive_data(chunk or None)
+            event = decoder.next_event()
+            while not isinstance(event, (Epilogue, NeedData)):
+                if isinstance(event, File):
+                    writer = upload.open_file(event.filename or event.name)
+                elif isinstance(event, Field):
+                    field_name, field_data = event.name, []
+                elif isinstance(event, Data):
+                    if writer:
+                        writer.write(event.data)
+                        if not event.more_data:
+                            writer.close()
+                            writer = None
+                    else:
+                        field_data.append(event.data)
+                        if sum(len(d) for d in field_data) > _MAX_FIELD_BYTES:
+                            raise UploadTooLarge(f'Form field {field_name} exceeds {_MAX_FIELD_BYTES} bytes')
+                        if not event.more_data:
+                            upload.fields[field_name] = b''.join(field_data).decode('utf-8', errors='replace')
+                event = decoder.next_event()
+            if isinstance(event, Epilogue):
+                return
+            if not chunk:
+                raise UploadError('Truncated multipart request body')
+    except ValueError as e:
+        # werkzeug의 잘못된 multipart 형식 오류도 400으로
+        if isinstance(e, UploadError):
+            raise
+        raise UploadError(f'Invalid multipart request body: {str(e)}')
+    finally:
+        if writer:
+            writer.close(complete=False)
+
+
+def _read_tar(body: IO[bytes], upload: WorkspaceUpload) -> None:
+    try:
+        # 'r|*': 되감지 않는 스트림 모드 (압축 형식은 자동 인식)
+        with tarfile.open(fileobj=body, mode='r|*') as tar:
+            for member in tar:
+                if member.isdir():
+                    continue
+                if not member.isfile():
+                    raise UploadError(f'Unsupported archive member (links and devices are not allowed): {member.name}')
+                source = tar.extractfile(member)
+                upload.add_file(member.name, source)
+    except tarfile.TarError as e:
+        raise UploadError(f'Invalid tar request body: {str(e)}')
+
+
+def read_request(
+    stream: IO[bytes],
+    headers: Mapping,
+    args: Optional[Mapping] = None,
+    spool_dir: Optional[str] = None,
+    prefix: str = UPLOAD_PREFIX,
+) -> Tuple[Optional[Dict], Optional[WorkspaceUpload]]:
+    """FL 요청 본문을 (요청 데이터, 업로드) 로 읽음
+
+    업로드가 아니면 JSON 본문(gzip 압축 가능, 푼 크기는 FL_UPLOAD_MAX_JSON_BYTES까지)을 읽고 업로드는 None.
+    JSON도 업로드도 아니면 (None, None).
+    """
+    if is_upload_request(headers):
+        upload = read_upload(stream, headers, spool_dir, prefix)
+        try:
+            return upload.request_data(args), upload
+        except Exception:
+            upload.cleanup()
+            raise
+    kind = mimetype(headers)
+    if kind != 'application/json' and not (kind.startswith('application/') and kind.endswith('+json')):
+        return None, None
+    # 작은 압축 본문이 메모리에서 매우 크게 풀리지 않도록 푼 크기를 제한
+    limit = Config.FL_UPLOAD_MAX_JSON_BYTES
+    body = decoded_stream(stream, headers.get('Content-Encoding')).read(limit + 1)
+    if len(body) > limit:
+        raise UploadTooLarge(f'JSON body exceeds {limit} bytes')
+    try:
+        data = json.loads(body or b'null')
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise UploadError(f'Invalid JSON body: {str(e)}')
+    if not isinstance(data, dict):
+        raise UploadError('JSON body must be an object')
+    return data, None
+
+
+def _sweep_stale(spool_dir: str) -> None:
+    """중단된 요청이 남긴 오래된 스풀 디렉토리 정리 (디렉토리별로 프로세스당 한 번)"""
+    key = os.path.abspath(spool_dir)
+    with _swept_lock:
+        if key in _swept_dirs:
+            return
+        _swept_dirs.add(key)
+    cutoff = time.time() - _STALE_UPLOAD_SECONDS
+    for name in os.listdir(spool_dir):
+        path = os.path.join(spool_dir, name)
+        try:
+            if name.startswith(UPLOAD_PREFIX) and os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+        except OSError:
+            pass
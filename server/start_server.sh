@@ -26,6 +26,6 @@ if [ ! -f ".env" ]; then
     exit 1
 fi
 
-# 서버 시작
+# 서버 시작 (uvicorn ASGI 서버, 개발용 Flask 서버는 python3 app.py)
 echo "서버를 시작합니다..."
-python3 app.py
+python3 asgi.py
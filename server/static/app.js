@@ -53,6 +53,7 @@
 							}
 						</div>
 					</td>
+					<td class="ssh-status" data-vm="${vm.id}">-</td>
       `;
 			tbody.appendChild(tr);
 		});
@@ -84,6 +85,28 @@
 		renderVMs(data.vms || []);
 	});
 
+	// Fleet-wide SSH check
+	$("#ssh-check-all").addEventListener("click", async (e) => {
+		const btn = e.currentTarget;
+		btn.textContent = "체크 중...";
+		btn.disabled = true;
+		try {
+			const data = await fetchJSON("/api/vms/ssh-check-all");
+			(data.results || []).forEach((r) => {
+				const cell = $$(".ssh-status").find(
+					(td) => td.getAttribute("data-vm") === r.vm_id
+				);
+				if (!cell) return;
+				cell.textContent =
+					r.status === "ok" ? `OK (${r.latency_ms}ms)` : r.status || "-";
+				cell.title = r.error || r.message || "";
+			});
+		} finally {
+			btn.textContent = "전체 SSH 체크";
+			btn.disabled = false;
+		}
+	});
+
 	// Direct IP SSH check
 	const ipBtn = document.querySelector("#ssh-check-ip-btn");
 	if (ipBtn) {
@@ -0,0 +1,99 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+
+class HostCache:
+    """호스트(ip)별 결과 캐시 (SSH 상태 점검, VM 지문 수집이 공유)
+
+    - fetch(ip)는 스레드 풀에서 실행되고, 같은 호스트에 대한 동시 요청은 진행 중인 작업 하나를 공유
+    - 결과는 fetch 쪽에서 store로 저장한 것만 캐시 (실패를 캐시할지는 호출 쪽이 결정)
+    - 캐시 나이는 결과의 timestamp_key(time.time() 값) 기준
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Dict],
+        ttl: float,
+        max_workers: int,
+        timestamp_key: str,
+        thread_name_prefix: str = 'host-cache',
+        label: str = 'Task',
+    ):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.timestamp_key = timestamp_key
+        self.label = label
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix=thread_name_prefix)
+        self._lock = threading.Lock()
+        self._results: Dict[str, Dict] = {}
+        self._inflight: Dict[str, Future] = {}
+
+    def get(self, ip: str, max_age: Optional[float] = None, timeout: Optional[float] = None) -> Dict:
+        """ip의 결과 (max_age초 이내의 캐시가 있으면 그대로, 없으면 fetch 후 반환)"""
+        cached = self.cached(ip, max_age)
+        if cached:
+            return cached
+        return dict(self.submit(ip).result(timeout=timeout), cached=False)
+
+    def get_many(self, ips: List[str], deadline: float, max_age: Optional[float] = None) -> Dict[str, Dict]:
+        """여러 호스트를 동시에 조회하고 deadline초 안에 끝난 결과만 반환
+
+        시간 안에 끝나지 않은 호스트는 status 'pending'으로 표시되며, 작업은 백그라운드에서
+        계속되어 다음 조회 때 캐시로 제공된다.
+        """
+        results: Dict[str, Dict] = {}
+        futures: Dict[str, Future] = {}
+        for ip in dict.fromkeys(ips):
+            cached = self.cached(ip, max_age)
+            if cached:
+                results[ip] = cached
+            else:
+                futures[ip] = self.submit(ip)
+
+        if futures:
+            wait(list(futures.values()), timeout=max(0.0, deadline))
+        for ip, future in futures.items():
+            if future.done():
+                try:
+                    results[ip] = dict(future.result(), cached=False)
+                except Exception as e:
+                    results[ip] = {'success': False, 'status': 'error', 'error': str(e), 'cached': False}
+            else:
+                results[ip] = {'success': False, 'status': 'pending', 'message': f'{self.label} still running after {deadline}s'}
+        return results
+
+    def cached(self, ip: str, max_age: Optional[float] = None) -> Optional[Dict]:
+        """max_age(기본 ttl)초 이내에 저장된 결과"""
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            result = self._results.get(ip)
+        if result is None:
+            return None
+        age = time.time() - result[self.timestamp_key]
+        if age > max_age:
+            return None
+        return dict(result, cached=True, age_seconds=round(age, 3))
+
+    def store(self, ip: str, result: Dict) -> None:
+        with self._lock:
+            self._results[ip] = result
+
+    def invalidate(self, ip: str) -> None:
+        with self._lock:
+            self._results.pop(ip, None)
+
+    def submit(self, ip: str) -> Future:
+        """ip에 대해 진행 중인 fetch (없으면 새로 시작)"""
+        with self._lock:
+            future = self._inflight.get(ip)
+            if future is None:
+                future = self._inflight[ip] = self._executor.submit(self.fetch, ip)
+                future.add_done_callback(lambda f, ip=ip: self._done(ip, f))
+            return future
+
+    def _done(self, ip: str, future: Future) -> None:
+        with self._lock:
+            if self._inflight.get(ip) is future:
+                del self._inflight[ip]
@@ -0,0 +1,169 @@
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from flask import Flask, Response, g, request
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from prometheus_client.core import REGISTRY, GaugeMetricFamily
+
+from utils import tracing
+
+# 원격 작업은 수 초~수 분 단위까지 걸리므로 기본 버킷보다 길게 잡음
+_SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    'participant_http_request_duration_seconds',
+    'HTTP 요청 처리 시간 (스트리밍 응답은 첫 응답까지)',
+    ['method', 'endpoint', 'status'],
+)
+OPENSTACK_LIST_SECONDS = Histogram(
+    'participant_openstack_list_duration_seconds',
+    'OpenStack VM 목록 조회 시간',
+    ['backend'],
+    buckets=_SLOW_BUCKETS,
+)
+OPENSTACK_ERRORS = Counter(
+    'participant_openstack_errors_total',
+    'OpenStack VM 목록 조회 실패 수',
+    ['backend'],
+)
+PROMETHEUS_QUERY_SECONDS = Histogram(
+    'participant_prometheus_query_duration_seconds',
+    '참가자 선택용 Prometheus 쿼리 시간',
+    ['query'],
+)
+SSH_OPERATION_SECONDS = Histogram(
+    'participant_ssh_operation_duration_seconds',
+    '호스트별 SSH 작업 시간 (connect / exec / sftp)',
+    ['host', 'operation'],
+    buckets=_SLOW_BUCKETS,
+)
+SSH_ERRORS = Counter(
+    'participant_ssh_errors_total',
+    '호스트별 SSH 작업 실패 수',
+    ['host', 'operation'],
+)
+DEPLOY_PHASE_SECONDS = Histogram(
+    'participant_deploy_phase_duration_seconds',
+    '원격 배포 단계별 소요 시간',
+    ['phase', 'mode'],
+    buckets=_SLOW_BUCKETS,
+)
+DEPLOYMENTS = Counter(
+    'participant_deployments_total',
+    '원격 배포 결과 수',
+    ['mode', 'result'],
+)
+
+
+@contextmanager
+def ssh_timer(host: str, operation: str) -> Iterator[None]:
+    """with 블록의 실행 시간을 호스트별 SSH 작업 시간으로 기록 (예외가 나면 실패 수도 증가)
+
+    진행 중인 추적이 있으면 'ssh.<operation>' 구간으로도 기록한다.
+    """
+    with tracing.span(f'ssh.{operation}', host=host):
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            SSH_ERRORS.labels(host, operation).inc()
+            raise
+        finally:
+            SSH_OPERATION_SECONDS.labels(host, operation).observe(time.perf_counter() - start)
+
+
+class PhaseRecorder:
+    """배포 단계 콜백(on_phase)을 감싸 단계가 바뀔 때마다 이전 단계의 소요 시간을 기록
+
+    지표와 함께 현재 추적에도 'deploy.<단계>' 구간으로 남긴다.
+    """
+
+    def __init__(self, mode: str, on_phase: Optional[Callable[[str], None]] = None, host: Optional[str] = None):
+        self.mode = mode
+        self.on_phase = on_phase
+        self.host = host
+        self._current: Optional[str] = None
+        self._started = 0.0
+        self._wall_started = 0.0
+
+    def __call__(self, name: str) -> None:
+        self._close()
+        self._current = name
+        self._started = time.perf_counter()
+        self._wall_started = time.time()
+        if self.on_phase:
+            self.on_phase(name)
+
+    def finish(self, success: bool) -> None:
+        self._close()
+        DEPLOYMENTS.labels(self.mode, 'success' if success else 'failure').inc()
+
+    def _close(self) -> None:
+        if self._current is not None:
+            DEPLOY_PHASE_SECONDS.labels(self._current, self.mode).observe(time.perf_counter() - self._started)
+            tracing.record(f'deploy.{self._current}', self._wall_started, time.time(), host=self.host, mode=self.mode)
+            self._current = None
+
+
+class _RuntimeCollector:
+    """수집 시점의 대기열 길이, 로컬 프로세스 수, SSH 풀 상태, 인벤토리 나이"""
+
+    def describe(self):
+        # 등록 시 collect()가 호출되지 않도록 (그 시점엔 서비스 모듈이 아직 로드 전일 수 있음)
+        return []
+
+    def collect(self):
+        # 서비스 모듈이 이 모듈을 import 하므로 순환 import를 피하려고 수집 시점에 가져옴
+        from services.job_queue import deployment_queue
+        from services.local_supervisor import local_supervisor
+        from services.ssh_pool import ssh_pool
+        from utils.vm_inventory import vm_inventory
+
+        jobs = GaugeMetricFamily('participant_job_queue_jobs', '작업 대기열의 대기/실행 중 작업 수', labels=['queue', 'state'])
+        for name, stats in (('deploy', deployment_queue.stats()), ('local', local_supervisor.stats())):
+            jobs.add_metric([name, 'queued'], stats['queued'])
+            jobs.add_metric([name, 'running'], stats['running'])
+        yield jobs
+
+        yield GaugeMetricFamily(
+            'participant_local_fl_processes', '실행 중인 로컬 연합학습 클라이언트 프로세스 수',
+            value=local_supervisor.active_processes(),
+        )
+
+        pool = GaugeMetricFamily('participant_ssh_pool_connections', '호스트별 SSH 풀 연결 수', labels=['host', 'state'])
+        for host, stats in ssh_pool.stats().items():
+            pool.add_metric([host, 'total'], stats['total'])
+            pool.add_metric([host, 'idle'], stats['idle'])
+        yield pool
+
+        info = vm_inventory.info()
+        yield GaugeMetricFamily('participant_vm_inventory_vms', '인벤토리 캐시의 VM 수', value=info['count'])
+        if info['age_seconds'] is not None:
+            yield GaugeMetricFamily('participant_vm_inventory_age_seconds', '인벤토리 스냅샷 나이', value=info['age_seconds'])
+
+
+def init_app(app: Flask) -> None:
+    """요청 시간 측정 훅과 /metrics 엔드포인트 등록"""
+
+    @app.before_request
+    def _start_request_timer():
+        g._metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _observe_request(response):
+        started = g.pop('_metrics_started', None)
+        if started is not None:
+            HTTP_REQUEST_SECONDS.labels(
+                request.method, request.endpoint or 'unmatched', str(response.status_code)
+            ).observe(time.perf_counter() - started)
+        return response
+
+    def metrics():
+        """Prometheus 텍스트 형식의 서버 지표"""
+        return Response(generate_latest(REGISTRY), content_type=CONTENT_TYPE_LATEST)
+
+    app.add_url_rule('/metrics', 'metrics', metrics)
+
+
+REGISTRY.register(_RuntimeCollector())
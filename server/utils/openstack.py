@@ -1,23 +1,255 @@
 import subprocess
 import ast
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional
 import logging
 
+import requests
+from requests.adapters import HTTPAdapter
+
 from config.settings import Config
+from utils import tracing
+from utils.metrics import OPENSTACK_ERRORS, OPENSTACK_LIST_SECONDS
 
 logger = logging.getLogger(__name__)
 
+class OpenStackError(Exception):
+    """OpenStack VM 목록 조회 실패"""
+
+
 def get_openstack_vmList() -> List[Dict[str, Optional[str]]]:
     """Openstack에서 VM ID와 Floating IP 정보를 가져오는 함수"""
-    cmd = (
-        f"cd {Config.DEVSTACK_PATH} && "
-        "source openrc admin demo && "
-        "openstack server list --format value --column ID --column Networks"
-    )
-    
+    try:
+        return fetch_openstack_vmList()
+    except OpenStackError as e:
+        logger.error(str(e))
+        return []
+    except Exception as e:
+        logger.error(f"Error getting VM list: {str(e)}")
+        return []
+
+
+def fetch_openstack_vmList() -> List[Dict[str, Optional[str]]]:
+    """get_openstack_vmList와 같지만 실패 시 빈 목록 대신 OpenStackError를 발생시킴
+
+    인벤토리 캐시가 "VM이 없음"과 "조회 실패"를 구분하기 위해 사용한다.
+    OPENSTACK_BACKEND가 'api'(또는 'auto'이면서 OS_AUTH_URL이 설정됨)이면
+    Keystone/Nova REST API를 직접 호출하고, 그렇지 않으면 openstack CLI를 사용한다.
+    """
+    backend = 'api' if _use_api_backend() else 'cli'
+    started = time.perf_counter()
+    try:
+        with tracing.span('openstack.list', backend=backend):
+            return get_openstack_client().list_vms() if backend == 'api' else _fetch_vmList_cli()
+    except Exception:
+        OPENSTACK_ERRORS.labels(backend).inc()
+        raise
+    finally:
+        OPENSTACK_LIST_SECONDS.labels(backend).observe(time.perf_counter() - started)
+
+
+def _use_api_backend() -> bool:
+    backend = Config.OPENSTACK_BACKEND
+    if backend == 'api':
+        return True
+    if backend == 'cli':
+        return False
+    return bool(Config.OS_AUTH_URL)
+
+
+class OpenStackClient:
+    """Keystone 토큰과 HTTP keep-alive 연결을 재사용하는 최소한의 OpenStack REST 클라이언트
+
+    - Keystone v3 password 인증을 한 번 수행하고, 만료 직전까지 토큰과 서비스 카탈로그를 재사용
+    - 401 응답을 받으면 토큰을 한 번 갱신한 뒤 재시도
+    - requests.Session의 연결 풀로 Nova 등 엔드포인트 연결을 유지
+    """
+
+    # 만료 시각보다 이만큼 일찍 토큰을 갱신
+    TOKEN_REFRESH_MARGIN = timedelta(seconds=60)
+
+    def __init__(
+        self,
+        auth_url: str = Config.OS_AUTH_URL,
+        username: str = Config.OS_USERNAME,
+        password: str = Config.OS_PASSWORD,
+        project_name: str = Config.OS_PROJECT_NAME,
+        user_domain_name: str = Config.OS_USER_DOMAIN_NAME,
+        project_domain_name: str = Config.OS_PROJECT_DOMAIN_NAME,
+        region_name: Optional[str] = Config.OS_REGION_NAME,
+        interface: str = Config.OS_INTERFACE,
+        timeout: float = Config.OPENSTACK_TIMEOUT,
+    ):
+        self.auth_url = (auth_url or '').rstrip('/')
+        if self.auth_url and not self.auth_url.endswith('/v3'):
+            self.auth_url += '/v3'
+        self.username = username
+        self.password = password
+        self.project_name = project_name
+        self.user_domain_name = user_domain_name
+        self.project_domain_name = project_domain_name
+        self.region_name = region_name
+        self.interface = interface
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=Config.OPENSTACK_HTTP_POOL_SIZE)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Accept': 'application/json'})
+
+        self._token: Optional[str] = None
+        self._expires_at: Optional[datetime] = None
+        self._catalog: List[Dict] = []
+        self._auth_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 인증
+    # ------------------------------------------------------------------
+    def _authenticate(self) -> None:
+        if not self.auth_url:
+            raise OpenStackError("OS_AUTH_URL is not configured")
+
+        body = {
+            'auth': {
+                'identity': {
+                    'methods': ['password'],
+                    'password': {
+                        'user': {
+                            'name': self.username,
+                            'domain': {'name': self.user_domain_name},
+                            'password': self.password,
+                        }
+                    },
+                },
+                'scope': {
+                    'project': {
+                        'name': self.project_name,
+                        'domain': {'name': self.project_domain_name},
+                    }
+                },
+            }
+        }
+        try:
+            resp = self.session.post(f"{self.auth_url}/auth/tokens", json=body, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise OpenStackError(f"Keystone authentication request failed: {str(e)}")
+        if resp.status_code != 201:
+            raise OpenStackError(f"Keystone authentication failed ({resp.status_code}): {resp.text[:200]}")
+
+        token_info = resp.json().get('token', {})
+        self._token = resp.headers.get('X-Subject-Token')
+        self._catalog = token_info.get('catalog', [])
+        self._expires_at = _parse_expires_at(token_info.get('expires_at'))
+        logger.info(f"Keystone token issued (expires at {self._expires_at})")
+
+    def _ensure_token(self, force: bool = False) -> str:
+        with self._auth_lock:
+            expired = (
+                self._expires_at is not None
+                and datetime.now(timezone.utc) + self.TOKEN_REFRESH_MARGIN >= self._expires_at
+            )
+            if force or not self._token or expired:
+                self._authenticate()
+            return self._token
+
+    def endpoint(self, service_type: str) -> str:
+        """서비스 카탈로그에서 엔드포인트 URL 조회"""
+        self._ensure_token()
+        for service in self._catalog:
+            if service.get('type') != service_type:
+                continue
+            for ep in service.get('endpoints', []):
+                if ep.get('interface') != self.interface:
+                    continue
+                if self.region_name and self.region_name not in (ep.get('region'), ep.get('region_id')):
+                    continue
+                return ep['url'].rstrip('/')
+        raise OpenStackError(f"No '{self.interface}' endpoint for service '{service_type}' in catalog")
+
+    # ------------------------------------------------------------------
+    # 요청
+    # ------------------------------------------------------------------
+    def get(self, url: str, **kwargs) -> Dict:
+        """인증 헤더를 붙여 GET 요청 후 JSON 반환 (401이면 토큰을 갱신해 한 번 재시도)"""
+        token = self._ensure_token()
+        for attempt in range(2):
+            try:
+                resp = self.session.get(url, headers={'X-Auth-Token': token}, timeout=self.timeout, **kwargs)
+            except requests.RequestException as e:
+                raise OpenStackError(f"OpenStack request failed: {str(e)}")
+            if resp.status_code == 401 and attempt == 0:
+                token = self._ensure_token(force=True)
+                continue
+            if resp.status_code >= 400:
+                raise OpenStackError(f"OpenStack request to {url} failed ({resp.status_code}): {resp.text[:200]}")
+            return resp.json()
+        raise OpenStackError(f"OpenStack request to {url} was not authorized")
+
+    def list_servers(self) -> List[Dict]:
+        """Nova 서버 상세 목록 (페이지네이션 링크를 따라 전체 조회)"""
+        url = f"{self.endpoint('compute')}/servers/detail"
+        servers: List[Dict] = []
+        while url:
+            data = self.get(url)
+            servers.extend(data.get('servers', []))
+            url = next(
+                (link.get('href') for link in data.get('servers_links', []) if link.get('rel') == 'next'),
+                None,
+            )
+        return servers
+
+    def list_vms(self) -> List[Dict[str, Optional[str]]]:
+        """get_openstack_vmList와 같은 형식(id, floating_ip)의 VM 목록"""
+        return [
+            {'id': server.get('id'), 'floating_ip': _pick_floating_ip(server.get('addresses') or {})}
+            for server in self.list_servers()
+        ]
+
+
+def _parse_expires_at(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def _pick_floating_ip(addresses: Dict) -> Optional[str]:
+    """Nova addresses에서 floating IP 선택 (없으면 CLI 출력과 같이 마지막 주소)"""
+    all_ips: List[str] = []
+    for entries in addresses.values():
+        for entry in entries or []:
+            addr = entry.get('addr')
+            if not addr:
+                continue
+            if entry.get('OS-EXT-IPS:type') == 'floating':
+                return addr
+            all_ips.append(addr)
+    return all_ips[-1] if all_ips else None
+
+
+_client: Optional[OpenStackClient] = None
+_client_lock = threading.Lock()
+
+
+def get_openstack_client() -> OpenStackClient:
+    """프로세스 전역에서 공유하는 OpenStackClient (토큰/연결 재사용)"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OpenStackClient()
+        return _client
+
+
+def _fetch_vmList_cli() -> List[Dict[str, Optional[str]]]:
+    """openstack CLI(subprocess)로 VM 목록 조회 (OS_AUTH_URL이 없을 때의 대체 경로)"""
     try:
         result = subprocess.run(
-            cmd,
+            _cli_command(),
             shell=True,
             executable='/bin/bash',
             capture_output=True,
@@ -26,52 +258,59 @@ def get_openstack_vmList() -> List[Dict[str, Optional[str]]]:
         )
 
         if result.returncode != 0:
-            logger.error(f"OpenStack command failed: {result.stderr}")
-            return []
+            raise OpenStackError(f"OpenStack command failed: {result.stderr}")
+        return _parse_cli_output(result.stdout)
+        
+    except subprocess.TimeoutExpired:
+        raise OpenStackError("OpenStack command timed out")
 
-        lines = [line.strip() for line in result.stdout.strip().splitlines() if line.strip()]
-        vm_list: List[Dict[str, Optional[str]]] = []
 
-        for line in lines:
-            parts = line.split(None, 1)
-            if len(parts) < 2:
-                continue
-            vm_id, networks_str = parts[0].strip(), parts[1].strip()
+def _cli_command() -> str:
+    return (
+        f"cd {Config.DEVSTACK_PATH} && "
+        "source openrc admin demo && "
+        "openstack server list --format value --column ID --column Networks"
+    )
+
+
+def _parse_cli_output(stdout: str) -> List[Dict[str, Optional[str]]]:
+    """openstack server list (value 형식, ID/Networks 열) 출력을 VM 목록으로 변환"""
+    lines = [line.strip() for line in stdout.strip().splitlines() if line.strip()]
+    vm_list: List[Dict[str, Optional[str]]] = []
 
-            all_ips: List[str] = []
+    for line in lines:
+        parts = line.split(None, 1)
+        if len(parts) < 2:
+            continue
+        vm_id, networks_str = parts[0].strip(), parts[1].strip()
+
+        all_ips: List[str] = []
+        parsed = None
+        try:
+            parsed = ast.literal_eval(networks_str)
+        except Exception:
             parsed = None
-            try:
-                parsed = ast.literal_eval(networks_str)
-            except Exception:
-                parsed = None
-
-            if isinstance(parsed, dict):
-                for v in parsed.values():
-                    if isinstance(v, list):
-                        for item in v:
-                            if isinstance(item, str):
-                                all_ips.append(item.strip())
-            else:
-                tokens = [t.strip() for t in networks_str.split(',') if t.strip()]
-                for t in tokens:
-                    if '=' in t:
-                        all_ips.append(t.split('=')[-1].strip())
-                    else:
-                        all_ips.append(t)
-
-            floating_ip = all_ips[-1] if all_ips else None
-
-            vm_info = {
-                'id': vm_id,
-                'floating_ip': floating_ip
-            }
-            vm_list.append(vm_info)
 
-        return vm_list
-        
-    except subprocess.TimeoutExpired:
-        logger.error("OpenStack command timed out")
-        return []
-    except Exception as e:
-        logger.error(f"Error getting VM list: {str(e)}")
-        return []
+        if isinstance(parsed, dict):
+            for v in parsed.values():
+                if isinstance(v, list):
+                    for item in v:
+                        if isinstance(item, str):
+                            all_ips.append(item.strip())
+        else:
+            tokens = [t.strip() for t in networks_str.split(',') if t.strip()]
+            for t in tokens:
+                if '=' in t:
+                    all_ips.append(t.split('=')[-1].strip())
+                else:
+                    all_ips.append(t)
+
+        floating_ip = all_ips[-1] if all_ips else None
+
+        vm_info = {
+            'id': vm_id,
+            'floating_ip': floating_ip
+        }
+        vm_list.append(vm_info)
+
+    return vm_list
@@ -0,0 +1,93 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.settings import Config
+from utils import tracing
+from utils.metrics import PROMETHEUS_QUERY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class PrometheusError(Exception):
+    """Prometheus 쿼리 실패"""
+
+
+class PrometheusClient:
+    """Prometheus HTTP API(/api/v1/query)의 즉시 쿼리만 사용하는 최소한의 클라이언트
+
+    결과는 instance 라벨의 호스트 부분(node_exporter 대상 주소에서 포트를 뺀 값)을 키로 돌려준다.
+    """
+
+    def __init__(self, base_url: str = Config.PROMETHEUS_URL, timeout: float = Config.PROMETHEUS_TIMEOUT):
+        self.base_url = (base_url or '').rstrip('/')
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Accept': 'application/json'})
+
+    def query_by_host(self, name: str, promql: str) -> Dict[str, float]:
+        """instant vector 쿼리를 실행하고 {호스트: 값}을 반환 (name은 지표/추적 라벨)"""
+        if not self.base_url:
+            raise PrometheusError("PROMETHEUS_URL is not configured")
+
+        started = time.perf_counter()
+        try:
+            with tracing.span('prometheus.query', query=name):
+                resp = self.session.get(f"{self.base_url}/api/v1/query", params={'query': promql}, timeout=self.timeout)
+            payload = resp.json()
+        except requests.RequestException as e:
+            raise PrometheusError(f"Prometheus query {name} failed: {str(e)}")
+        except ValueError:
+            raise PrometheusError(f"Prometheus query {name} returned invalid JSON (HTTP {resp.status_code})")
+        finally:
+            PROMETHEUS_QUERY_SECONDS.labels(name).observe(time.perf_counter() - started)
+
+        if resp.status_code != 200 or payload.get('status') != 'success':
+            raise PrometheusError(f"Prometheus query {name} failed: {payload.get('error') or f'HTTP {resp.status_code}'}")
+
+        data = payload.get('data') or {}
+        if data.get('resultType') != 'vector':
+            raise PrometheusError(f"Prometheus query {name} returned {data.get('resultType')}, expected vector")
+
+        values = {}
+        for sample in data.get('result') or []:
+            host = instance_host(sample.get('metric', {}).get('instance'))
+            try:
+                value = float(sample['value'][1])
+            except (KeyError, IndexError, TypeError, ValueError):
+                continue
+            if host and value == value:  # NaN 제외
+                values[host] = value
+        return values
+
+
+def instance_host(instance: Optional[str]) -> Optional[str]:
+    """'172.24.4.101:9100' / '[fd00::1]:9100' 형식의 instance 라벨에서 호스트만 추출"""
+    if not instance:
+        return None
+    if instance.startswith('['):
+        return instance[1:].split(']', 1)[0]
+    if instance.count(':') == 1:
+        return instance.split(':', 1)[0]
+    return instance
+
+
+_client: Optional[PrometheusClient] = None
+_client_lock = threading.Lock()
+
+
+def get_prometheus_client() -> PrometheusClient:
+    """프로세스 전역에서 공유하는 PrometheusClient (연결 재사용)"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = PrometheusClient()
+        return _client
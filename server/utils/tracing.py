@@ -0,0 +1,204 @@
+import contextvars
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, List, Optional
+
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+class Trace:
+    """요청/배포 하나 동안 기록되는 구간(span) 목록
+
+    span은 (이름, 시작/종료 시각, 속성) 만 기록하는 가벼운 구조이며, OpenTelemetry가 켜져 있으면
+    같은 내용을 OTel span으로도 내보낸다.
+    """
+
+    def __init__(self, name: str, attrs: Dict):
+        self.id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.attrs = dict(attrs)
+        self.started_at = time.time()
+        self.ended_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self.spans: List[Dict] = []
+        self._lock = threading.Lock()
+        self._otel_root = _otel.start_root(name, self.attrs, self.started_at) if _otel.enabled else None
+
+    def add(self, name: str, start: float, end: float, attrs: Dict, error: Optional[str] = None) -> None:
+        span = {'name': name, 'start': start, 'end': end, 'attrs': attrs, 'error': error}
+        with self._lock:
+            self.spans.append(span)
+        if self._otel_root is not None:
+            _otel.export_child(self._otel_root, span)
+
+    def finish(self, error: Optional[str] = None) -> None:
+        self.ended_at = time.time()
+        self.error = error
+        if self._otel_root is not None:
+            _otel.end_root(self._otel_root, self.ended_at, error)
+
+    @property
+    def total_ms(self) -> float:
+        return _ms((self.ended_at or time.time()) - self.started_at)
+
+    def timings(self) -> Dict:
+        """응답에 포함할 소요 시간 분석: 전체, 이름별 합계, 시작 순서대로의 구간 목록"""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s['start'])
+        phases: Dict[str, float] = {}
+        for span in spans:
+            phases[span['name']] = round(phases.get(span['name'], 0) + _ms(span['end'] - span['start']), 1)
+        return {
+            'trace_id': self.id,
+            'total_ms': self.total_ms,
+            'phases': phases,
+            'spans': [
+                dict(
+                    span['attrs'],
+                    name=span['name'],
+                    start_ms=_ms(span['start'] - self.started_at),
+                    duration_ms=_ms(span['end'] - span['start']),
+                    **({'error': span['error']} if span['error'] else {}),
+                )
+                for span in spans
+            ],
+        }
+
+    def to_dict(self) -> Dict:
+        data = dict(self.attrs, name=self.name, error=self.error)
+        data['started_at'] = self.started_at
+        data.update(self.timings())
+        return data
+
+
+class _OpenTelemetryExporter:
+    """TRACING_OTEL_ENABLED일 때만 OpenTelemetry SDK로 span을 내보냄 (패키지가 없으면 비활성)"""
+
+    def __init__(self):
+        self.enabled = False
+        self._tracer = None
+        self._api = None
+
+    def configure(self) -> None:
+        if not Config.TRACING_OTEL_ENABLED:
+            return
+        try:
+            from opentelemetry import trace as otel_trace
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        except ImportError:
+            logger.warning("TRACING_OTEL_ENABLED is set but opentelemetry-sdk / otlp exporter are not installed")
+            return
+        provider = TracerProvider(resource=Resource.create({'service.name': Config.TRACING_SERVICE_NAME}))
+        # 수집기 주소는 OTEL_EXPORTER_OTLP_ENDPOINT 등 표준 환경 변수로 설정
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        otel_trace.set_tracer_provider(provider)
+        self._api = otel_trace
+        self._tracer = otel_trace.get_tracer('participant-server')
+        self.enabled = True
+        logger.info("OpenTelemetry trace export enabled")
+
+    def start_root(self, name: str, attrs: Dict, start: float):
+        return self._tracer.start_span(name, attributes=self._attributes(attrs), start_time=int(start * 1e9))
+
+    def export_child(self, root, span: Dict) -> None:
+        child = self._tracer.start_span(
+            span['name'],
+            context=self._api.set_span_in_context(root),
+            attributes=self._attributes(span['attrs']),
+            start_time=int(span['start'] * 1e9),
+        )
+        if span['error']:
+            child.set_status(self._api.Status(self._api.StatusCode.ERROR, span['error']))
+        child.end(end_time=int(span['end'] * 1e9))
+
+    def end_root(self, root, end: float, error: Optional[str]) -> None:
+        if error:
+            root.set_status(self._api.Status(self._api.StatusCode.ERROR, error))
+        root.end(end_time=int(end * 1e9))
+
+    @staticmethod
+    def _attributes(attrs: Dict) -> Dict:
+        return {k: v for k, v in attrs.items() if isinstance(v, (str, bool, int, float))}
+
+
+_otel = _OpenTelemetryExporter()
+_otel.configure()
+
+_current: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar('fl_trace', default=None)
+
+# 최근에 끝난 추적 (디버그 엔드포인트에서 조회)
+_recent: Deque[Trace] = deque(maxlen=max(1, Config.TRACING_BUFFER_SIZE))
+_recent_lock = threading.Lock()
+
+
+def current() -> Optional[Trace]:
+    return _current.get()
+
+
+@contextmanager
+def trace(name: str, **attrs) -> Iterator[Trace]:
+    """추적 시작 (이미 진행 중인 추적이 있으면 그 추적에 합류하고, 최상위 추적만 기록)"""
+    existing = _current.get()
+    if existing is not None:
+        yield existing
+        return
+
+    current_trace = Trace(name, attrs)
+    token = _current.set(current_trace)
+    error = None
+    try:
+        yield current_trace
+    except Exception as e:
+        error = str(e)
+        raise
+    finally:
+        _current.reset(token)
+        current_trace.finish(error)
+        with _recent_lock:
+            _recent.append(current_trace)
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[None]:
+    """with 블록을 현재 추적의 구간으로 기록 (진행 중인 추적이 없으면 아무것도 하지 않음)"""
+    current_trace = _current.get()
+    if current_trace is None:
+        yield
+        return
+    start = time.time()
+    error = None
+    try:
+        yield
+    except Exception as e:
+        error = str(e)
+        raise
+    finally:
+        current_trace.add(name, start, time.time(), attrs, error)
+
+
+def record(name: str, start: float, end: float, error: Optional[str] = None, **attrs) -> None:
+    """이미 끝난 구간(time.time() 기준)을 현재 추적에 추가"""
+    current_trace = _current.get()
+    if current_trace is not None:
+        current_trace.add(name, start, end, attrs, error)
+
+
+def slowest(limit: int = 10, name: Optional[str] = None) -> List[Dict]:
+    """최근 추적 중 오래 걸린 순으로 limit개"""
+    with _recent_lock:
+        traces = [t for t in _recent if name is None or t.name == name]
+    traces.sort(key=lambda t: t.total_ms, reverse=True)
+    return [t.to_dict() for t in traces[:limit]]
@@ -0,0 +1,165 @@
+import threading
+import time
+import logging
+from typing import Callable, Dict, List, Optional
+
+from config.settings import Config
+from utils.openstack import fetch_openstack_vmList
+
+logger = logging.getLogger(__name__)
+
+
+class _Snapshot:
+    """한 번의 OpenStack 조회 결과와 그 인덱스 (교체만 되고 수정되지 않음)"""
+
+    __slots__ = ('vms', 'by_id', 'by_ip', 'fetched_at')
+
+    def __init__(self, vms: List[Dict], fetched_at: float):
+        self.vms = vms
+        self.by_id = {vm['id']: vm for vm in vms if vm.get('id')}
+        self.by_ip = {vm['floating_ip']: vm for vm in vms if vm.get('floating_ip')}
+        self.fetched_at = fetched_at
+
+
+class VMInventory:
+    """OpenStack VM 목록의 프로세스 내 캐시
+
+    - TTL 이내: 캐시된 스냅샷을 그대로 반환
+    - TTL 초과 ~ MAX_STALE 이내: 오래된 스냅샷을 반환하고 백그라운드에서 갱신 (stale-while-revalidate)
+    - 최초 조회 또는 MAX_STALE 초과: 갱신이 끝날 때까지 대기
+    동시에 여러 스레드가 갱신을 요청해도 OpenStack 조회는 한 번만 수행된다.
+    조회가 실패하면 MISS_REFRESH_INTERVAL 동안은 다시 조회하지 않고 가진 스냅샷(없으면 빈 목록)을 반환한다.
+    """
+
+    def __init__(
+        self,
+        fetcher: Callable[[], List[Dict]] = fetch_openstack_vmList,
+        ttl: float = Config.VM_INVENTORY_TTL,
+        max_stale: float = Config.VM_INVENTORY_MAX_STALE,
+        miss_refresh_interval: float = Config.VM_INVENTORY_MISS_REFRESH_INTERVAL,
+        miss_wait: float = Config.VM_INVENTORY_MISS_WAIT,
+    ):
+        self._fetcher = fetcher
+        self.ttl = ttl
+        self.max_stale = max(max_stale, ttl)
+        self.miss_refresh_interval = miss_refresh_interval
+        self.miss_wait = miss_wait
+
+        self._snapshot: Optional[_Snapshot] = None
+        self._lock = threading.Lock()
+        self._refresh_done: Optional[threading.Event] = None
+        self._last_attempt_at = 0.0
+        self._last_error: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def list_vms(self) -> List[Dict]:
+        """전체 VM 목록 (id, floating_ip)"""
+        snapshot = self._current()
+        if snapshot is None:
+            return []
+        return [dict(vm) for vm in snapshot.vms]
+
+    def get_by_id(self, vm_id: str) -> Optional[Dict]:
+        """VM ID로 VM 정보 조회 (캐시에 없으면 제한된 빈도로 즉시 재조회)"""
+        return self._lookup('by_id', vm_id)
+
+    def get_by_floating_ip(self, floating_ip: str) -> Optional[Dict]:
+        """Floating IP로 VM 정보 조회"""
+        return self._lookup('by_ip', floating_ip)
+
+    def info(self) -> Dict:
+        """캐시 상태 정보"""
+        snapshot = self._snapshot
+        now = time.time()
+        return {
+            'count': len(snapshot.vms) if snapshot else 0,
+            'fetched_at': snapshot.fetched_at if snapshot else None,
+            'age_seconds': round(now - snapshot.fetched_at, 3) if snapshot else None,
+            'ttl_seconds': self.ttl,
+            'refreshing': self._refresh_done is not None,
+            'last_error': self._last_error,
+        }
+
+    # ------------------------------------------------------------------
+    # 갱신
+    # ------------------------------------------------------------------
+    def refresh(self, wait: bool = True, timeout: Optional[float] = None) -> None:
+        """OpenStack에서 VM 목록을 다시 조회 (이미 진행 중이면 그 결과를 공유)
+
+        timeout을 주면 백그라운드에서 조회하고 최대 timeout초만 기다린다.
+        """
+        with self._lock:
+            done = self._refresh_done
+            owner = done is None
+            if owner:
+                done = self._refresh_done = threading.Event()
+                self._last_attempt_at = time.time()
+
+        if owner:
+            if wait and timeout is None:
+                self._do_refresh(done)
+                return
+            threading.Thread(
+                target=self._do_refresh, args=(done,), name='vm-inventory-refresh', daemon=True
+            ).start()
+
+        if wait:
+            done.wait(timeout=Config.OPENSTACK_TIMEOUT + 5 if timeout is None else timeout)
+
+    def invalidate(self) -> None:
+        """다음 조회 시 반드시 OpenStack을 다시 조회하도록 캐시를 비움"""
+        with self._lock:
+            self._snapshot = None
+
+    def _do_refresh(self, done: threading.Event) -> None:
+        try:
+            self._install(self._fetcher())
+        except Exception as e:
+            self._fail(e)
+        finally:
+            self._finish(done)
+
+    def _install(self, vms: List[Dict]) -> None:
+        self._snapshot = _Snapshot(vms, time.time())
+        self._last_error = None
+        logger.info(f"VM inventory refreshed: {len(vms)} VMs")
+
+    def _fail(self, error: Exception) -> None:
+        self._last_error = str(error)
+        logger.error(f"VM inventory refresh failed (serving previous snapshot): {str(error)}")
+
+    def _finish(self, done: threading.Event) -> None:
+        with self._lock:
+            self._refresh_done = None
+        done.set()
+
+    def _current(self) -> Optional[_Snapshot]:
+        snapshot = self._snapshot
+        now = time.time()
+        # 직전 조회 후 miss_refresh_interval이 지나지 않았으면 (실패 직후 포함) 다시 조회하지 않음
+        may_refresh = self._refresh_done is not None or now - self._last_attempt_at > self.miss_refresh_interval
+        if snapshot is None or now - snapshot.fetched_at > self.max_stale:
+            if may_refresh:
+                self.refresh(wait=True)
+            return self._snapshot or snapshot
+
+        if now - snapshot.fetched_at > self.ttl and may_refresh:
+            self.refresh(wait=False)
+        return snapshot
+
+    def _lookup(self, index: str, key: str) -> Optional[Dict]:
+        if not key:
+            return None
+        snapshot = self._current()
+        vm = getattr(snapshot, index).get(key) if snapshot else None
+        if vm is None and time.time() - self._last_attempt_at > self.miss_refresh_interval:
+            # 방금 생성된 VM일 수 있으므로 백그라운드로 다시 조회하고 miss_wait초만 기다림
+            self.refresh(wait=True, timeout=self.miss_wait)
+            snapshot = self._snapshot
+            vm = getattr(snapshot, index).get(key) if snapshot else None
+        return dict(vm) if vm else None
+
+# 애플리케이션 전역에서 공유하는 인벤토리
+vm_inventory = VMInventory()